@@ -0,0 +1,156 @@
+# app/audio.py
+"""
+長時間録音の分割と、分割した文字起こし結果の結合
+
+音声はffmpegで16kHzモノラルにデコードし、ブロック単位で読み進めて
+フレームごとの音量（RMS）だけを保持する（3時間の録音でも数MB）。
+分割点は目標の長さ付近で最も静かな位置を選び、前後に短いのりしろを付ける。
+"""
+import subprocess
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+FRAME_SIZE = int(SAMPLE_RATE * FRAME_SECONDS)
+# 無音の判定に使う移動平均の幅（ブレス程度の短い無音を拾える長さ）
+SMOOTHING_SECONDS = 0.3
+# のりしろで重複した文字列とみなす最小の長さ
+MIN_OVERLAP_CHARS = 4
+
+
+class Chunk(NamedTuple):
+    start: float  # 文字起こしする範囲（のりしろ込み、秒）
+    end: float
+    own_start: float  # このチャンクの結果を採用する範囲（秒）
+    own_end: float
+
+
+class Segment(NamedTuple):
+    start: float  # 録音の先頭からの秒数
+    end: float
+    text: str
+
+
+def _ffmpeg_command(path: str, start: Optional[float] = None, duration: Optional[float] = None) -> List[str]:
+    command = ["ffmpeg", "-nostdin", "-threads", "0"]
+    if start is not None:
+        command += ["-ss", f"{start:.3f}"]
+    if duration is not None:
+        command += ["-t", f"{duration:.3f}"]
+    return command + [
+        "-i", path, "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+    ]
+
+
+def _to_float(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def iter_pcm(path: str, block_seconds: float = 30.0) -> Iterator[np.ndarray]:
+    """音声ファイルを先頭から一定の長さのブロックで読み出す"""
+    block_bytes = int(block_seconds * SAMPLE_RATE) * 2
+    with subprocess.Popen(
+        _ffmpeg_command(path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as process:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield _to_float(data)
+    if process.returncode:
+        raise RuntimeError(f"音声ファイルをデコードできません: {path}")
+
+
+def load_audio_range(path: str, start: float, end: float) -> np.ndarray:
+    """音声ファイルの指定範囲だけをデコードする"""
+    result = subprocess.run(
+        _ffmpeg_command(path, start=start, duration=end - start), capture_output=True
+    )
+    if result.returncode:
+        raise RuntimeError(f"音声ファイルをデコードできません: {path}")
+    return _to_float(result.stdout)
+
+
+def frame_rms(samples: np.ndarray) -> np.ndarray:
+    """フレームごとの音量（RMS）を求める（端数のサンプルは捨てる）"""
+    count = len(samples) // FRAME_SIZE
+    frames = samples[:count * FRAME_SIZE].reshape(count, FRAME_SIZE)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def scan_audio(path: str) -> np.ndarray:
+    """音声ファイル全体のフレームごとの音量を求める"""
+    # ブロック長はフレーム長の倍数なので、ブロックの境界でフレームがずれない
+    levels = [frame_rms(block) for block in iter_pcm(path)]
+    return np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+
+
+def plan_chunks(
+    levels: np.ndarray,
+    chunk_seconds: float = 60.0,
+    search_seconds: float = 10.0,
+    overlap_seconds: float = 1.0,
+) -> List[Chunk]:
+    """
+    フレームごとの音量から分割点を決める。
+
+    各チャンクは chunk_seconds ± search_seconds の範囲で最も静かな位置で区切る。
+    チャンクの長さは最大でも chunk_seconds + search_seconds + overlap_seconds。
+    """
+    total = len(levels) * FRAME_SECONDS
+    if total == 0:
+        return []
+    width = max(1, int(SMOOTHING_SECONDS / FRAME_SECONDS))
+    smoothed = np.convolve(levels, np.ones(width) / width, mode="same")
+
+    cuts = [0]
+    chunk_frames = int(chunk_seconds / FRAME_SECONDS)
+    search_frames = int(search_seconds / FRAME_SECONDS)
+    while len(levels) - cuts[-1] > chunk_frames + search_frames:
+        low = cuts[-1] + chunk_frames - search_frames
+        high = cuts[-1] + chunk_frames + search_frames
+        cuts.append(low + int(np.argmin(smoothed[low:high])))
+    cuts.append(len(levels))
+
+    half = overlap_seconds / 2
+    chunks = []
+    for start, end in zip(cuts, cuts[1:]):
+        own_start, own_end = start * FRAME_SECONDS, end * FRAME_SECONDS
+        chunks.append(Chunk(max(0.0, own_start - half), min(total, own_end + half), own_start, own_end))
+    return chunks
+
+
+def _overlap_length(previous: str, following: str) -> int:
+    """previous の末尾と following の先頭で一致する最長の長さ"""
+    for length in range(min(len(previous), len(following)), MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(following[:length]):
+            return length
+    return 0
+
+
+def stitch_segments(chunks: Sequence[Chunk], results: Sequence[Sequence[Segment]]) -> List[Segment]:
+    """
+    チャンクごとの文字起こし結果を時系列に結合する。
+
+    のりしろ部分は中心時刻が自チャンクの範囲にあるセグメントだけを採用し、
+    境界をまたいで両方に残った文字列は後ろのセグメントから取り除く。
+    """
+    stitched: List[Segment] = []
+    for index, (chunk, segments) in enumerate(zip(chunks, results)):
+        last = index == len(chunks) - 1
+        boundary = index > 0
+        for segment in segments:
+            middle = (segment.start + segment.end) / 2
+            if middle < chunk.own_start or (middle >= chunk.own_end and not last):
+                continue
+            text = segment.text
+            if boundary and stitched:
+                # 境界の直後のセグメントだけ、直前のチャンクの末尾との重複を確認する
+                text = text[_overlap_length(stitched[-1].text, text):].strip()
+                boundary = False
+            if text:
+                stitched.append(Segment(segment.start, segment.end, text))
+    return stitched
+
@@ -0,0 +1,374 @@
+# app/cache.py
+"""
+会議の詳細・タスク一覧のレスポンスキャッシュ（リードスルー）
+
+GET /api/meetings/{id} と GET /api/meetings/{id}/tasks/ のJSON（エンコード済みのバイト列）と
+ETagなどのヘッダーを保持し、キャッシュにあればデータベースに接続せずに返す。
+
+  - 既定はプロセス内のLRU（件数・バイト数の上限とTTL）。議事録の長い会議の詳細は
+    数MBになるため、件数だけでなく保存した値の合計バイト数でも上限を設ける
+  - RESPONSE_CACHE_URL（redis://...）を指定すると共有のキャッシュを使う。
+    uvicornを複数ワーカーで動かす場合、プロセス内のキャッシュは他のワーカーの更新で
+    無効化されないため、TTLの間は古い内容を返すことがある
+
+読み込み中に無効化された内容は保存しない（古い内容が無効化の後に書き込まれないように）。
+プロセス内の無効化は ResponseCache の世代、他のワーカーの無効化はキーごとの共有の世代
+（Redisでは無効化のたびにINCRするキー。保存はWATCHで世代が変わっていない場合だけ行う）で判定する。
+
+会議・タスク・議事録・参加者の変更はSessionのafter_flushイベントで会議IDを集め、
+コミット後にその会議のキーだけを無効化する。一括INSERT・UPDATEなどORMのイベントを
+経由しない更新は、mark_changedで指定する。
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Protocol
+
+import orjson
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+from .core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Session.info に変更のあった会議IDを溜めるキー
+CHANGED_KEY = "cache_changed_meeting_ids"
+
+
+def meeting_key(meeting_id: int) -> str:
+    return f"meeting:{meeting_id}"
+
+
+def tasks_key(meeting_id: int) -> str:
+    return f"meeting:{meeting_id}:tasks"
+
+
+class CacheBackend(Protocol):
+    """キャッシュの保存先（キーとバイト列）"""
+
+    local: bool  # Trueの場合はプロセス内（イベントループ上で呼び出してよい）
+
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def generation(self, key: str) -> Optional[bytes]: ...  # 共有の世代（プロセス内のキャッシュはNone）
+
+    def set(self, key: str, value: bytes, ttl: float, generation: Optional[bytes] = None): ...
+
+    def delete(self, keys: Iterable[str]): ...
+
+    def clear(self): ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class LRUCache:
+    """
+    件数・バイト数の上限とTTLのあるプロセス内のキャッシュ
+    （上限を超えたら最も古く使われたものから捨てる。max_bytesより大きい値は保存しない）
+    """
+
+    local = True
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # キー -> (期限, 値)
+        self._bytes = 0  # 保存している値の合計バイト数
+        self.evictions = 0
+        self.expirations = 0
+
+    def _pop(self, key: str):
+        self._bytes -= len(self._entries.pop(key)[1])
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                self._pop(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def generation(self, key: str) -> Optional[bytes]:
+        # プロセス内の無効化は ResponseCache の世代だけで判定できる
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float, generation: Optional[bytes] = None):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            # 1件で上限を超える値は、他をすべて捨てても収まらないので保存しない
+            if self._max_bytes is not None and len(value) > self._max_bytes:
+                return
+            self._entries[key] = (self._clock() + ttl, value)
+            self._bytes += len(value)
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisCacheBackend:
+    """
+    Redisの共有キャッシュ（redisパッケージは使う場合だけ必要）。
+    上限を超えた場合の削除はRedis側の設定（maxmemory-policy）に任せる。
+    """
+
+    local = False
+
+    # 世代のキーの有効期間（読み込みにかかる時間より十分に長くする）
+    GENERATION_TTL_SECONDS = 3600
+
+    def __init__(self, url: str, prefix: str = "meeting_minutes:"):
+        self._url = url
+        self._prefix = prefix
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self._url)
+        return self._client
+
+    def _generation_name(self, key: str) -> str:
+        return self._prefix + "generation:" + key
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._get_client().get(self._prefix + key)
+
+    def generation(self, key: str) -> Optional[bytes]:
+        return self._get_client().get(self._generation_name(key))
+
+    def set(self, key: str, value: bytes, ttl: float, generation: Optional[bytes] = None):
+        """読み込みを始めたときから世代が変わっていない（他のワーカーが無効化していない）場合だけ保存する"""
+        import redis
+
+        name = self._generation_name(key)
+        with self._get_client().pipeline() as pipe:
+            try:
+                # 世代を比べてから保存するまでの間に無効化された場合は、EXECがWatchErrorになる
+                pipe.watch(name)
+                if pipe.get(name) != generation:
+                    return
+                pipe.multi()
+                pipe.set(self._prefix + key, value, px=max(int(ttl * 1000), 1))
+                pipe.execute()
+            except redis.WatchError:
+                pass
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        if not keys:
+            return
+        # 削除と世代の更新を1つのトランザクション（MULTI/EXEC）で行う
+        with self._get_client().pipeline() as pipe:
+            pipe.delete(*(self._prefix + key for key in keys))
+            for key in keys:
+                pipe.incr(self._generation_name(key))
+                pipe.expire(self._generation_name(key), self.GENERATION_TTL_SECONDS)
+            pipe.execute()
+
+    def clear(self):
+        client = self._get_client()
+        names = list(client.scan_iter(match=self._prefix + "*"))
+        if names:
+            client.delete(*names)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class CachedResponse(NamedTuple):
+    body: bytes  # エンコード済みのJSON
+    headers: Dict[str, str]  # ETagなど、レスポンスと一緒に返すヘッダー
+
+
+class ResponseCache:
+    """
+    エンコード済みのレスポンスのリードスルーキャッシュ。
+    backendがNoneの場合は常にデータベースから読む（キャッシュを無効にする）。
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # 無効化のたびに増やす。読み込み中に無効化があった場合は、読んだ内容が古い可能性があるので保存しない
+        self._generation = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+            self.errors = 0
+
+    async def _call(self, fn, *args):
+        # 共有のキャッシュへの通信はイベントループを止めないようスレッドで行う
+        if self.backend.local:
+            return fn(*args)
+        return await run_in_threadpool(fn, *args)
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    async def begin(self, key: str) -> Optional[tuple]:
+        """
+        読み込みを始める前に呼び出し、戻り値をputに渡す（プロセス内の世代と共有の世代）。
+        共有の世代を読めなかった場合はNone（読み込んだ内容は保存しない）。
+        """
+        generation = self._generation
+        if self.backend is None:
+            return generation, None
+        try:
+            shared = await self._call(self.backend.generation, key)
+        except Exception as e:
+            logger.warning(f"Response cache generation get failed: {str(e)}")
+            self._count("errors")
+            return None
+        return generation, shared
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if self.backend is None:
+            return None
+        try:
+            cached = await self._call(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"Response cache get failed: {str(e)}")
+            self._count("errors")
+            cached = None
+        if cached is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        headers, body = cached.split(b"\n", 1)
+        return CachedResponse(body, orjson.loads(headers))
+
+    async def put(self, key: str, response: CachedResponse, token: Optional[tuple]):
+        """読み込みを始めてから無効化がなかった場合だけ保存する（tokenは begin の戻り値）"""
+        if self.backend is None or token is None or token[0] != self._generation:
+            return
+        value = orjson.dumps(response.headers) + b"\n" + response.body
+        try:
+            await self._call(self.backend.set, key, value, self._ttl, token[1])
+        except Exception as e:
+            logger.warning(f"Response cache set failed: {str(e)}")
+            self._count("errors")
+
+    def invalidate_meetings(self, meeting_ids: Iterable[int]):
+        """会議の詳細・タスク一覧のキャッシュを削除する（コミット後に呼ばれる）"""
+        keys = [key for meeting_id in meeting_ids for key in (meeting_key(meeting_id), tasks_key(meeting_id))]
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(keys)
+        if self.backend is None:
+            return
+        try:
+            self.backend.delete(keys)
+        except Exception as e:
+            # 削除できなかったキーはTTLが切れるまで古い内容を返す
+            logger.error(f"Response cache invalidation failed: {str(e)}")
+            self._count("errors")
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+        if self.backend is not None:
+            self.backend.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ヒット・ミス・無効化の回数と、保存先の状態を辞書で返す"""
+        with self._lock:
+            data = {
+                "enabled": self.backend is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+        if self.backend is not None:
+            data.update(self.backend.stats())
+        return data
+
+
+def default_backend() -> Optional[CacheBackend]:
+    settings = get_settings()
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    if settings.RESPONSE_CACHE_URL:
+        return RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+    return LRUCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+response_cache = ResponseCache(default_backend(), get_settings().RESPONSE_CACHE_TTL_SECONDS)
+
+
+def mark_changed(db: Session, meeting_id: int):
+    """ORMのイベントを経由しない更新（一括INSERT・UPDATEなど）の後で、会議のキャッシュを無効化する対象にする"""
+    db.info.setdefault(CHANGED_KEY, set()).add(meeting_id)
+
+
+# 会議の詳細・タスク一覧に含まれるモデル
+CACHED_MODELS = (models.Meeting, models.Task, models.TranscriptSegment, models.MeetingParticipant)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_meetings(session: Session, flush_context):
+    ids = session.info.setdefault(CHANGED_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, models.Meeting):
+            ids.add(obj.id)
+        elif isinstance(obj, CACHED_MODELS):
+            ids.add(obj.meeting_id)
+            # タスクが別の会議に移動した場合は移動元も無効化する
+            if isinstance(obj, models.Task):
+                ids.update(inspect(obj).attrs.meeting_id.history.deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_meetings(session: Session):
+    ids = session.info.pop(CHANGED_KEY, None)
+    if ids:
+        ids.discard(None)
+        response_cache.invalidate_meetings(sorted(ids))
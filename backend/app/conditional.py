@@ -0,0 +1,119 @@
+# app/conditional.py
+"""
+会議の詳細・タスク一覧の条件付きリクエスト（If-None-Match / If-Modified-Since）
+
+ETagは会議のIDと更新日時、会議のタスクの最新の更新日時から作る弱いETag。
+  - 議事録・参加者だけの変更でも会議の更新日時を変える（crud._set_transcript_segments など）
+  - タスクの削除では最新の更新日時が変わらないことがあるため、会議の更新日時を変える
+
+変更がなければ、(id, updated_at) と (meeting_id, updated_at) のインデックスだけを読む
+1回のクエリ（crud.get_meeting_version）で304を返し、会議の行の読み込みとJSONの作成を行わない。
+Last-Modifiedは秒単位のため、1秒以内の更新を区別できない。クライアントはETagを優先して使う。
+"""
+from datetime import datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .cache import CachedResponse, response_cache
+from .responses import JSTJSONResponse, dumps
+from .utils import UTC
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # DBの日時はタイムゾーンなしのUTC
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
+class Version(NamedTuple):
+    """会議（とそのタスク）の版"""
+    etag: str
+    last_modified: datetime  # UTC
+
+    @classmethod
+    def of(cls, meeting_id: int, updated_at: datetime, tasks_updated_at: Optional[datetime]) -> "Version":
+        updated_at = _as_utc(updated_at)
+        tasks_updated_at = _as_utc(tasks_updated_at) if tasks_updated_at else None
+        # 日時はマイクロ秒単位の整数にする（floatのタイムスタンプは丸めで一致しないことがある）
+        stamps = [(dt - EPOCH) // timedelta(microseconds=1) if dt else 0 for dt in (updated_at, tasks_updated_at)]
+        return cls(
+            etag=f'W/"{meeting_id}-{stamps[0]:x}-{stamps[1]:x}"',
+            last_modified=max(filter(None, (updated_at, tasks_updated_at))),
+        )
+
+    @classmethod
+    def of_meeting(cls, meeting: dict) -> "Version":
+        """会議の詳細（crud.get_meeting_detail）の版（get_meeting_versionと同じ値になる）"""
+        tasks_updated_at = max((task["updated_at"] for task in meeting["tasks"] if task["updated_at"]), default=None)
+        return cls.of(meeting["id"], meeting["updated_at"], tasks_updated_at)
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            # ブラウザのキャッシュにも毎回ETagで確認させる
+            "Cache-Control": "no-cache",
+        }
+
+
+def has_validators(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """レスポンスのヘッダー（ETag・Last-Modified）とリクエストの条件から、304を返せるか判定する"""
+    etag = headers.get("ETag")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Matchがある場合はIf-Modified-Sinceを見ない。弱い比較（W/を無視）で判定する
+        if etag is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return parsedate_to_datetime(last_modified) <= _as_utc(since)
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+async def cached_conditional_response(
+    request: Request,
+    key: str,
+    load_version: Callable[[], Awaitable[Optional[Version]]],
+    load: Callable[[], Awaitable[Optional[Tuple[Any, Optional[Version]]]]],
+) -> Optional[Response]:
+    """
+    レスポンスキャッシュ・条件付きリクエストに対応したJSONレスポンスを返す。
+      1. キャッシュにあれば、保存したETagで判定して304か保存した本文を返す
+      2. 条件付きリクエストなら load_version() の版で判定し、変更がなければ304を返す
+      3. load() で内容と版を読み、キャッシュに保存して返す
+    load() がNone（会議が見つからない）を返した場合はNone。
+    """
+    cached = await response_cache.get(key)
+    if cached is None:
+        token = await response_cache.begin(key)
+        if has_validators(request):
+            version = await load_version()
+            if version is not None and is_not_modified(request, version.headers()):
+                return not_modified_response(version.headers())
+        loaded = await load()
+        if loaded is None:
+            return None
+        content, version = loaded
+        cached = CachedResponse(dumps(content), version.headers() if version else {})
+        await response_cache.put(key, cached, token)
+    if is_not_modified(request, cached.headers):
+        return not_modified_response(cached.headers)
+    return Response(cached.body, headers=cached.headers, media_type=JSTJSONResponse.media_type)
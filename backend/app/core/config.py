@@ -16,7 +16,71 @@ class Settings(BaseSettings):
     
     # データベース設定
     DATABASE_URL: str = "sqlite:///./meeting_minutes.db"
-    
+    # trueの場合は非同期エンジン（asyncpg/aiosqlite）でリクエストを処理する
+    DB_ASYNC: bool = False
+
+    # コネクションプール設定（uvicornのワーカー数 × (DB_POOL_SIZE + DB_MAX_OVERFLOW) が
+    # DBの最大接続数を超えないように設定する）
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # 接続待ちのタイムアウト（秒）
+    DB_POOL_RECYCLE: int = 1800  # この秒数を超えた接続は作り直す（-1で無効）
+    DB_POOL_PRE_PING: bool = True  # フェイルオーバー後の切断済み接続を検出する
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # PostgreSQLのstatement_timeout（0で無制限）
+
+    # trueの場合は起動時にcreate_allでテーブルを作成する（開発用。本番はAlembicを使う）
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = False
+
+    # 一括作成・更新のエンドポイントで1回に受け付ける件数
+    BULK_MAX_ITEMS: int = 1000
+
+    # 会議の詳細・タスク一覧のレスポンスキャッシュ
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024  # プロセス内のキャッシュの件数の上限
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # プロセス内のキャッシュの合計バイト数の上限
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    # redis://... を指定すると複数ワーカーで共有するキャッシュを使う（redisパッケージが必要）
+    RESPONSE_CACHE_URL: Optional[str] = None
+
+    # 会議の変更イベント（Server-Sent Events）
+    EVENTS_QUEUE_SIZE: int = 100  # 1接続あたりの未送信イベントの上限（超えたらresyncを送る）
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0  # イベントがない間にコメント行を送る間隔
+
+    # エクスポート（GET /api/export/...）でサーバーサイドカーソルから1回に読み込む行数
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # インポート（POST /api/import/meetings・python -m app.importer）
+    IMPORT_CHUNK_SIZE: int = 1000  # 1つのトランザクションで登録する行数
+    IMPORT_MAX_ERRORS: int = 1000  # レスポンスに含める失敗した行の上限（件数はすべて数える）
+    IMPORT_MAX_LINE_BYTES: int = 4 * 1024 * 1024  # 1行（議事録を含む会議1件）の上限
+
+    # 文字起こし・要約・タスク抽出のジョブ
+    # 実行待ち・実行中のままこの秒数のあいだ更新のないジョブは止まったものとみなし、新しいジョブを登録できる
+    JOB_STALE_SECONDS: float = 1800.0
+
+    # 音声ファイルの保存先（内容のハッシュをファイル名にして重複を保存しない）
+    AUDIO_STORAGE_DIR: str = "./storage/audio"
+    AUDIO_MAX_UPLOAD_BYTES: int = 4 * 1024 * 1024 * 1024  # 4GB（3時間の非圧縮WAVが収まる）
+
+    # 文字起こし設定
+    WHISPER_MODEL: str = "base"  # ワーカープロセスでロードするWhisperのモデル名
+    WHISPER_LANGUAGE: str = "ja"  # 空の場合はチャンクごとに自動判定する
+    TRANSCRIPTION_WORKERS: int = 1  # 文字起こしのワーカープロセス数（CPUコア数まで）
+    TRANSCRIPTION_CHUNK_SECONDS: float = 60.0  # 録音を分割する目安の長さ（秒）
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = 1.0  # チャンク間ののりしろ（秒）
+
+    # 要約設定（OpenAI互換のChat Completions APIを使う。OPENAI_BASE_URLでローカルのサーバーにも向けられる）
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    SUMMARY_MODEL: str = "gpt-4o-mini"
+    SUMMARY_CHUNK_TOKENS: int = 3000  # 1回の呼び出しに渡す議事録の最大トークン数
+    SUMMARY_MAX_TOKENS: int = 512  # 1回の要約の最大出力トークン数
+    SUMMARY_CONCURRENCY: int = 4  # 同時に実行するAPI呼び出しの数
+    SUMMARY_TIMEOUT_SECONDS: float = 60.0
+
+    # タスク抽出の方法（rule：表現のパターンで抽出 / llm：要約と同じLLMで抽出）
+    TASK_EXTRACTOR: str = "rule"
+
     # class Config: の代わりに
     model_config = ConfigDict(
         env_file=".env"
@@ -1,14 +1,28 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
+from sqlalchemy import DateTime, delete, func, insert, or_, select, text, tuple_, update
+from sqlalchemy.orm import Session, load_only, selectinload
+from typing import AbstractSet, List, Optional
+from pydantic import ValidationError as PydanticValidationError
+from . import cache, events, models, schemas, search
 from .database import get_db
+from .exceptions import BaseAppException, ResourceNotFound, ValidationError
 from .models import Meeting as MeetingModel
 from .schemas import MeetingCreate
-from datetime import datetime, timezone
-from json import dumps, loads
+from .utils import (
+    encode_cursor,
+    decode_cursor,
+    deserialize_participants,
+    format_transcript,
+    parse_transcript,
+    serialize_participants
+)
+from datetime import datetime, timedelta, timezone
+
+# 未完了（実行待ち・実行中）のジョブの状態
+ACTIVE_JOB_STATUSES = ("queued", "running")
 
 def create_meeting(db: Session, meeting: schemas.MeetingCreate):
     try:
-        # モデルのコンストラクタでJSON変換を行うように変更したので、
+        # モデルの属性イベントでJSON変換を行うので、
         # 直接participantsを渡せる
         db_meeting = models.Meeting(
             title=meeting.title,
@@ -17,107 +31,569 @@ def create_meeting(db: Session, meeting: schemas.MeetingCreate):
             end_time=meeting.end_time,
             participants=meeting.participants,  # 直接リストを渡す
             audio_file_path=meeting.audio_file_path,
-            transcript=meeting.transcript,
             summary=meeting.summary
         )
+        _set_participant_links(db_meeting, meeting.participants)
+        segments = parse_transcript(meeting.transcript)
+        _set_transcript_segments(db, db_meeting, segments)
         
         db.add(db_meeting)
         db.commit()
         db.refresh(db_meeting)
-        
-        # モデルが自動的にJSONを処理するので、
-        # participants_listプロパティを使用
-        return {
-            "id": db_meeting.id,
-            "title": db_meeting.title,
-            "date": db_meeting.date,
-            "start_time": db_meeting.start_time,
-            "end_time": db_meeting.end_time,
-            "participants": db_meeting.participants_list,
-            "audio_file_path": db_meeting.audio_file_path,
-            "transcript": db_meeting.transcript,
-            "summary": db_meeting.summary,
-            "created_at": db_meeting.created_at,
-            "updated_at": db_meeting.updated_at,
-            "tasks": []
-        }
+        return _new_meeting_to_dict(db_meeting, segments)
     except Exception as e:
         db.rollback()
         raise
 
-def get_meetings(db: Session, skip: int = 0, limit: int = 100):
-    meetings = db.query(models.Meeting).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": meeting.id,
-            "title": meeting.title,
-            "date": meeting.date,
-            "start_time": meeting.start_time,
-            "end_time": meeting.end_time,
-            "participants": meeting.participants_list,  # プロパティを使用
-            "audio_file_path": meeting.audio_file_path,
-            "transcript": meeting.transcript,
-            "summary": meeting.summary,
-            "created_at": meeting.created_at,
-            "updated_at": meeting.updated_at
-        }
-        for meeting in meetings
+def _new_meeting_to_dict(db_meeting: models.Meeting, segments) -> dict:
+    """作成直後の会議をレスポンス用の辞書にする（議事録・タスクを読み直さない）"""
+    # モデルが自動的にJSONを処理するので、
+    # participants_listプロパティを使用
+    return {
+        "id": db_meeting.id,
+        "title": db_meeting.title,
+        "date": db_meeting.date,
+        "start_time": db_meeting.start_time,
+        "end_time": db_meeting.end_time,
+        "participants": db_meeting.participants_list,
+        "audio_file_path": db_meeting.audio_file_path,
+        "transcript": format_transcript(segments) if segments else None,
+        "summary": db_meeting.summary,
+        "created_at": db_meeting.created_at,
+        "updated_at": db_meeting.updated_at,
+        "tasks": []
+    }
+
+def _bulk_error(index: int, e: Exception) -> dict:
+    """一括処理の1件分のエラー（検証エラーのメッセージ）"""
+    if isinstance(e, BaseAppException):
+        detail = e.message
+    else:
+        errors = e.errors()
+        if errors:
+            field = ".".join(str(loc) for loc in errors[0]["loc"])
+            detail = f"{field}: {errors[0]['msg']}" if field else errors[0]["msg"]
+        else:
+            detail = "入力データが不正です"
+    return {"index": index, "detail": detail}
+
+# 会議の一括作成
+def create_meetings_bulk(db: Session, items: List[dict]) -> dict:
+    """
+    会議を1件ずつ検証し、検証に通った会議を1つのトランザクションでまとめて登録する。
+    会議・参加者・議事録のセグメントはそれぞれ1回のINSERT文で登録する。
+
+    返却値：{"created": 作成した会議のリスト, "errors": 検証に失敗した項目（配列での位置とメッセージ）}
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            meeting = schemas.MeetingCreate.model_validate(item)
+        except (BaseAppException, PydanticValidationError) as e:
+            errors.append(_bulk_error(index, e))
+            continue
+        valid.append((meeting, parse_transcript(meeting.transcript)))
+    if not valid:
+        return {"created": [], "errors": errors}
+
+    try:
+        now = datetime.now(timezone.utc)
+        # RETURNINGの行の順序は保証されないが、IDは1つの文の中でVALUESの順に採番されるので
+        # ID順に並べ直してリクエストの順序に対応させる（sort_by_parameter_orderはSQLiteで1行ずつのINSERTになる）
+        db_meetings = sorted(db.scalars(
+            # NULLを含む行も同じ文にまとめる（省略すると値がNULLかどうかで文が分かれる）
+            insert(models.Meeting).returning(models.Meeting).execution_options(render_nulls=True),
+            [
+                {
+                    "title": meeting.title,
+                    "date": meeting.date.replace(tzinfo=timezone.utc),
+                    "start_time": meeting.start_time,
+                    "end_time": meeting.end_time,
+                    # 一括INSERTでは属性イベントが発生しないため、ここでJSON文字列にする
+                    "participants": serialize_participants(meeting.participants),
+                    "audio_file_path": meeting.audio_file_path,
+                    "summary": meeting.summary,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for meeting, _ in valid
+            ]
+        ).all(), key=lambda db_meeting: db_meeting.id)
+
+        links = [
+            {"meeting_id": db_meeting.id, "name": name}
+            for db_meeting, (meeting, _) in zip(db_meetings, valid)
+            for name in dict.fromkeys(meeting.participants or [])
+        ]
+        if links:
+            db.execute(insert(models.MeetingParticipant), links)
+        segments = [
+            {
+                "meeting_id": db_meeting.id,
+                "position": position,
+                "start_seconds": start,
+                "end_seconds": end,
+                "text": text
+            }
+            for db_meeting, (_, meeting_segments) in zip(db_meetings, valid)
+            for position, (start, end, text) in enumerate(meeting_segments)
+        ]
+        if segments:
+            db.execute(insert(models.TranscriptSegment).execution_options(render_nulls=True), segments)
+        for db_meeting in db_meetings:
+            search.mark_dirty(db, db_meeting.id)
+            cache.mark_changed(db, db_meeting.id)
+
+        # コミットで属性が期限切れになる前にレスポンスを作る
+        created = [
+            _new_meeting_to_dict(db_meeting, meeting_segments)
+            for db_meeting, (_, meeting_segments) in zip(db_meetings, valid)
+        ]
+        db.commit()
+        return {"created": created, "errors": errors}
+    except Exception as e:
+        db.rollback()
+        raise
+
+# 会議のインポート（importer.pyで検証済みの行を登録する）
+def import_meetings(db: Session, rows: List[dict]) -> List[int]:
+    """
+    検証済みの会議（importer.validate_lines の行）を1つのトランザクションで登録し、作成した会議のIDを返す。
+    会議・参加者・議事録のセグメント・タスクはそれぞれ1回のINSERT文（ORMを経由しないCoreのexecutemany）で登録する。
+    """
+    try:
+        now = datetime.now(timezone.utc)
+        # IDは1つの文の中でVALUESの順に採番されるので、ID順に並べて行に対応させる（create_meetings_bulkと同じ）
+        meetings = models.Meeting.__table__
+        ids = sorted(db.scalars(
+            insert(meetings).returning(meetings.c.id),
+            [{**row["meeting"], "created_at": now, "updated_at": now} for row in rows]
+        ).all())
+
+        links = [
+            {"meeting_id": meeting_id, "name": name}
+            for meeting_id, row in zip(ids, rows)
+            for name in dict.fromkeys(row["participants"])
+        ]
+        if links:
+            db.execute(insert(models.MeetingParticipant.__table__), links)
+        segments = [
+            {
+                "meeting_id": meeting_id,
+                "position": position,
+                "start_seconds": start,
+                "end_seconds": end,
+                "text": text
+            }
+            for meeting_id, row in zip(ids, rows)
+            for position, (start, end, text) in enumerate(row["segments"])
+        ]
+        if segments:
+            db.execute(insert(models.TranscriptSegment.__table__), segments)
+        tasks = [
+            {**task, "meeting_id": meeting_id, "created_at": now, "updated_at": now}
+            for meeting_id, row in zip(ids, rows)
+            for task in row["tasks"]
+        ]
+        if tasks:
+            db.execute(insert(models.Task.__table__), tasks)
+        for meeting_id in ids:
+            search.mark_dirty(db, meeting_id)
+            search.mark_tasks_dirty(db, meeting_id)
+            cache.mark_changed(db, meeting_id)
+        db.commit()
+        return ids
+    except Exception as e:
+        db.rollback()
+        raise
+
+def _set_participant_links(db_meeting: models.Meeting, participants):
+    # 検索用の参加者テーブルをparticipantsと同じ内容にする（重複は除く）
+    db_meeting.participant_links = [
+        models.MeetingParticipant(name=name) for name in dict.fromkeys(participants or [])
+    ]
+
+def _set_transcript_segments(db: Session, db_meeting: models.Meeting, segments):
+    """議事録のセグメントを (開始秒, 終了秒, 本文) の並びで置き換える"""
+    if db_meeting.id is not None:
+        # 既存のセグメントは読み込まずにまとめて削除する
+        db.query(models.TranscriptSegment).filter(
+            models.TranscriptSegment.meeting_id == db_meeting.id
+        ).delete(synchronize_session=False)
+        db.expire(db_meeting, ["transcript_segments"])
+        search.mark_dirty(db, db_meeting.id)
+        cache.mark_changed(db, db_meeting.id)
+        # 議事録だけを変更した場合も会議の更新日時（ETag）を変える
+        db_meeting.updated_at = datetime.now(timezone.utc)
+    db_meeting.transcript_segments = [
+        models.TranscriptSegment(position=position, start_seconds=start, end_seconds=end, text=text)
+        for position, (start, end, text) in enumerate(segments)
     ]
 
+def _transcript_text(meeting: models.Meeting) -> Optional[str]:
+    segments = meeting.transcript_segments
+    if not segments:
+        return None
+    return format_transcript((s.start_seconds, s.end_seconds, s.text) for s in segments)
+
+# fieldsで指定できる会議の項目と、その値の取り出し方（この順でレスポンスに並べる）
+MEETING_FIELDS = {
+    "id": lambda meeting: meeting.id,
+    "title": lambda meeting: meeting.title,
+    "date": lambda meeting: meeting.date,
+    "start_time": lambda meeting: meeting.start_time,
+    "end_time": lambda meeting: meeting.end_time,
+    "participants": lambda meeting: meeting.participants_list,
+    "audio_file_path": lambda meeting: meeting.audio_file_path,
+    "transcript": lambda meeting: _transcript_text(meeting),
+    "summary": lambda meeting: meeting.summary,
+    "created_at": lambda meeting: meeting.created_at,
+    "updated_at": lambda meeting: meeting.updated_at,
+    "tasks": lambda meeting: [task_to_dict(task) for task in meeting.tasks],
+}
+
+def _meeting_to_dict(
+    meeting: models.Meeting, include_transcript: bool = True, fields: Optional[AbstractSet[str]] = None
+) -> dict:
+    """
+    会議をレスポンス用の辞書に変換する。
+    一覧では include_transcript=False とし、議事録の本文（transcript）を含めない。
+    fieldsを指定した場合は、その項目だけを含める。
+    """
+    if fields is not None:
+        return {name: getter(meeting) for name, getter in MEETING_FIELDS.items() if name in fields}
+    result = {
+        "id": meeting.id,
+        "title": meeting.title,
+        "date": meeting.date,
+        "start_time": meeting.start_time,
+        "end_time": meeting.end_time,
+        "participants": meeting.participants_list,  # プロパティを使用
+        "audio_file_path": meeting.audio_file_path,
+        "transcript": _transcript_text(meeting) if include_transcript else None,
+        "summary": meeting.summary,
+        "created_at": meeting.created_at,
+        "updated_at": meeting.updated_at,
+        "tasks": [task_to_dict(task) for task in meeting.tasks]
+    }
+    if not include_transcript:
+        del result["transcript"]
+    return result
+
+def task_to_dict(task: models.Task) -> dict:
+    """タスクをレスポンス用の辞書に変換"""
+    return {
+        "id": task.id,
+        "meeting_id": task.meeting_id,
+        "content": task.content,
+        "assignee": task.assignee,
+        "due_date": task.due_date,
+        "status": task.status,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at
+    }
+
+def _meetings_query(
+    db: Session, include_transcript: bool = False, fields: Optional[AbstractSet[str]] = None
+):
+    if fields is None:
+        # タスクはIN句でまとめて取得し、行ごとの遅延ロードを発生させない
+        query = db.query(models.Meeting).options(selectinload(models.Meeting.tasks))
+        if include_transcript:
+            query = query.options(selectinload(models.Meeting.transcript_segments))
+        return query
+
+    # 指定された項目の列だけをSELECTする（id・dateは並び順・カーソルに使うため常に読む）。
+    # 読み込まない列に触れた場合は遅延ロードせずに例外にする
+    columns = {"id", "date"} | (set(fields) & set(models.Meeting.__table__.columns.keys()))
+    query = db.query(models.Meeting).options(
+        load_only(*(getattr(models.Meeting, column) for column in columns), raiseload=True)
+    )
+    if "tasks" in fields:
+        query = query.options(selectinload(models.Meeting.tasks))
+    if "transcript" in fields:
+        query = query.options(selectinload(models.Meeting.transcript_segments))
+    return query
+
+def get_meetings(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    include_transcript: bool = False,
+    fields: Optional[AbstractSet[str]] = None
+):
+    meetings = _meetings_query(db, include_transcript, fields).offset(skip).limit(limit).all()
+    return [_meeting_to_dict(meeting, include_transcript, fields) for meeting in meetings]
+
+# キーセット（カーソル）方式の会議一覧取得
+def get_meetings_after(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    include_transcript: bool = False,
+    fields: Optional[AbstractSet[str]] = None
+):
+    """
+    (date, id)順で cursor より後の会議を最大 limit 件返す。
+    OFFSETを使わずインデックスを範囲検索するため、深いページでもコストが一定。
+
+    返却値：(会議のリスト, 次ページのカーソル。最終ページならNone)
+    """
+    query = _meetings_query(db, include_transcript, fields).order_by(models.Meeting.date, models.Meeting.id)
+    if cursor:
+        try:
+            last_date, last_id = decode_cursor(cursor)
+        except ValueError:
+            raise ValidationError("カーソルの形式が不正です")
+        query = query.filter(
+            tuple_(models.Meeting.date, models.Meeting.id) > (last_date, last_id)
+        )
+
+    # 1件多く取得して次ページの有無を判定する
+    meetings = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        last = meetings[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+    return [_meeting_to_dict(meeting, include_transcript, fields) for meeting in meetings], next_cursor
+
+# 参加者名から会議一覧を取得（meeting_participantsのインデックスで検索）
+def get_meetings_by_participant(
+    db: Session, name: str, skip: int = 0, limit: int = 100, include_transcript: bool = False
+):
+    meetings = (
+        _meetings_query(db, include_transcript)
+        .join(models.MeetingParticipant)
+        .filter(models.MeetingParticipant.name == name)
+        .order_by(models.Meeting.date, models.Meeting.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return [_meeting_to_dict(meeting, include_transcript) for meeting in meetings]
+
 def get_meeting_by_id(db: Session, meeting_id: int):
     try:
-        meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+        meeting = _meetings_query(db).filter(models.Meeting.id == meeting_id).first()
         return meeting  # モデルが自動的にJSONを処理
     except Exception as e:
         print(f"Error in get_meeting_by_id: {str(e)}")
         return None
 
+def get_meeting_detail(db: Session, meeting_id: int, fields: Optional[AbstractSet[str]] = None):
+    """レスポンス用に会議をタスク付きの辞書で返す（存在しない場合はNone）"""
+    if fields is None:
+        meeting = get_meeting_by_id(db, meeting_id)
+    else:
+        meeting = _meetings_query(db, fields=fields).filter(models.Meeting.id == meeting_id).first()
+    if meeting is None:
+        return None
+    return _meeting_to_dict(meeting, fields=fields)
+
+# SQLiteは主キー（rowid）での検索を優先し、長い要約などの後ろにある updated_at を行から
+# （オーバーフローページをたどって）読むため、INDEXED BY でインデックスだけを読ませる
+SQLITE_MEETING_VERSION = text(
+    "SELECT m.updated_at, (SELECT max(t.updated_at) FROM tasks AS t WHERE t.meeting_id = m.id) AS tasks_updated_at "
+    "FROM meetings AS m INDEXED BY ix_meetings_id_updated_at WHERE m.id = :id"
+).columns(updated_at=DateTime, tasks_updated_at=DateTime)
+
+def get_meeting_version(db: Session, meeting_id: int):
+    """
+    会議の更新日時と、そのタスクの最新の更新日時（ETag用。存在しない場合はNone）。
+    (id, updated_at) と (meeting_id, updated_at) のインデックスだけを読む1回のクエリで取得する。
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return db.execute(SQLITE_MEETING_VERSION, {"id": meeting_id}).first()
+    tasks_updated_at = (
+        select(func.max(models.Task.updated_at))
+        .where(models.Task.meeting_id == models.Meeting.id)
+        .scalar_subquery()
+    )
+    return db.execute(
+        select(models.Meeting.updated_at, tasks_updated_at).where(models.Meeting.id == meeting_id)
+    ).first()
+
+def segment_to_dict(segment: models.TranscriptSegment) -> dict:
+    return {"start": segment.start_seconds, "end": segment.end_seconds, "text": segment.text}
+
+# 議事録の取得（時刻の範囲を指定した場合はその範囲と重なるセグメントのみ）
+def get_transcript_segments(
+    db: Session, meeting_id: int, start: Optional[float] = None, end: Optional[float] = None
+):
+    """会議が存在しない場合はNoneを返す"""
+    if db.query(models.Meeting.id).filter(models.Meeting.id == meeting_id).first() is None:
+        return None
+    Segment = models.TranscriptSegment
+    query = db.query(Segment).filter(Segment.meeting_id == meeting_id)
+    if start is None and end is None:
+        return [segment_to_dict(s) for s in query.order_by(Segment.position)]
+
+    if start is not None:
+        # start を含むセグメント（start以前に始まる最後のセグメント）から読み始める。
+        # どちらも (meeting_id, start_seconds) のインデックスの範囲検索で済む
+        first_start = (
+            select(func.max(Segment.start_seconds))
+            .where(Segment.meeting_id == meeting_id, Segment.start_seconds <= start)
+            .scalar_subquery()
+        )
+        query = query.filter(
+            Segment.start_seconds >= func.coalesce(first_start, start),
+            or_(Segment.end_seconds.is_(None), Segment.end_seconds > start),
+        )
+    else:
+        query = query.filter(Segment.start_seconds.isnot(None))
+    if end is not None:
+        query = query.filter(Segment.start_seconds < end)
+    return [segment_to_dict(s) for s in query.order_by(Segment.start_seconds)]
+
+def _publish_meeting_updated(meeting: dict):
+    # 会議の内容は大きいことがあるため、IDと更新日時だけを送る（クライアントはGETで取得し直す）
+    events.publish(meeting["id"], "meeting.updated", {"id": meeting["id"], "updated_at": meeting["updated_at"]})
+
+# アップロードされた音声ファイルを会議に設定
+def set_audio_file_path(db: Session, meeting_id: int, audio_file_path: str):
+    try:
+        db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+        if db_meeting is None:
+            return None
+        db_meeting.audio_file_path = audio_file_path
+        db.commit()
+        db.refresh(db_meeting)
+        result = _meeting_to_dict(db_meeting)
+        _publish_meeting_updated(result)
+        return result
+    except Exception as e:
+        db.rollback()
+        raise
+
 def update_meeting(db: Session, meeting_id: int, meeting: schemas.MeetingCreate):
     try:
         db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
         if db_meeting is None:
             return None
         
-        # データを更新（participantsは特別扱い）
+        # データを更新（participants・transcriptは特別扱い）
         meeting_data = meeting.model_dump()
         participants = meeting_data.pop('participants', [])  # participantsを取り出す
+        transcript = meeting_data.pop('transcript', None)
         
         # その他のフィールドを更新
         for key, value in meeting_data.items():
             setattr(db_meeting, key, value)
         
         # participantsを適切に変換して設定
-        db_meeting.participants = dumps(participants)
+        db_meeting.participants = participants
+        _set_participant_links(db_meeting, participants)
+
+        # 一覧のレスポンスにはtranscriptがないため、送信されなかった場合は議事録を残す
+        if 'transcript' in meeting.model_fields_set:
+            _set_transcript_segments(db, db_meeting, parse_transcript(transcript))
         
         db.commit()
         db.refresh(db_meeting)
-        return {
-            "id": db_meeting.id,
-            "title": db_meeting.title,
-            "date": db_meeting.date,
-            "start_time": db_meeting.start_time,
-            "end_time": db_meeting.end_time,
-            "participants": db_meeting.participants_list,  # リストとして取得
-            "audio_file_path": db_meeting.audio_file_path,
-            "transcript": db_meeting.transcript,
-            "summary": db_meeting.summary,
-            "created_at": db_meeting.created_at,
-            "updated_at": db_meeting.updated_at,
-            "tasks": []
-        }
+        result = _meeting_to_dict(db_meeting)
+        _publish_meeting_updated(result)
+        return result
     except Exception as e:
         db.rollback()
         raise
 
+# PATCHで返す会議の項目（タスクは読み直さない。議事録は送信された場合だけ返す）
+PATCHED_MEETING_COLUMNS = (
+    "id", "title", "date", "start_time", "end_time", "participants",
+    "audio_file_path", "summary", "created_at", "updated_at"
+)
+
+def patch_meeting(db: Session, meeting_id: int, meeting: schemas.MeetingUpdate):
+    """
+    送信された項目だけを1回の UPDATE ... RETURNING で更新し、更新後の行からレスポンスを作る（SELECTで読み直さない）。
+    開始・終了時刻の片方だけを送信した場合は、もう片方を読んで前後関係を検証する。
+    参加者・議事録を送信した場合は、それぞれの行をまとめて置き換える。
+    """
+    fields = meeting.model_dump(exclude_unset=True)
+    if not fields:
+        raise ValidationError("更新する項目を指定してください")
+    try:
+        if ("start_time" in fields) != ("end_time" in fields):
+            stored = db.execute(
+                select(models.Meeting.start_time, models.Meeting.end_time).where(models.Meeting.id == meeting_id)
+            ).first()
+            if stored is None:
+                return None
+            schemas.check_time_range(
+                fields.get("start_time", stored.start_time), fields.get("end_time", stored.end_time)
+            )
+
+        values = dict(fields)
+        transcript_sent = "transcript" in values
+        transcript = values.pop("transcript", None)
+        if "participants" in values:
+            # Core/ORMのUPDATE文では属性イベントが発生しないため、ここでJSON文字列にする
+            values["participants"] = serialize_participants(values["participants"])
+        if "date" in values:
+            values["date"] = values["date"].replace(tzinfo=timezone.utc)
+        # updated_atはonupdateで設定される（更新する項目が議事録だけでも更新日時は変わる）
+        columns = models.Meeting.__table__.c
+        row = db.execute(
+            update(models.Meeting)
+            .where(models.Meeting.id == meeting_id)
+            .values(values or {"updated_at": datetime.now(timezone.utc)})
+            .returning(*(columns[name] for name in PATCHED_MEETING_COLUMNS))
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            db.rollback()
+            return None
+        cache.mark_changed(db, meeting_id)
+
+        if "participants" in fields:
+            db.execute(delete(models.MeetingParticipant).where(models.MeetingParticipant.meeting_id == meeting_id))
+            links = [{"meeting_id": meeting_id, "name": name} for name in dict.fromkeys(fields["participants"])]
+            if links:
+                db.execute(insert(models.MeetingParticipant), links)
+        segments = None
+        if transcript_sent:
+            segments = parse_transcript(transcript)
+            db.execute(delete(models.TranscriptSegment).where(models.TranscriptSegment.meeting_id == meeting_id))
+            if segments:
+                db.execute(insert(models.TranscriptSegment).execution_options(render_nulls=True), [
+                    {"meeting_id": meeting_id, "position": position,
+                     "start_seconds": start, "end_seconds": end, "text": text}
+                    for position, (start, end, text) in enumerate(segments)
+                ])
+        if transcript_sent or "title" in fields or "summary" in fields:
+            search.mark_dirty(db, meeting_id)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise
+
+    result = dict(row._mapping)
+    result["participants"] = deserialize_participants(result["participants"])
+    if transcript_sent:
+        result["transcript"] = format_transcript(segments) if segments else None
+    _publish_meeting_updated(result)
+    return result
+
 def delete_meeting(db: Session, meeting_id: int):
     try:
         db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
         if db_meeting is None:
             return None
         
+        # 削除後は参照できないため、先にレスポンス用の辞書を作っておく
+        deleted = _meeting_to_dict(db_meeting)
+        # 議事録のセグメントは読み込まずにまとめて削除する
+        db.query(models.TranscriptSegment).filter(
+            models.TranscriptSegment.meeting_id == meeting_id
+        ).delete(synchronize_session=False)
+        db.expire(db_meeting, ["transcript_segments"])
         db.delete(db_meeting)
         db.commit()
-        return db_meeting
+        events.publish(meeting_id, events.MEETING_DELETED, {"id": meeting_id})
+        return deleted
     except Exception as e:
         db.rollback()
         raise
@@ -146,6 +622,7 @@ def create_task(db: Session, task_data: dict):
         db.add(db_task)
         db.commit()
         db.refresh(db_task)
+        events.publish(db_task.meeting_id, "task.created", task_to_dict(db_task))
         return db_task
     except Exception as e:
         db.rollback()
@@ -174,12 +651,385 @@ def update_task(db: Session, task_id: int, task: schemas.TaskCreate):
             setattr(db_task, key, value)
         db.commit()
         db.refresh(db_task)
+        events.publish(db_task.meeting_id, "task.updated", task_to_dict(db_task))
     return db_task
 
+# タスクの部分更新
+def patch_task(db: Session, task_id: int, task: schemas.TaskUpdate):
+    """送信された項目だけを1回の UPDATE ... RETURNING で更新し、更新後の行を辞書で返す（SELECTで読み直さない）"""
+    fields = task.model_dump(exclude_unset=True)
+    if not fields:
+        raise ValidationError("更新する項目を指定してください")
+    try:
+        row = db.execute(
+            update(models.Task)
+            .where(models.Task.id == task_id)
+            .values(fields)
+            .returning(*models.Task.__table__.c)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            db.rollback()
+            return None
+        if "content" in fields:
+            search.mark_tasks_dirty(db, row.meeting_id)
+        cache.mark_changed(db, row.meeting_id)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise
+    result = dict(row._mapping)
+    events.publish(result["meeting_id"], "task.updated", result)
+    return result
+
+def _touch_meetings(db: Session, meeting_ids):
+    """
+    タスクを削除した会議の更新日時を変える。
+    削除ではタスクの最新の更新日時が変わらないことがあり、ETag・Last-Modifiedが変わらないため。
+    """
+    db.execute(
+        update(models.Meeting)
+        .where(models.Meeting.id.in_(sorted(meeting_ids)))
+        .values(updated_at=datetime.now(timezone.utc))
+    )
+
 # タスクの削除
 def delete_task(db: Session, task_id: int):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if db_task:
         db.delete(db_task)
+        _touch_meetings(db, [db_task.meeting_id])
+        db.commit()
+        events.publish(db_task.meeting_id, "task.deleted", {"id": db_task.id, "meeting_id": db_task.meeting_id})
+    return db_task
+
+# タスクの一括作成・更新・削除
+def apply_tasks_bulk(db: Session, items: List[dict]) -> dict:
+    """
+    タスクの操作（op: create / update / delete。省略時はupdate）を1件ずつ検証し、
+    検証に通った操作を1つのトランザクションでまとめて実行する。
+    作成は1回のINSERT ... RETURNING、更新は主キーごとのexecutemany、削除は1回のDELETE文で行う。
+    更新は送信された項目だけを検証・更新する。
+
+    返却値：{"created", "updated", "deleted"（削除したID）, "errors"（配列での位置とメッセージ）}
+    """
+    errors = []
+    creates = []  # (位置, タスク)
+    updates = []  # (位置, タスクID, 更新する項目)
+    deletes = []  # (位置, タスクID)
+    seen = set()
+    for index, item in enumerate(items):
+        try:
+            item = dict(item)
+            op = item.pop("op", "update")
+            if op == "create":
+                meeting_id = item.pop("meeting_id", None)
+                if not isinstance(meeting_id, int) or isinstance(meeting_id, bool):
+                    raise ValidationError("meeting_idを指定してください")
+                task = schemas.TaskCreate.model_validate(item)
+                creates.append((index, {"meeting_id": meeting_id, **task.model_dump()}))
+                continue
+            if op not in ("update", "delete"):
+                raise ValidationError("opには create / update / delete のいずれかを指定してください")
+            task_id = item.pop("id", None)
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                raise ValidationError("idを指定してください")
+            if task_id in seen:
+                raise ValidationError("同じタスクが複数回指定されています")
+            seen.add(task_id)
+            if op == "delete":
+                deletes.append((index, task_id))
+                continue
+            fields = schemas.TaskUpdate.model_validate(item).model_dump(exclude_unset=True)
+            if not fields:
+                raise ValidationError("更新する項目を指定してください")
+            updates.append((index, task_id, fields))
+        except (BaseAppException, PydanticValidationError) as e:
+            errors.append(_bulk_error(index, e))
+
+    # 対象のタスク・会議の存在をまとめて確認する
+    task_ids = [task_id for _, task_id, _ in updates] + [task_id for _, task_id in deletes]
+    task_meetings = dict(db.execute(
+        select(models.Task.id, models.Task.meeting_id).where(models.Task.id.in_(task_ids))
+    ).all()) if task_ids else {}
+    meeting_ids = {task["meeting_id"] for _, task in creates}
+    meetings = set(db.execute(
+        select(models.Meeting.id).where(models.Meeting.id.in_(meeting_ids))
+    ).scalars()) if meeting_ids else set()
+    for index, task in creates:
+        if task["meeting_id"] not in meetings:
+            errors.append({"index": index, "detail": ResourceNotFound("会議").message})
+    for index, task_id in [(index, task_id) for index, task_id, _ in updates] + deletes:
+        if task_id not in task_meetings:
+            errors.append({"index": index, "detail": ResourceNotFound("タスク").message})
+    creates = [task for _, task in creates if task["meeting_id"] in meetings]
+    updates = [(task_id, fields) for _, task_id, fields in updates if task_id in task_meetings]
+    deletes = [task_id for _, task_id in deletes if task_id in task_meetings]
+
+    try:
+        created = [task_to_dict(task) for task in _insert_tasks(db, creates)]
+
+        updated = []
+        if updates:
+            now = datetime.now(timezone.utc)
+            # 項目の組み合わせが同じ行ごとにexecutemanyでまとめて更新する
+            db.execute(update(models.Task), [
+                {"id": task_id, **fields, "updated_at": now} for task_id, fields in updates
+            ])
+            db_tasks = {
+                task.id: task
+                for task in db.scalars(
+                    select(models.Task)
+                    .where(models.Task.id.in_([task_id for task_id, _ in updates]))
+                    .execution_options(populate_existing=True)
+                )
+            }
+            updated = [task_to_dict(db_tasks[task_id]) for task_id, _ in updates]
+            for task_id, fields in updates:
+                if "content" in fields:
+                    search.mark_tasks_dirty(db, task_meetings[task_id])
+                cache.mark_changed(db, task_meetings[task_id])
+
+        if deletes:
+            db.execute(
+                delete(models.Task).where(models.Task.id.in_(deletes)).execution_options(synchronize_session="fetch")
+            )
+            for task_id in deletes:
+                search.mark_tasks_dirty(db, task_meetings[task_id])
+                cache.mark_changed(db, task_meetings[task_id])
+            _touch_meetings(db, {task_meetings[task_id] for task_id in deletes})
+
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise
+    for event_type, tasks in (("task.created", created), ("task.updated", updated)):
+        for task in tasks:
+            events.publish(task["meeting_id"], event_type, task)
+    for task_id in deletes:
+        events.publish(task_meetings[task_id], "task.deleted", {"id": task_id, "meeting_id": task_meetings[task_id]})
+    errors.sort(key=lambda error: error["index"])
+    return {"created": created, "updated": updated, "deleted": deletes, "errors": errors}
+
+
+# ジョブをレスポンス用の辞書に変換
+def job_to_dict(job: models.Job) -> dict:
+    return {
+        "id": job.id,
+        "meeting_id": job.meeting_id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
+
+# ジョブの作成
+def create_job(db: Session, meeting_id: int, kind: str):
+    try:
+        db_job = models.Job(meeting_id=meeting_id, kind=kind, status="queued", progress=0.0)
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        return job_to_dict(db_job)
+    except Exception as e:
+        db.rollback()
+        raise
+
+# ジョブの取得
+def get_job(db: Session, job_id: int):
+    db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    return job_to_dict(db_job) if db_job else None
+
+# 会議の未完了のジョブを取得
+# （stale_afterを指定した場合は、その秒数のあいだ更新のないジョブは止まったものとみなして除く）
+def get_active_job(db: Session, meeting_id: int, kind: str, stale_after: Optional[float] = None):
+    query = db.query(models.Job).filter(
+        models.Job.meeting_id == meeting_id,
+        models.Job.kind == kind,
+        models.Job.status.in_(ACTIVE_JOB_STATUSES)
+    )
+    if stale_after is not None:
+        query = query.filter(models.Job.updated_at >= datetime.now(timezone.utc) - timedelta(seconds=stale_after))
+    db_job = query.order_by(models.Job.id.desc()).first()
+    return job_to_dict(db_job) if db_job else None
+
+# 未完了のジョブをすべて失敗にする（起動時に、前回のプロセスで実行中だったジョブを片付ける）
+def fail_unfinished_jobs(db: Session, error: str) -> int:
+    try:
+        result = db.execute(
+            update(models.Job)
+            .where(models.Job.status.in_(ACTIVE_JOB_STATUSES))
+            .values(status="failed", error=error, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+    except Exception as e:
+        db.rollback()
+        raise
+
+# ジョブの状態を更新
+def update_job(db: Session, job_id: int, **fields):
+    try:
+        db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
+        if db_job:
+            for key, value in fields.items():
+                setattr(db_job, key, value)
+            db.commit()
+            if fields.get("status") == "failed":
+                events.publish(db_job.meeting_id, "job.failed", job_to_dict(db_job))
+        return db_job
+    except Exception as e:
+        db.rollback()
+        raise
+
+# 文字起こし結果（(開始秒, 終了秒, 本文)の並び）を保存し、ジョブを完了にする
+def save_transcript(db: Session, job_id: int, meeting_id: int, segments):
+    try:
+        db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+        db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
+        if db_meeting is None:
+            db_job.status = "failed"
+            db_job.error = "会議が削除されたため文字起こし結果を保存できませんでした"
+        else:
+            _set_transcript_segments(db, db_meeting, segments)
+            db_job.status = "completed"
+            db_job.progress = 1.0
+        db.commit()
+        if db_meeting is not None:
+            # 議事録は大きいため本文は送らない（GET /api/meetings/{id}/transcript で取得する）
+            events.publish(meeting_id, "transcript.completed", {"job_id": job_id, "meeting_id": meeting_id})
+    except Exception as e:
+        db.rollback()
+        raise
+
+# 会議の議事録のテキスト（議事録がない場合はNone）
+def get_transcript_text(db: Session, meeting_id: int) -> Optional[str]:
+    rows = db.execute(
+        select(
+            models.TranscriptSegment.start_seconds,
+            models.TranscriptSegment.end_seconds,
+            models.TranscriptSegment.text
+        )
+        .where(models.TranscriptSegment.meeting_id == meeting_id)
+        .order_by(models.TranscriptSegment.position)
+    ).all()
+    if not rows:
+        return None
+    return format_transcript(rows)
+
+# 要約のキャッシュを取得
+def get_cached_summary(db: Session, key: str) -> Optional[str]:
+    return db.execute(
+        select(models.SummaryCache.summary).where(models.SummaryCache.key == key)
+    ).scalar_one_or_none()
+
+# 要約をキャッシュに保存（同じキーがあれば上書き）
+def save_cached_summary(db: Session, key: str, summary: str):
+    try:
+        db.merge(models.SummaryCache(key=key, summary=summary))
         db.commit()
-    return db_task
\ No newline at end of file
+    except Exception as e:
+        db.rollback()
+        raise
+
+# 要約を会議に保存し、ジョブを完了にする
+def save_summary(db: Session, job_id: int, meeting_id: int, summary: str):
+    try:
+        db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+        db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
+        if db_meeting is None:
+            db_job.status = "failed"
+            db_job.error = "会議が削除されたため要約を保存できませんでした"
+        else:
+            db_meeting.summary = summary
+            db_job.status = "completed"
+            db_job.progress = 1.0
+        db.commit()
+        if db_meeting is not None:
+            events.publish(meeting_id, "summary.completed", {"job_id": job_id, "meeting_id": meeting_id, "summary": summary})
+    except Exception as e:
+        db.rollback()
+        raise
+
+# 会議に議事録があるか
+def has_transcript(db: Session, meeting_id: int) -> bool:
+    return db.execute(
+        select(models.TranscriptSegment.id).where(models.TranscriptSegment.meeting_id == meeting_id).limit(1)
+    ).first() is not None
+
+# タスク抽出の入力（会議の日付・参加者・要約・議事録。会議がない場合はNone）
+def get_extraction_source(db: Session, meeting_id: int) -> Optional[dict]:
+    meeting = db.execute(
+        select(models.Meeting.date, models.Meeting.participants, models.Meeting.summary)
+        .where(models.Meeting.id == meeting_id)
+    ).first()
+    if meeting is None:
+        return None
+    return {
+        "date": meeting.date,
+        "participants": deserialize_participants(meeting.participants),
+        "summary": meeting.summary,
+        "transcript": get_transcript_text(db, meeting_id),
+    }
+
+def _insert_tasks(db: Session, tasks: List[dict]) -> list:
+    """タスクを1回のINSERT文（複数行のVALUES ... RETURNING）で登録する（コミットはしない）"""
+    if not tasks:
+        return []
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "meeting_id": task["meeting_id"],
+            "content": task["content"],
+            "assignee": task.get("assignee"),
+            "due_date": task.get("due_date"),
+            "status": task.get("status", "pending"),
+            "created_at": now,
+            "updated_at": now
+        }
+        for task in tasks
+    ]
+    # RETURNINGの行をID順（VALUESの順）に並べ直す（create_meetings_bulkと同じ）
+    db_tasks = sorted(
+        db.scalars(insert(models.Task).returning(models.Task).execution_options(render_nulls=True), rows).all(),
+        key=lambda task: task.id
+    )
+    # ORMのイベントを経由しないため、検索の索引・レスポンスキャッシュの更新対象にする
+    for meeting_id in {row["meeting_id"] for row in rows}:
+        search.mark_tasks_dirty(db, meeting_id)
+        cache.mark_changed(db, meeting_id)
+    return db_tasks
+
+# 抽出したタスク（ActionItemの並び）をまとめて登録し、ジョブを完了にする
+# 会議に同じ内容のタスクがすでにある場合は登録しない（再実行しても重複しない）
+def save_extracted_tasks(db: Session, job_id: int, meeting_id: int, items):
+    try:
+        db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
+        exists = db.execute(select(models.Meeting.id).where(models.Meeting.id == meeting_id)).first()
+        if exists is None:
+            db_job.status = "failed"
+            db_job.error = "会議が削除されたため抽出したタスクを保存できませんでした"
+        else:
+            seen = set(db.execute(
+                select(models.Task.content).where(models.Task.meeting_id == meeting_id)
+            ).scalars())
+            tasks = []
+            for item in items:
+                if item.content not in seen:
+                    seen.add(item.content)
+                    tasks.append({"meeting_id": meeting_id, **item._asdict()})
+            # コミットで属性が期限切れになる前にイベント用の辞書を作る
+            created = [task_to_dict(task) for task in _insert_tasks(db, tasks)]
+            db_job.status = "completed"
+            db_job.progress = 1.0
+        db.commit()
+        if exists is not None:
+            for task in created:
+                events.publish(meeting_id, "task.created", task)
+            events.publish(meeting_id, "tasks.extracted", {"job_id": job_id, "meeting_id": meeting_id, "created": len(created)})
+    except Exception as e:
+        db.rollback()
+        raise
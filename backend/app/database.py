@@ -1,16 +1,48 @@
 # app/database.py
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
 from .core.config import get_settings
+from .pool_metrics import PoolMetrics, attach_pool_listeners, instrumented_pool_class
 
 settings = get_settings()
 
+# プールの計測値（同期・非同期エンジンごと）
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+def engine_options(url: str, metrics: PoolMetrics, async_driver: bool = False) -> dict:
+    """設定からエンジンのプール・接続オプションを組み立てる"""
+    options = {
+        "echo": settings.DEBUG,  # 開発環境でのみSQLログを表示
+        "poolclass": instrumented_pool_class(metrics, async_driver=async_driver),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite"):
+        if not async_driver:
+            options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if async_driver:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
 # データベースエンジンの作成
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
-    echo=settings.DEBUG  # 開発環境でのみSQLログを表示
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, pool_metrics))
+attach_pool_listeners(engine, pool_metrics)
 
 # セッションの作成
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,4 +56,68 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 非同期ドライバ用のURLに変換（PostgreSQL→asyncpg、SQLite→aiosqlite）
+def to_async_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+# 非同期エンジンは DB_ASYNC=true のときだけ作成する（ドライバが未導入でも同期モードは動く）
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_url = to_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url, **engine_options(async_url, async_pool_metrics, async_driver=True)
+    )
+    attach_pool_listeners(async_engine.sync_engine, async_pool_metrics)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 非同期セッションを取得するための依存関係
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# エンドポイントが使うセッションの依存関係（設定で同期／非同期を切り替え）
+get_session = get_async_db if settings.DB_ASYNC else get_db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    crudの関数を db の種類に応じて実行する。
+
+    AsyncSessionの場合は run_sync でイベントループ上で実行し（I/Oは非同期ドライバ）、
+    スレッドプールを使わない。同期Sessionの場合は従来どおりスレッドプールで実行する。
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def run_db_and_close(db, fn, *args, **kwargs):
+    """
+    run_db と同じくcrudの関数を実行し、すぐにセッションを閉じて接続をプールに返す
+    （Server-Sent Eventsのように、クエリのあと長く続くレスポンスの間に接続を持ち続けないようにする）。
+
+    同期Sessionの場合は同じスレッドで閉じる。閉じる処理を別にスレッドプールで実行すると、
+    同時接続が多いときに接続の空きを待つスレッドでプールが埋まり、接続を返せなくなる。
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await db.close()
+
+    def call():
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
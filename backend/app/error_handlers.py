@@ -2,7 +2,7 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError as PydanticValidationError
-from .exceptions import BaseAppException
+from .exceptions import BaseAppException, ImportInterrupted
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,16 @@ async def app_exception_handler(request: Request, exc: BaseAppException):
         }
     )
 
+async def import_interrupted_handler(request: Request, exc: ImportInterrupted):
+    """途中で失敗したインポートは、メッセージとそれまでの集計（next_offsetなど）を返す"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "detail": exc.message,
+            **exc.result
+        }
+    )
+
 async def validation_exception_handler(request: Request, exc: PydanticValidationError):
     """Pydanticのバリデーションエラーをハンドリング"""
     errors = exc.errors()
@@ -0,0 +1,141 @@
+# app/events.py
+"""
+会議ごとの変更イベントの配信（GET /api/meetings/{id}/events のServer-Sent Events）
+
+crudの更新関数がコミット後に publish し、購読中のクライアントのキューに入れる。
+  - crudはスレッドプール・ジョブのスレッドで動くため、イベントループごとに1回の
+    call_soon_threadsafeでまとめて配る（購読者ごとにループを起こさない）
+  - イベントはSSEの形式にエンコードしたバイト列を全購読者で共有する
+  - 購読者のキューは EVENTS_QUEUE_SIZE 件まで。読むのが遅く溢れた場合は溜まったイベントを捨て、
+    resync イベント（GETで取得し直す合図）だけを残す。溢れたイベントが meeting.deleted の場合は
+    配信を終えられるよう、resync の後にそのイベントも入れる
+
+イベントはプロセス内で配信するため、uvicornを複数ワーカーで動かす場合は
+更新を処理したワーカーに接続している購読者にだけ届く。
+"""
+import asyncio
+import itertools
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .core.config import get_settings
+from .responses import dumps
+
+# 会議が削除されたら配信を終える
+MEETING_DELETED = "meeting.deleted"
+RESYNC = "resync"
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+def encode_event(event_id: int, event_type: str, data: Any) -> bytes:
+    """SSEの1イベント（dataは1行のJSON）"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), dumps(data))
+
+
+class Subscription:
+    """1つの接続の購読（キューはイベントループのスレッドでだけ操作する）"""
+
+    __slots__ = ("meeting_id", "loop", "queue")
+
+    def __init__(self, meeting_id: int, queue_size: int):
+        self.meeting_id = meeting_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Tuple[str, bytes]]" = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, event: Tuple[str, bytes]) -> bool:
+        """
+        キューに入れる。溢れた場合は溜まったイベントを捨てて resync だけにし、Falseを返す
+        （溢れたイベントが meeting.deleted なら resync の後に入れる）
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            terminal = event[0] == MEETING_DELETED
+            # キューに1件しか入らない場合は、配信を終えるイベントだけを入れる
+            if not terminal or self.queue.maxsize > 1:
+                self.queue.put_nowait((RESYNC, RESYNC_FRAME))
+            if terminal:
+                self.queue.put_nowait(event)
+            return False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Tuple[str, bytes]]:
+        """次のイベントの (種類, SSEのバイト列)（timeout秒の間に届かなければNone）"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """会議IDごとの購読者にイベントを配る"""
+
+    def __init__(self, queue_size: int):
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.resyncs = 0
+
+    def subscribe(self, meeting_id: int) -> Subscription:
+        """イベントループ上で呼び出す"""
+        subscription = Subscription(meeting_id, self._queue_size)
+        with self._lock:
+            self._subscribers[meeting_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.meeting_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.meeting_id]
+
+    def publish(self, meeting_id: int, event_type: str, data: Any):
+        """イベントを配る（どのスレッドから呼び出してもよい。購読者がいなければ何もしない）"""
+        with self._lock:
+            subscribers = self._subscribers.get(meeting_id)
+            if not subscribers:
+                return
+            subscribers = list(subscribers)
+            self.published += 1
+            event_id = next(self._ids)
+        event = (event_type, encode_event(event_id, event_type, data))
+        by_loop = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, targets in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, targets, event)
+            except RuntimeError:
+                # イベントループが終了している（シャットダウン中）
+                pass
+
+    def _deliver(self, subscriptions, event: Tuple[str, bytes]):
+        overflowed = sum(not subscription.deliver(event) for subscription in subscriptions)
+        if overflowed:
+            with self._lock:
+                self.resyncs += overflowed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "meetings": len(self._subscribers),
+                "published": self.published,
+                "resyncs": self.resyncs,
+            }
+
+
+event_broker = EventBroker(get_settings().EVENTS_QUEUE_SIZE)
+
+
+def publish(meeting_id: int, event_type: str, data: Any):
+    """crudの更新関数がコミット後に呼び出す"""
+    event_broker.publish(meeting_id, event_type, data)
@@ -35,6 +35,20 @@ class ResourceConflict(BaseAppException):
     def __init__(self, message: str):
         super().__init__(message=message, status_code=409)
 
+class PayloadTooLarge(BaseAppException):
+    """アップロードされたデータが上限を超えた場合の例外"""
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            message=f"ファイルサイズは{max_bytes // (1024 * 1024)}MB以下にしてください。",
+            status_code=413
+        )
+
+class ImportInterrupted(BaseAppException):
+    """インポートが途中で失敗した場合の例外（それまでにコミットした分の集計を持つ）"""
+    def __init__(self, message: str, status_code: int, result: dict):
+        super().__init__(message=message, status_code=status_code)
+        self.result = result
+
 # 認証・認可関連の例外
 class AuthenticationError(BaseAppException):
     """認証に失敗した場合の例外"""
@@ -0,0 +1,145 @@
+# app/export.py
+"""
+会議・タスクのエクスポート（GET /api/export/{meetings|tasks}.{ndjson|csv}）
+
+一覧のAPI（ページごとに辞書のリストを作り、response_modelで検証する）と違い、
+1回のSELECTの結果を yield_per でサーバーサイドカーソルから EXPORT_BATCH_SIZE 行ずつ読み、
+その行をエンコードしてすぐにレスポンスに書き出す。件数によらずメモリ使用量は一定。
+  - ORMのオブジェクトは作らず、列の値から直接エンコードする
+  - 依存関係のセッションはレスポンスの送信前に閉じられるため、ジェネレーターの中で
+    同じエンジンの別のセッションを開く（ジェネレーターが閉じられたときに閉じる）
+  - Accept-Encoding に gzip を含む場合は圧縮しながら返す
+
+議事録の本文は含めない（GET /api/meetings/{id}/transcript で取得する）。
+
+CSVはExcelで開かれることを想定し、
+  - 先頭にBOMを付ける（付けないと日本語版のExcelはShift_JISとして読み、文字化けする）
+  - = + - @ タブ CR で始まる値は先頭に ' を付ける（数式として実行されないように。CSVインジェクション対策）
+"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+from .responses import dumps
+from .utils import DATETIME_FORMAT, deserialize_participants, to_jst
+
+# エクスポートする列（この順で出力する）
+EXPORT_COLUMNS = {
+    "meetings": (
+        models.Meeting.__table__,
+        ("id", "title", "date", "start_time", "end_time", "participants",
+         "audio_file_path", "summary", "created_at", "updated_at"),
+    ),
+    "tasks": (
+        models.Task.__table__,
+        ("id", "meeting_id", "content", "assignee", "due_date", "status", "created_at", "updated_at"),
+    ),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Accept-Encodingでgzipが許可されているか（q=0は許可しない）"""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            params = params.strip()
+            if not params.startswith("q="):
+                return True
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _batches(bind, resource: str, batch_size: int) -> Iterator[Sequence]:
+    table, columns = EXPORT_COLUMNS[resource]
+    statement = select(*(table.c[name] for name in columns)).order_by(table.c.id)
+    with Session(bind=bind) as db:
+        # yield_perでサーバーサイドカーソル（PostgreSQLの名前付きカーソル）を使い、batch_size行ずつ受け取る
+        result = db.execute(statement, execution_options={"yield_per": batch_size})
+        yield from result.partitions()
+
+
+def _encode_ndjson(resource: str, rows: Sequence) -> bytes:
+    lines = []
+    for row in rows:
+        item = row._asdict()
+        if resource == "meetings":
+            item["participants"] = deserialize_participants(item["participants"])
+        lines.append(dumps(item))
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+# 表計算ソフトが数式として解釈する文字（この文字で始まる値は ' を付けて文字列にする）
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+CSV_BOM = "\ufeff"
+
+
+def _csv_text(value: str) -> str:
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return to_jst(value).strftime(DATETIME_FORMAT)
+    if isinstance(value, str):
+        return _csv_text(value)
+    return value
+
+
+# CSVでは参加者をセミコロン区切りの1列にする（参加者名にはセミコロンを使えない）
+PARTICIPANTS_INDEX = EXPORT_COLUMNS["meetings"][1].index("participants")
+
+
+def _encode_csv(resource: str, rows: Sequence) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        values = [_csv_value(value) for value in row]
+        if resource == "meetings":
+            values[PARTICIPANTS_INDEX] = _csv_text(";".join(deserialize_participants(row[PARTICIPANTS_INDEX])))
+        writer.writerow(values)
+    return buffer.getvalue().encode()
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_rows(bind, resource: str, fmt: str, batch_size: int, compress: bool = False) -> Iterator[bytes]:
+    """
+    会議（resource="meetings"）またはタスク（"tasks"）をIDの順に、
+    NDJSON（fmt="ndjson"）またはBOM・ヘッダー行付きのCSV（"csv"）のバイト列で少しずつ返す。
+    日時はAPIと同じくJSTの文字列にする。
+    """
+    def chunks():
+        if fmt == "csv":
+            yield (CSV_BOM + ",".join(EXPORT_COLUMNS[resource][1]) + "\n").encode()
+            encode = _encode_csv
+        else:
+            encode = _encode_ndjson
+        for rows in _batches(bind, resource, batch_size):
+            yield encode(resource, rows)
+
+    return _gzip(chunks()) if compress else chunks()
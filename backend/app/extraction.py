@@ -0,0 +1,238 @@
+# app/extraction.py
+"""
+議事録・要約からのアクションアイテム（タスク）の抽出ジョブ
+
+抽出方法は差し替えられる（TASK_EXTRACTOR）。
+  - rule：依頼・予定の表現を含む文を拾い、参加者名から担当者、日付の表現から期限を決める
+  - llm：要約と同じLLMのクライアントでJSONとして抽出させる
+
+抽出したタスクは1回のINSERT文でまとめて登録する（crud.save_extracted_tasks）。
+"""
+import asyncio
+import calendar
+import json
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List, NamedTuple, Optional, Protocol
+
+from . import crud
+from .core.config import get_settings
+from .database import SessionLocal
+from .jobs import BackgroundJobService
+from .summarization import LLMClient, Tokenizer, default_client_factory, default_tokenizer_factory, split_text
+from .utils import JST, to_jst, to_utc
+
+
+TASK_EXTRACTION_JOB = "task_extraction"
+
+# タスクの内容の最大文字数（schemas.TaskBaseと同じ）
+MAX_CONTENT_LENGTH = 1000
+
+
+class ActionItem(NamedTuple):
+    content: str
+    assignee: Optional[str] = None
+    due_date: Optional[datetime] = None  # UTC
+
+
+class Extractor(Protocol):
+    """アクションアイテムの抽出方法"""
+
+    async def extract(self, text: str, participants: List[str], reference: datetime) -> List[ActionItem]: ...
+
+
+def end_of_day(day: date) -> datetime:
+    """期限の日付を、その日の終わり（JST）のUTC日時にする"""
+    return to_utc(datetime.combine(day, time(23, 59), tzinfo=JST))
+
+
+# 行頭の時刻（[HH:MM:SS]）と箇条書きの記号
+LINE_PREFIX_PATTERN = re.compile(r"^\s*(?:\[\d{2}:\d{2}:\d{2}\]\s*)?(?:[-*・●■□◆]\s*|\d+[.)．）]\s*)?")
+SENTENCE_END_PATTERN = re.compile(r"(?<=[。！？!?])")
+# 依頼・予定・宿題を表す表現
+ACTION_PATTERN = re.compile(
+    r"お願いします|お願いいたします|してください|までに|やります|やっておきます|宿題|TODO|ToDo|"
+    r"(?:対応|確認|作成|準備|提出|送付|共有|連絡|調整|修正|検討|報告)(?:します|する|しておきます|しておく|予定)"
+)
+WEEKDAYS = "月火水木金土日"
+ABSOLUTE_DATE_PATTERN = re.compile(r"(?:(\d{4})[年/-])?(\d{1,2})[月/](\d{1,2})日?")
+WEEKDAY_PATTERN = re.compile(rf"(今週|来週|再来週)の?([{WEEKDAYS}])曜")
+DAYS_LATER_PATTERN = re.compile(r"(\d+)日後")
+RELATIVE_DAYS = (("明後日", 2), ("あさって", 2), ("明日", 1), ("今日", 0), ("本日", 0))
+
+
+def parse_due_date(sentence: str, reference: date) -> Optional[date]:
+    """文中の期限の表現を、会議の日付（reference）を基準に日付にする"""
+    match = ABSOLUTE_DATE_PATTERN.search(sentence)
+    if match:
+        year, month, day = match.groups()
+        try:
+            due = date(int(year) if year else reference.year, int(month), int(day))
+        except ValueError:
+            return None
+        # 年のない日付が会議より前なら翌年の日付とみなす
+        if not year and due < reference:
+            due = due.replace(year=due.year + 1)
+        return due
+    match = WEEKDAY_PATTERN.search(sentence)
+    if match:
+        week = ("今週", "来週", "再来週").index(match.group(1))
+        monday = reference - timedelta(days=reference.weekday())
+        return monday + timedelta(days=7 * week + WEEKDAYS.index(match.group(2)))
+    match = DAYS_LATER_PATTERN.search(sentence)
+    if match:
+        return reference + timedelta(days=int(match.group(1)))
+    for word, days in RELATIVE_DAYS:
+        if word in sentence:
+            return reference + timedelta(days=days)
+    if "月末" in sentence:
+        return reference.replace(day=calendar.monthrange(reference.year, reference.month)[1])
+    if "来週" in sentence:
+        return reference + timedelta(days=7)
+    return None
+
+
+def _sentences(text: str) -> List[str]:
+    sentences = []
+    for line in text.splitlines():
+        line = LINE_PREFIX_PATTERN.sub("", line)
+        sentences.extend(s.strip() for s in SENTENCE_END_PATTERN.split(line) if s.strip())
+    return sentences
+
+
+class RuleBasedExtractor:
+    """依頼・予定の表現を含む文をタスクにする"""
+
+    async def extract(self, text: str, participants: List[str], reference: datetime) -> List[ActionItem]:
+        reference_day = to_jst(reference).date()
+        # 「田中」と「田中太郎」のような参加者は長い名前を優先する
+        names = sorted(participants, key=len, reverse=True)
+        items = []
+        for sentence in _sentences(text):
+            if not ACTION_PATTERN.search(sentence):
+                continue
+            assignee = next((name for name in names if name in sentence), None)
+            due = parse_due_date(sentence, reference_day)
+            items.append(ActionItem(
+                content=sentence[:MAX_CONTENT_LENGTH],
+                assignee=assignee,
+                due_date=end_of_day(due) if due else None,
+            ))
+        return items
+
+
+EXTRACT_PROMPT = (
+    "あなたは会議の議事録からアクションアイテムを抽出するアシスタントです。"
+    "以下の議事録から、誰かが今後行うべき作業をすべて抽出し、"
+    '[{{"content": "作業の内容", "assignee": "担当者", "due_date": "YYYY-MM-DD"}}] の形式の'
+    "JSON配列だけを出力してください。担当者は参加者（{participants}）の名前から選び、"
+    "分からない場合はnullにしてください。期限は会議の日付（{date}）を基準に日付にし、"
+    "分からない場合はnullにしてください。該当するものがなければ [] を出力してください。"
+)
+
+
+def parse_llm_items(response: str, participants: List[str]) -> List[ActionItem]:
+    """LLMの応答のJSON配列をアクションアイテムにする（前後の説明文やコードブロックは無視する）"""
+    start, end = response.find("["), response.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("LLMの応答からタスクを読み取れませんでした")
+    try:
+        values = json.loads(response[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"LLMの応答からタスクを読み取れませんでした: {str(e)}")
+    items = []
+    for value in values:
+        if not isinstance(value, dict) or not str(value.get("content") or "").strip():
+            continue
+        assignee = value.get("assignee")
+        due = None
+        try:
+            due = end_of_day(date.fromisoformat(str(value.get("due_date"))[:10])) if value.get("due_date") else None
+        except ValueError:
+            pass
+        items.append(ActionItem(
+            content=str(value["content"]).strip()[:MAX_CONTENT_LENGTH],
+            assignee=assignee if assignee in participants else None,
+            due_date=due,
+        ))
+    return items
+
+
+class LLMExtractor:
+    """議事録をチャンクに分け、LLMにJSONとして抽出させる"""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], LLMClient] = default_client_factory,
+        tokenizer_factory: Callable[[str], Tokenizer] = default_tokenizer_factory,
+        chunk_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self._client_factory = client_factory
+        self._tokenizer_factory = tokenizer_factory
+        self._chunk_tokens = chunk_tokens or settings.SUMMARY_CHUNK_TOKENS
+        self._concurrency = concurrency or settings.SUMMARY_CONCURRENCY
+
+    async def extract(self, text: str, participants: List[str], reference: datetime) -> List[ActionItem]:
+        client = self._client_factory()
+        try:
+            system = EXTRACT_PROMPT.format(
+                participants="、".join(participants) or "不明",
+                date=to_jst(reference).date().isoformat(),
+            )
+            semaphore = asyncio.Semaphore(self._concurrency)
+
+            async def complete(chunk: str) -> str:
+                async with semaphore:
+                    return await client.complete(system, chunk)
+
+            chunks = split_text(text, self._tokenizer_factory(client.model), self._chunk_tokens)
+            responses = await asyncio.gather(*(complete(chunk) for chunk in chunks))
+        finally:
+            await client.aclose()
+        return [item for response in responses for item in parse_llm_items(response, participants)]
+
+
+def default_extractor_factory() -> Extractor:
+    extractor = get_settings().TASK_EXTRACTOR
+    if extractor == "rule":
+        return RuleBasedExtractor()
+    if extractor == "llm":
+        return LLMExtractor()
+    raise ValueError(f"TASK_EXTRACTORには rule または llm を指定してください: {extractor}")
+
+
+class ExtractionService(BackgroundJobService):
+    """タスク抽出ジョブをバックグラウンドで実行し、抽出したタスクをまとめて登録する"""
+
+    name = "task-extraction"
+
+    def __init__(
+        self,
+        extractor_factory: Callable[[], Extractor] = default_extractor_factory,
+        session_factory=SessionLocal,
+    ):
+        super().__init__(session_factory)
+        self._extractor_factory = extractor_factory
+
+    def execute(self, job_id: int, meeting_id: int):
+        with self._session_factory() as db:
+            source = crud.get_extraction_source(db, meeting_id)
+        if source is None:
+            raise ValueError("会議が見つかりません")
+        # 要約の方が要点がまとまっているので先に読む（同じ内容のタスクは1つにする）
+        text = "\n".join(filter(None, [source["summary"], source["transcript"]]))
+        if not text:
+            raise ValueError("議事録・要約がありません")
+        extractor = self._extractor_factory()
+        items = asyncio.run(extractor.extract(text, source["participants"], source["date"]))
+        with self._session_factory() as db:
+            crud.save_extracted_tasks(db, job_id=job_id, meeting_id=meeting_id, items=items)
+
+extraction_service = ExtractionService()
+
+
+# エンドポイントが使うタスク抽出サービスの依存関係
+def get_extraction_service() -> ExtractionService:
+    return extraction_service
@@ -0,0 +1,367 @@
+# app/importer.py
+"""
+NDJSONからの会議（とタスク）の一括インポート（POST /api/import/meetings と python -m app.importer）
+
+1行に1件の会議のJSON。項目は POST /api/meetings と同じで、tasks にタスク（POST .../tasks/ と同じ項目）の
+配列を指定できる。GET /api/export/meetings.ndjson の行もそのまま読める（id・created_at・updated_atは無視して
+新しく採番する）。
+
+  - IMPORT_CHUNK_SIZE 行ずつ検証する。規則は schemas.MeetingBase・TaskBase と同じ関数
+    （schemas.check_time など、正規表現はコンパイル済み）を使い、pydanticのモデルは作らない
+  - 検証に通った行を1つのトランザクションで登録する（crud.import_meetings）
+  - 失敗した行は行番号とメッセージを返し、他の行の登録は続ける
+  - チャンクをコミットするごとに処理済みの行数（next_offset）を更新する。中断した場合は
+    offset にその値を指定すると続きから再開できる（CLIはチェックポイントのファイルに記録する。
+    APIは途中で失敗した場合もエラーの本文で返す）
+
+他のシステムからの移行のため、過去の日付の会議・期限のタスクも登録できる
+（APIでの作成・更新では未来の日付だけ）。
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from . import crud
+from .core.config import get_settings
+from .database import SessionLocal, run_db
+from .exceptions import BaseAppException, ImportInterrupted, PayloadTooLarge, ValidationError
+from .schemas import (
+    check_assignee,
+    check_participants,
+    check_task_content,
+    check_task_status,
+    check_time,
+    check_time_range,
+)
+from .utils import UTC, parse_transcript, serialize_participants, to_utc
+
+# ISO 8601の日時（日付だけ・秒なしも可。タイムゾーンがなければJST）
+DATETIME_PATTERN = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+logger = logging.getLogger(__name__)
+
+Line = Tuple[int, bytes]  # (行番号, 行の内容)
+
+
+def parse_datetime(value) -> datetime:
+    """日時の文字列をUTCの日時にする（過去の日時も許可する）"""
+    match = DATETIME_PATTERN.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise ValidationError(f"無効な日付形式です: {value}")
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    tzinfo = None
+    if offset == "Z":
+        tzinfo = UTC
+    elif offset:
+        minutes = int(offset[1:3]) * 60 + int(offset[-2:])
+        tzinfo = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+    try:
+        dt = datetime(
+            int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+            int((fraction or "0").ljust(6, "0")), tzinfo=tzinfo
+        )
+    except ValueError as e:
+        raise ValidationError(f"無効な日付形式です: {str(e)}")
+    return to_utc(dt)
+
+
+def _field(item: dict, name: str, check: Callable = None, required: bool = False, kind: type = str, default=None):
+    """項目を取り出して検証する（メッセージの先頭に項目名を付ける）"""
+    value = item.get(name)
+    if value is None:
+        if required:
+            raise ValidationError(f"{name}: 必須の項目です")
+        return default
+    if not isinstance(value, kind):
+        raise ValidationError(f"{name}: {'文字列' if kind is str else '配列'}で指定してください")
+    if check is None:
+        return value
+    try:
+        return check(value)
+    except BaseAppException as e:
+        raise ValidationError(f"{name}: {e.message}")
+
+
+def _check_title(value: str) -> str:
+    if not 1 <= len(value) <= 100:
+        raise ValidationError("タイトルは1文字以上100文字以内で入力してください")
+    return value
+
+
+def _check_participant_names(value: list) -> list:
+    if not all(isinstance(name, str) for name in value):
+        raise ValidationError("参加者名は文字列で指定してください")
+    return check_participants(value)
+
+
+def _validate_task(item: dict) -> dict:
+    return {
+        "content": _field(item, "content", check_task_content, required=True),
+        "assignee": _field(item, "assignee", check_assignee),
+        "due_date": _field(item, "due_date", parse_datetime),
+        "status": _field(item, "status", check_task_status, default="pending"),
+    }
+
+
+def validate_meeting(item) -> dict:
+    """1行分の会議を検証し、crud.import_meetings に渡す行にする"""
+    if not isinstance(item, dict):
+        raise ValidationError("1行に1件の会議をJSONのオブジェクトで指定してください")
+    start_time = _field(item, "start_time", check_time, required=True)
+    end_time = _field(item, "end_time", check_time, required=True)
+    try:
+        check_time_range(start_time, end_time)
+    except BaseAppException as e:
+        raise ValidationError(f"end_time: {e.message}")
+    participants = _field(item, "participants", _check_participant_names, kind=list, default=[])
+    tasks = []
+    for index, task in enumerate(_field(item, "tasks", kind=list, default=[])):
+        if not isinstance(task, dict):
+            raise ValidationError(f"tasks.{index}: タスクはJSONのオブジェクトで指定してください")
+        try:
+            tasks.append(_validate_task(task))
+        except BaseAppException as e:
+            raise ValidationError(f"tasks.{index}.{e.message}")
+    return {
+        "meeting": {
+            "title": _field(item, "title", _check_title, required=True),
+            "date": _field(item, "date", parse_datetime, required=True),
+            "start_time": start_time,
+            "end_time": end_time,
+            "participants": serialize_participants(participants),
+            "audio_file_path": _field(item, "audio_file_path"),
+            "summary": _field(item, "summary"),
+        },
+        "participants": participants,
+        "segments": parse_transcript(_field(item, "transcript")),
+        "tasks": tasks,
+    }
+
+
+def validate_lines(lines: List[Line]) -> Tuple[List[dict], List[dict]]:
+    """チャンクの行を検証し、(登録する行, 失敗した行の行番号とメッセージ) を返す"""
+    rows = []
+    errors = []
+    for line_no, raw in lines:
+        try:
+            rows.append(validate_meeting(orjson.loads(raw)))
+        except orjson.JSONDecodeError:
+            errors.append({"line": line_no, "detail": "JSONの形式が不正です"})
+        except BaseAppException as e:
+            errors.append({"line": line_no, "detail": e.message})
+    return rows, errors
+
+
+class LineChunker:
+    """行に番号を付けてチャンクにまとめる（offset行目までと空行は読み飛ばす）"""
+
+    def __init__(self, offset: int, chunk_size: int):
+        self.line_no = 0
+        self._offset = offset
+        self._chunk_size = chunk_size
+        self._chunk: List[Line] = []
+
+    def add(self, line: bytes) -> Optional[List[Line]]:
+        """行を追加し、チャンクがいっぱいになったら返す"""
+        self.line_no += 1
+        if self.line_no > self._offset and line.strip():
+            self._chunk.append((self.line_no, line))
+        if len(self._chunk) >= self._chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> List[Line]:
+        chunk, self._chunk = self._chunk, []
+        return chunk
+
+
+class ImportProgress:
+    """インポートの集計（失敗した行は max_errors 件まで保持する。Noneの場合は上限なし）"""
+
+    def __init__(self, offset: int, max_errors: Optional[int] = None):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.next_offset = offset
+        self._max_errors = max_errors
+
+    def add(self, next_offset: int, imported: int, errors: List[dict]):
+        self.imported += imported
+        self.failed += len(errors)
+        room = len(errors) if self._max_errors is None else max(self._max_errors - len(self.errors), 0)
+        self.errors.extend(errors[:room])
+        self.next_offset = max(self.next_offset, next_offset)
+
+    def result(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "next_offset": self.next_offset,
+        }
+
+
+def import_lines(
+    db,
+    lines: Iterable[bytes],
+    offset: int = 0,
+    chunk_size: int = 1000,
+    max_errors: Optional[int] = None,
+    on_chunk: Callable[[ImportProgress, List[dict]], None] = None,
+) -> dict:
+    """行（ファイルなど）から会議をインポートする。on_chunkはチャンクをコミットするごとに呼ばれる"""
+    chunker = LineChunker(offset, chunk_size)
+    progress = ImportProgress(offset, max_errors)
+
+    def run(chunk: List[Line]):
+        rows, errors = validate_lines(chunk)
+        imported = len(crud.import_meetings(db, rows)) if rows else 0
+        progress.add(chunker.line_no, imported, errors)
+        if on_chunk is not None:
+            on_chunk(progress, errors)
+
+    for line in lines:
+        chunk = chunker.add(line)
+        if chunk:
+            run(chunk)
+    run(chunker.flush())
+    return progress.result()
+
+
+async def iter_lines(stream: AsyncIterator[bytes], max_line_bytes: int, skip: int = 0) -> AsyncIterator[bytes]:
+    """
+    バイト列のストリームを行に分ける（1行が max_line_bytes を超えたら PayloadTooLarge）。
+    先頭の skip 行は長さを確かめずに空の行として返す（再開するときに長すぎる行を読み飛ばせるように）。
+    """
+    buffer = bytearray()
+    line_no = 0
+    async for data in stream:
+        buffer += data
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line_no += 1
+            if line_no <= skip:
+                yield b""
+            elif end - start > max_line_bytes:
+                raise PayloadTooLarge(max_line_bytes)
+            else:
+                yield bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if line_no < skip:
+            # 読み飛ばす行は行の終わりまで保持しない
+            buffer.clear()
+        elif len(buffer) > max_line_bytes:
+            # 改行が来ないまま上限を超えた場合は、行の終わりを待たずに打ち切る
+            raise PayloadTooLarge(max_line_bytes)
+    if buffer:
+        yield bytes(buffer)
+
+
+async def import_stream(
+    db, stream: AsyncIterator[bytes], offset: int, chunk_size: int, max_errors: int, max_line_bytes: int
+) -> dict:
+    """
+    リクエストボディのNDJSONから会議をインポートする（検証はスレッドプール、登録は run_db で行う）。
+    途中で失敗した場合は、それまでにコミットした分の集計を持つ ImportInterrupted を送出する。
+    """
+    chunker = LineChunker(offset, chunk_size)
+    progress = ImportProgress(offset, max_errors)
+
+    async def run(chunk: List[Line]):
+        rows, errors = await run_in_threadpool(validate_lines, chunk)
+        imported = len(await run_db(db, crud.import_meetings, rows)) if rows else 0
+        progress.add(chunker.line_no, imported, errors)
+
+    try:
+        async for line in iter_lines(stream, max_line_bytes, skip=offset):
+            chunk = chunker.add(line)
+            if chunk:
+                await run(chunk)
+        await run(chunker.flush())
+    except PayloadTooLarge as e:
+        # 長すぎる行は読み終えていないので、行番号は読み終えた行の次
+        raise ImportInterrupted(f"{chunker.line_no + 1}行目: {e.message}", e.status_code, progress.result())
+    except SQLAlchemyError as e:
+        logger.error(f"Import interrupted by database error: {str(e)}")
+        raise ImportInterrupted("データベース処理中にエラーが発生しました", 500, progress.result())
+    return progress.result()
+
+
+def read_checkpoint(path: str) -> int:
+    """チェックポイントのファイルから処理済みの行数を読む（ファイルがなければ0）"""
+    try:
+        with open(path) as f:
+            return json.load(f)["next_offset"]
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path: str, next_offset: int):
+    # 書きかけのファイルを残さないよう、一時ファイルに書いてから置き換える
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"next_offset": next_offset}, f)
+    os.replace(temp_path, path)
+
+
+def run_import(db, path: str, checkpoint: str, offset: Optional[int] = None, chunk_size: int = 1000,
+               errors_out=sys.stderr) -> dict:
+    """
+    ファイルから会議をインポートする（CLIの本体）。
+    offsetを省略した場合はチェックポイントの行数から再開し、チャンクをコミットするごとに更新する。
+    失敗した行は errors_out に1行に1件のJSONで書き出す。
+    """
+    if offset is None:
+        offset = read_checkpoint(checkpoint)
+
+    def on_chunk(progress: ImportProgress, errors: List[dict]):
+        for error in errors:
+            errors_out.write(json.dumps(error, ensure_ascii=False) + "\n")
+        write_checkpoint(checkpoint, progress.next_offset)
+
+    with open(path, "rb") as f:
+        # 失敗した行はすべて書き出すので、結果には含めない
+        result = import_lines(db, f, offset, chunk_size, max_errors=0, on_chunk=on_chunk)
+    del result["errors"]
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.importer", description="NDJSONの会議（とタスク）をデータベースに一括インポートします"
+    )
+    parser.add_argument("path", help="NDJSONのファイル")
+    parser.add_argument(
+        "--checkpoint", help="処理済みの行数を記録するファイル（既定：<path>.checkpoint）"
+    )
+    parser.add_argument(
+        "--offset", type=int, help="この行数までを読み飛ばす（省略するとチェックポイントから再開する）"
+    )
+    parser.add_argument("--chunk-size", type=int, default=get_settings().IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        result = run_import(
+            db, args.path, args.checkpoint or args.path + ".checkpoint", args.offset, args.chunk_size
+        )
+    print(json.dumps(result, ensure_ascii=False))
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# app/jobs.py
+"""
+バックグラウンドジョブの実行（文字起こし・要約・タスク抽出で共通）
+
+ジョブはエンドポイントで queued として登録され、専用のスレッドで
+running → completed / failed と進む。completed にするのは各サービスの
+結果の保存（crud.save_*）で、それ以外の状態の更新はここで行う。
+結果の保存を含めてどこで失敗してもジョブを failed にする
+（実行中のまま残ると、同じ会議の同じ種類のジョブを登録できなくなる）。
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from . import crud
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJobService(ABC):
+    """ジョブをスレッドで実行し、状態をjobsテーブルに書き込むサービスの基底クラス"""
+
+    # スレッド名とログに使うジョブの名前
+    name = "job"
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        # ジョブの進行管理（結果待ちとDB更新）を行うスレッド
+        self._coordinator: Optional[ThreadPoolExecutor] = None
+
+    def start(self, job_id: int, *args) -> Future:
+        """ジョブの実行を開始する（すぐに返る）"""
+        with self._lock:
+            if self._coordinator is None:
+                self._coordinator = ThreadPoolExecutor(thread_name_prefix=self.name)
+            return self._coordinator.submit(self._run, job_id, *args)
+
+    @abstractmethod
+    def execute(self, job_id: int, *args):
+        """ジョブを実行して結果を保存する（サブクラスで実装する）"""
+
+    def _run(self, job_id: int, *args):
+        try:
+            self._update_job(job_id, status="running")
+            self.execute(job_id, *args)
+        except Exception as e:
+            logger.error(f"Job {self.name} failed (job={job_id}): {str(e)}")
+            try:
+                self._update_job(job_id, status="failed", error=str(e))
+            except Exception:
+                logger.exception(f"Failed to mark {self.name} job as failed (job={job_id})")
+
+    def _update_job(self, job_id: int, **fields):
+        with self._session_factory() as db:
+            crud.update_job(db, job_id, **fields)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            coordinator, self._coordinator = self._coordinator, None
+        if coordinator is not None:
+            coordinator.shutdown(wait=wait)
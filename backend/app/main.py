@@ -1,16 +1,48 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Body, FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError as PydanticValidationError
-from . import crud, models, schemas
-from .database import engine, get_db
+from . import crud, models, schemas, search
+from .cache import meeting_key, response_cache, tasks_key
+from .conditional import Version, cached_conditional_response
+from .core.config import get_settings
+from .database import engine, get_db, get_session, run_db, run_db_and_close, pool_metrics
+from . import database
+from .events import KEEPALIVE_FRAME, MEETING_DELETED, event_broker
+from .export import MEDIA_TYPES, accepts_gzip, export_rows
+from .importer import import_stream
 from .error_handlers import (
     app_exception_handler,
+    import_interrupted_handler,
     validation_exception_handler,
     sqlalchemy_exception_handler,
     general_exception_handler
 )
-from .exceptions import BaseAppException, ResourceNotFound
+from .extraction import (
+    TASK_EXTRACTION_JOB,
+    ExtractionService,
+    extraction_service,
+    get_extraction_service
+)
+from .exceptions import BaseAppException, ImportInterrupted, PayloadTooLarge, ResourceNotFound, ValidationError
+from .responses import JSTJSONResponse
+from .storage import save_stream
+from .summarization import (
+    SUMMARIZATION_JOB,
+    SummarizationService,
+    get_summarization_service,
+    summarization_service
+)
+from .transcription import (
+    TRANSCRIPTION_JOB,
+    TranscriptionService,
+    get_transcription_service,
+    transcription_service
+)
 from pydantic import BaseModel, Field
 from .schemas import MeetingCreate, Meeting
 from .crud import create_meeting
@@ -21,13 +53,42 @@ from fastapi.middleware.cors import CORSMiddleware
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# データベースのテーブルを作成
-models.Base.metadata.create_all(bind=engine)
+settings = get_settings()
+
+
+def fail_unfinished_jobs():
+    try:
+        with database.SessionLocal() as db:
+            count = crud.fail_unfinished_jobs(db, error="サーバーの再起動により中断されました")
+    except SQLAlchemyError as e:
+        # スキーマの作成前（マイグレーション前）でも起動できるようにする
+        logger.warning(f"Could not update unfinished jobs: {str(e)}")
+        return
+    if count:
+        logger.info(f"Marked {count} unfinished jobs as failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # スキーマはAlembicのマイグレーションで作成する（alembic upgrade head）。
+    # 開発用に DB_CREATE_SCHEMA_ON_STARTUP=true のときだけ起動時にテーブルを作成する
+    if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+        await run_in_threadpool(models.Base.metadata.create_all, bind=engine)
+    # 前回のプロセスで実行待ち・実行中だったジョブは再開されないため、失敗にする
+    await run_in_threadpool(fail_unfinished_jobs)
+    yield
+    # 文字起こしのワーカープロセスと要約・タスク抽出のスレッドを停止する
+    await run_in_threadpool(transcription_service.shutdown)
+    await run_in_threadpool(summarization_service.shutdown)
+    await run_in_threadpool(extraction_service.shutdown)
+
 
 app = FastAPI(
     title="会議議事録自動生成アプリ",
     description="会議の記録と議事録を自動で生成するためのAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=JSTJSONResponse
 )
 
 # アプリケーションインスタンスの作成後に追加
@@ -37,10 +98,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # すべてのHTTPメソッドを許可
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Content-SHA256", "ETag"],  # カーソルページング・アップロードのハッシュ・条件付きリクエスト
 )
 
 # グローバルな例外ハンドラーの登録
 app.add_exception_handler(BaseAppException, app_exception_handler)
+app.add_exception_handler(ImportInterrupted, import_interrupted_handler)
 app.add_exception_handler(PydanticValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
@@ -48,9 +111,9 @@ app.add_exception_handler(Exception, general_exception_handler)
 
 # 新しい会議を作るエンドポイント
 @app.post("/api/meetings", response_model=schemas.Meeting)
-def create_meeting_endpoint(
+async def create_meeting_endpoint(
     meeting: schemas.MeetingCreate, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     新しい会議を作成します。
@@ -63,7 +126,7 @@ def create_meeting_endpoint(
     """
 
     try:
-        return crud.create_meeting(db=db, meeting=meeting)
+        return JSTJSONResponse(await run_db(db, crud.create_meeting, meeting=meeting))
     except BaseAppException as e:
         raise e
     except Exception as e:
@@ -72,38 +135,197 @@ def create_meeting_endpoint(
             status_code=500
         )
 
+def check_bulk_size(items: list):
+    if not items:
+        raise ValidationError("1件以上指定してください")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise ValidationError(f"一度に処理できるのは{settings.BULK_MAX_ITEMS}件までです")
+
+# 会議の一括作成
+@app.post("/api/meetings/bulk", response_model=schemas.MeetingBulkResult)
+async def create_meetings_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="作成する会議（POST /api/meetings と同じ項目）の配列"),
+    db: Session = Depends(get_session)
+):
+    """
+    複数の会議をまとめて作成します（BULK_MAX_ITEMS件まで）。
+    
+    各会議は POST /api/meetings と同じ規則で検証し、検証に通った会議を1つのトランザクションで登録します。
+    検証に失敗した会議は登録せず、errorsに配列での位置（index）とメッセージを返します。
+    
+    返却値：作成された会議のリスト（created）とエラーのリスト（errors）
+    """
+    check_bulk_size(items)
+    return JSTJSONResponse(await run_db(db, crud.create_meetings_bulk, items))
+
+# fields（カンマ区切りの項目名）を項目名の集合に変換する依存関係（スレッドプールを使わないようasync）
+async def meeting_fields(
+    fields: Optional[str] = Query(
+        None, description="返す項目をカンマ区切りで指定します（例：id,title,date,start_time,end_time）"
+    )
+) -> Optional[FrozenSet[str]]:
+    if fields is None:
+        return None
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = sorted(names - crud.MEETING_FIELDS.keys())
+    if not names or unknown:
+        raise ValidationError(
+            f"fieldsに指定できない項目があります: {', '.join(unknown)}"
+            f"（指定できる項目: {', '.join(crud.MEETING_FIELDS)}）"
+        )
+    return names
+
 # すべての会議を取得するエンドポイント
-@app.get("/api/meetings/", response_model=list[schemas.Meeting])
-def read_meetings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@app.get("/api/meetings/", response_model=list[Union[schemas.Meeting, schemas.MeetingPartial]])
+async def read_meetings(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_transcript: bool = False,
+    fields: Optional[FrozenSet[str]] = Depends(meeting_fields),
+    db: Session = Depends(get_session)
+):
     """
     登録されているすべての会議の一覧を取得します。
     
     - **skip**: スキップする会議の数（ページネーション用、デフォルト：0）
     - **limit**: 取得する会議の最大数（ページネーション用、デフォルト：100）
+    - **cursor**: 指定するとカーソル方式（日付・ID順）でページングします。
+      最初のページは空文字（`?cursor=`）、以降はレスポンスヘッダー
+      `X-Next-Cursor` の値を指定します。最終ページではヘッダーが付きません。
+    - **include_transcript**: trueの場合は議事録の本文（transcript）も含めます（デフォルト：含めない）
+    - **fields**: 返す項目をカンマ区切りで指定します（例：`id,title,date,start_time,end_time`）。
+      指定した項目の列だけをデータベースから読み込み、レスポンスにもその項目だけを含めます。
+      include_transcriptより優先されます
     
     返却値：会議のリスト
     """
-    meetings = crud.get_meetings(db, skip=skip, limit=limit)
-    return meetings
+    if cursor is not None:
+        meetings, next_cursor = await run_db(
+            db, crud.get_meetings_after,
+            cursor=cursor, limit=limit, include_transcript=include_transcript, fields=fields
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return JSTJSONResponse(meetings, headers=headers)
+
+    meetings = await run_db(
+        db, crud.get_meetings, skip=skip, limit=limit, include_transcript=include_transcript, fields=fields
+    )
+    return JSTJSONResponse(meetings)
+
+# 会議の版（ETag・Last-Modified。会議がない場合はNone）
+async def get_meeting_version(db, meeting_id: int) -> Optional[Version]:
+    row = await run_db(db, crud.get_meeting_version, meeting_id)
+    return Version.of(meeting_id, *row) if row else None
 
 # 特定のIDの会議を取得するエンドポイント
-@app.get("/api/meetings/{meeting_id}", response_model=schemas.Meeting)
-def read_meeting(meeting_id: int, db: Session = Depends(get_db)):
+@app.get("/api/meetings/{meeting_id}", response_model=Union[schemas.Meeting, schemas.MeetingPartial])
+async def read_meeting(
+    meeting_id: int,
+    request: Request,
+    fields: Optional[FrozenSet[str]] = Depends(meeting_fields),
+    db: Session = Depends(get_session)
+):
     """
     指定されたIDの会議の詳細情報を取得します。
     
     - **meeting_id**: 取得したい会議のID
+    - **fields**: 返す項目をカンマ区切りで指定します（例：`id,title,transcript`）
+    
+    fieldsを指定しない場合はETag・Last-Modifiedを返します。If-None-Match（またはIf-Modified-Since）を
+    指定し、会議とタスクに変更がなければ本文なしの304を返します。
     
     返却値：指定されたIDの会議の詳細情報
     """
-    meeting = crud.get_meeting_by_id(db, meeting_id=meeting_id)
-    if meeting is None:
+    if fields is not None:
+        meeting = await run_db(db, crud.get_meeting_detail, meeting_id=meeting_id, fields=fields)
+        if meeting is None:
+            raise ResourceNotFound("会議")
+        return JSTJSONResponse(meeting)
+
+    # 項目を指定しない場合はレスポンスキャッシュから返す（キャッシュにあればデータベースに接続しない）。
+    # 変更がなければ、会議の行を読まずに更新日時だけで304を返す
+    async def load():
+        meeting = await run_db(db, crud.get_meeting_detail, meeting_id=meeting_id)
+        return (meeting, Version.of_meeting(meeting)) if meeting else None
+
+    response = await cached_conditional_response(
+        request, meeting_key(meeting_id), lambda: get_meeting_version(db, meeting_id), load
+    )
+    if response is None:
+        raise ResourceNotFound("会議")
+    return response
+
+# 会議の議事録（セグメント）を取得するエンドポイント
+@app.get("/api/meetings/{meeting_id}/transcript", response_model=schemas.Transcript)
+async def read_meeting_transcript(
+    meeting_id: int,
+    start: Optional[float] = Query(None, alias="from", ge=0),
+    end: Optional[float] = Query(None, alias="to", ge=0),
+    db: Session = Depends(get_session)
+):
+    """
+    指定されたIDの会議の議事録をセグメント単位で取得します。
+    
+    - **meeting_id**: 取得したい会議のID
+    - **from**: 録音の先頭からの秒数。この時刻以降（この時刻を含むセグメントから）を返します
+    - **to**: 録音の先頭からの秒数。この時刻より前に始まるセグメントまでを返します
+    
+    返却値：時刻順のセグメント（start・endは秒。時刻のない議事録はnull）
+    """
+    if start is not None and end is not None and end <= start:
+        raise ValidationError("toはfromより後の時刻を指定してください")
+    segments = await run_db(db, crud.get_transcript_segments, meeting_id, start=start, end=end)
+    if segments is None:
+        raise ResourceNotFound("会議")
+    return JSTJSONResponse({"meeting_id": meeting_id, "segments": segments})
+
+# 会議の変更イベントを配信するエンドポイント（Server-Sent Events）
+@app.get("/api/meetings/{meeting_id}/events")
+async def stream_meeting_events(meeting_id: int, db: Session = Depends(get_session)):
+    """
+    指定されたIDの会議の変更をServer-Sent Events（text/event-stream）で配信します。
+    
+    - **meeting_id**: 購読したい会議のID
+    
+    イベントの種類（eventフィールド）：meeting.updated / meeting.deleted / task.created / task.updated /
+    task.deleted / tasks.extracted / transcript.completed / summary.completed / job.failed。
+    dataは変更の内容を表すJSONです。読み込みが遅れて配信できなかった場合は resync を送るので、
+    GETで取得し直してください。接続後に GET /api/meetings/{id} で現在の状態を取得し、
+    以降はイベントで差分を反映します。会議が削除されると meeting.deleted を送って終了します。
+    """
+    # 配信の間はデータベースの接続を持たない
+    if await run_db_and_close(db, crud.get_meeting_version, meeting_id) is None:
         raise ResourceNotFound("会議")
-    return meeting
+    keepalive = settings.EVENTS_KEEPALIVE_SECONDS
+
+    async def stream():
+        # 購読は配信の開始時に行う（接続が切れた場合はfinallyで必ず解除される）
+        subscription = event_broker.subscribe(meeting_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                event = await subscription.get(timeout=keepalive)
+                if event is None:
+                    # プロキシに切断されないよう、イベントがない間もコメント行を送る
+                    yield KEEPALIVE_FRAME
+                    continue
+                event_type, frame = event
+                yield frame
+                if event_type == MEETING_DELETED:
+                    break
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # 会議を更新するエンドポイント
 @app.put("/api/meetings/{meeting_id}", response_model=schemas.Meeting)
-def update_meeting(meeting_id: int, meeting: schemas.MeetingCreate, db: Session = Depends(get_db)):
+async def update_meeting(meeting_id: int, meeting: schemas.MeetingCreate, db: Session = Depends(get_session)):
     """
     指定されたIDの会議の情報を更新します。
     
@@ -113,17 +335,34 @@ def update_meeting(meeting_id: int, meeting: schemas.MeetingCreate, db: Session
     - **start_time**: 新しい開始時刻（例：10:00）
     - **end_time**: 新しい終了時刻（例：11:00）
     - **participants**: 新しい参加者のリスト
+    - **transcript**: 新しい議事録（省略した場合は現在の議事録を残します）
     
     返却値：更新された会議の情報
     """
-    updated_meeting = crud.update_meeting(db, meeting_id=meeting_id, meeting=meeting)
+    updated_meeting = await run_db(db, crud.update_meeting, meeting_id=meeting_id, meeting=meeting)
     if updated_meeting is None:
         raise ResourceNotFound("会議")
-    return updated_meeting
+    return JSTJSONResponse(updated_meeting)
+
+# 会議を部分更新するエンドポイント
+@app.patch("/api/meetings/{meeting_id}", response_model=schemas.MeetingPartial)
+async def patch_meeting(meeting_id: int, meeting: schemas.MeetingUpdate, db: Session = Depends(get_session)):
+    """
+    指定されたIDの会議の、送信された項目だけを更新します（例：`{"end_time": "12:00"}`）。
+    
+    - **meeting_id**: 更新したい会議のID
+    - 項目は PUT /api/meetings/{meeting_id} と同じです。送信しなかった項目は変更しません
+    
+    返却値：更新された会議の情報（tasksは含みません。transcriptは送信した場合だけ含みます）
+    """
+    patched_meeting = await run_db(db, crud.patch_meeting, meeting_id=meeting_id, meeting=meeting)
+    if patched_meeting is None:
+        raise ResourceNotFound("会議")
+    return JSTJSONResponse(patched_meeting)
 
 # 会議を削除するエンドポイント
 @app.delete("/api/meetings/{meeting_id}", response_model=schemas.Meeting)
-def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
+async def delete_meeting(meeting_id: int, db: Session = Depends(get_session)):
     """
     指定されたIDの会議を削除します。
     
@@ -131,16 +370,89 @@ def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
     
     返却値：削除された会議の情報
     """
-    deleted_meeting = crud.delete_meeting(db, meeting_id=meeting_id)
+    deleted_meeting = await run_db(db, crud.delete_meeting, meeting_id=meeting_id)
     if deleted_meeting is None:
         raise ResourceNotFound("会議")
-    return deleted_meeting
+    return JSTJSONResponse(deleted_meeting)
+
+
+# 会議の音声ファイルのアップロード
+@app.post("/api/meetings/{meeting_id}/audio", response_model=schemas.Meeting)
+async def upload_meeting_audio(meeting_id: int, request: Request, db: Session = Depends(get_session)):
+    """
+    会議の音声ファイルをアップロードします。
+    リクエストボディにファイルの内容をそのまま送信してください（multipartではありません）。
+    
+    - **meeting_id**: 音声ファイルを設定する会議のID
+    
+    同じ内容のファイルは一度だけ保存され、audio_file_pathは同じパスになります。
+    返却値：audio_file_pathを設定した会議の情報（X-Content-SHA256ヘッダーにハッシュ）
+    """
+    # 本文の受信（大きなファイルでは長くかかる）の間はデータベースの接続を持たない
+    if await run_db_and_close(db, crud.get_meeting_by_id, meeting_id) is None:
+        raise ResourceNotFound("会議")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.AUDIO_MAX_UPLOAD_BYTES:
+        raise PayloadTooLarge(settings.AUDIO_MAX_UPLOAD_BYTES)
+
+    stored = await save_stream(request.stream(), settings.AUDIO_STORAGE_DIR, settings.AUDIO_MAX_UPLOAD_BYTES)
+    # 閉じたセッションは新しいトランザクション（接続）で使い直せる
+    updated_meeting = await run_db(db, crud.set_audio_file_path, meeting_id, stored.path)
+    if updated_meeting is None:
+        raise ResourceNotFound("会議")
+    return JSTJSONResponse(updated_meeting, headers={"X-Content-SHA256": stored.sha256})
+
 
+# 参加者が出席した会議一覧
+@app.get("/api/participants/{name}/meetings", response_model=list[schemas.Meeting])
+async def read_participant_meetings(
+    name: str,
+    skip: int = 0,
+    limit: int = 100,
+    include_transcript: bool = False,
+    db: Session = Depends(get_session)
+):
+    """
+    指定された参加者が出席した会議の一覧を日付順に取得します。
+    
+    - **name**: 参加者名
+    - **skip**: スキップする会議の数（ページネーション用、デフォルト：0）
+    - **limit**: 取得する会議の最大数（ページネーション用、デフォルト：100）
+    - **include_transcript**: trueの場合は議事録の本文（transcript）も含めます（デフォルト：含めない）
+    
+    返却値：会議のリスト
+    """
+    meetings = await run_db(
+        db, crud.get_meetings_by_participant,
+        name=name, skip=skip, limit=limit, include_transcript=include_transcript
+    )
+    return JSTJSONResponse(meetings)
 
+# 全文検索
+@app.get("/api/search", response_model=list[schemas.SearchResult])
+async def search_meetings(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_session)
+):
+    """
+    会議のタイトル・議事録・要約・タスクの内容を全文検索します。
+    
+    - **q**: 検索語（空白で区切るとすべての語を含む会議を検索します。日本語は2文字以上を推奨）
+    - **skip**: スキップする件数（ページネーション用、デフォルト：0）
+    - **limit**: 取得する最大件数（ページネーション用、デフォルト：20）
+    
+    返却値：関連度（score）の高い順の会議のリスト
+    """
+    results = await run_db(db, search.search_meetings, q=q, skip=skip, limit=limit)
+    if results is None:
+        raise ValidationError("検索語には文字または数字を含めてください")
+    return JSTJSONResponse(results)
 
 # タスク作成
 @app.post("/api/meetings/{meeting_id}/tasks/", response_model=schemas.Task)
-def create_meeting_task(meeting_id: int, task: schemas.TaskCreate, db: Session = Depends(get_db)):
+async def create_meeting_task(meeting_id: int, task: schemas.TaskCreate, db: Session = Depends(get_session)):
     """
     指定された会議に新しいタスクを作成します。
     
@@ -153,7 +465,7 @@ def create_meeting_task(meeting_id: int, task: schemas.TaskCreate, db: Session =
     返却値：作成されたタスクの情報
     """
     # 会議の存在確認
-    meeting = crud.get_meeting_by_id(db, meeting_id)
+    meeting = await run_db(db, crud.get_meeting_by_id, meeting_id)
     if meeting is None:
         raise ResourceNotFound("会議")
     
@@ -161,24 +473,63 @@ def create_meeting_task(meeting_id: int, task: schemas.TaskCreate, db: Session =
     task_data = task.model_dump()
     task_data["meeting_id"] = meeting_id
     
-    return crud.create_task(db=db, task_data=task_data)
+    task = await run_db(db, crud.create_task, task_data=task_data)
+    return JSTJSONResponse(crud.task_to_dict(task))
 
 # 会議のタスク一覧取得
 @app.get("/api/meetings/{meeting_id}/tasks/", response_model=list[schemas.Task])
-def read_meeting_tasks(meeting_id: int, db: Session = Depends(get_db)):
+async def read_meeting_tasks(meeting_id: int, request: Request, db: Session = Depends(get_session)):
     """
     指定された会議のタスク一覧を取得します。
     
     - **meeting_id**: タスク一覧を取得したい会議のID
     
+    会議の詳細と同じETag・Last-Modifiedを返し、変更がなければ304を返します。
+    会議が存在しない場合は404を返します。
+    
     返却値：指定された会議のタスク一覧
     """
-    tasks = crud.get_tasks_by_meeting(db, meeting_id)
-    return tasks
+    async def load():
+        # 版を先に読む（間に更新があっても、古い版で新しい内容を返すだけになる）
+        version = await get_meeting_version(db, meeting_id)
+        if version is None:
+            # 存在しない会議の空の一覧はキャッシュしない（任意のIDでキャッシュを埋められないように）
+            return None
+        tasks = await run_db(db, crud.get_tasks_by_meeting, meeting_id)
+        return [crud.task_to_dict(task) for task in tasks], version
+
+    # レスポンスキャッシュにあればデータベースに接続しない
+    response = await cached_conditional_response(
+        request, tasks_key(meeting_id), lambda: get_meeting_version(db, meeting_id), load
+    )
+    if response is None:
+        raise ResourceNotFound("会議")
+    return response
+
+# タスクの一括作成・更新・削除（/api/tasks/{task_id} より先に登録する）
+@app.patch("/api/tasks/bulk", response_model=schemas.TaskBulkResult)
+async def apply_tasks_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="タスクの操作の配列"),
+    db: Session = Depends(get_session)
+):
+    """
+    複数のタスクをまとめて作成・更新・削除します（BULK_MAX_ITEMS件まで）。
+    
+    - **op: "create"**: meeting_idと、POST /api/meetings/{meeting_id}/tasks/ と同じ項目で作成します
+    - **op: "update"**（省略時）: idと、変更する項目だけを指定します（例：`{"id": 1, "status": "completed"}`）
+    - **op: "delete"**: idのタスクを削除します
+    
+    検証に通った操作を1つのトランザクションで実行します。検証に失敗した操作・存在しないタスクや会議を
+    指定した操作は実行せず、errorsに配列での位置（index）とメッセージを返します。
+    
+    返却値：作成（created）・更新（updated）されたタスク、削除したタスクのID（deleted）、エラーのリスト（errors）
+    """
+    check_bulk_size(items)
+    return JSTJSONResponse(await run_db(db, crud.apply_tasks_bulk, items))
 
 # タスク更新
 @app.put("/api/tasks/{task_id}", response_model=schemas.Task)
-def update_task(task_id: int, task: schemas.TaskCreate, db: Session = Depends(get_db)):
+async def update_task(task_id: int, task: schemas.TaskCreate, db: Session = Depends(get_session)):
     """
     指定されたIDのタスクを更新します。
     
@@ -190,14 +541,30 @@ def update_task(task_id: int, task: schemas.TaskCreate, db: Session = Depends(ge
     
     返却値：更新されたタスクの情報
     """
-    updated_task = crud.update_task(db, task_id=task_id, task=task)
+    updated_task = await run_db(db, crud.update_task, task_id=task_id, task=task)
     if updated_task is None:
         raise ResourceNotFound("タスク")
-    return updated_task
+    return JSTJSONResponse(crud.task_to_dict(updated_task))
+
+# タスクの部分更新
+@app.patch("/api/tasks/{task_id}", response_model=schemas.Task)
+async def patch_task(task_id: int, task: schemas.TaskUpdate, db: Session = Depends(get_session)):
+    """
+    指定されたIDのタスクの、送信された項目だけを更新します（例：`{"status": "completed"}`）。
+    
+    - **task_id**: 更新したいタスクのID
+    - 項目は PUT /api/tasks/{task_id} と同じです。送信しなかった項目は変更しません
+    
+    返却値：更新されたタスクの情報
+    """
+    patched_task = await run_db(db, crud.patch_task, task_id=task_id, task=task)
+    if patched_task is None:
+        raise ResourceNotFound("タスク")
+    return JSTJSONResponse(patched_task)
 
 # タスク削除
 @app.delete("/api/tasks/{task_id}", response_model=schemas.Task)
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(task_id: int, db: Session = Depends(get_session)):
     """
     指定されたIDのタスクを削除します。
     
@@ -205,7 +572,231 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
     
     返却値：削除されたタスクの情報
     """
-    deleted_task = crud.delete_task(db, task_id=task_id)
+    deleted_task = await run_db(db, crud.delete_task, task_id=task_id)
     if deleted_task is None:
         raise ResourceNotFound("タスク")
-    return deleted_task
+    return JSTJSONResponse(crud.task_to_dict(deleted_task))
+
+
+# 文字起こしジョブの登録
+@app.post("/api/meetings/{meeting_id}/transcribe", response_model=schemas.Job, status_code=202)
+async def transcribe_meeting(
+    meeting_id: int,
+    db: Session = Depends(get_session),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    会議の音声ファイル（audio_file_path）の文字起こしジョブを登録します。
+    処理はバックグラウンドで行われ、完了すると会議のtranscriptに保存されます。
+    
+    - **meeting_id**: 文字起こしを行う会議のID
+    
+    返却値：登録されたジョブ（実行中のジョブがある場合はそのジョブ）
+    """
+    meeting = await run_db(db, crud.get_meeting_by_id, meeting_id)
+    if meeting is None:
+        raise ResourceNotFound("会議")
+    if not meeting.audio_file_path:
+        raise ValidationError("音声ファイルが登録されていません")
+
+    job = await run_db(
+        db, crud.get_active_job, meeting_id=meeting_id, kind=TRANSCRIPTION_JOB, stale_after=settings.JOB_STALE_SECONDS
+    )
+    if job is None:
+        job = await run_db(db, crud.create_job, meeting_id=meeting_id, kind=TRANSCRIPTION_JOB)
+        service.start(job["id"], meeting_id, meeting.audio_file_path)
+    return JSTJSONResponse(job, status_code=202)
+
+# 要約ジョブの登録
+@app.post("/api/meetings/{meeting_id}/summarize", response_model=schemas.Job, status_code=202)
+async def summarize_meeting(
+    meeting_id: int,
+    db: Session = Depends(get_session),
+    service: SummarizationService = Depends(get_summarization_service)
+):
+    """
+    会議の議事録（transcript）の要約ジョブを登録します。
+    処理はバックグラウンドで行われ、完了すると会議のsummaryに保存されます。
+    議事録が前回の要約から変わっていない場合は、LLMを呼び出さずに前回の結果を使います。
+    
+    - **meeting_id**: 要約を行う会議のID
+    
+    返却値：登録されたジョブ（実行中のジョブがある場合はそのジョブ）
+    """
+    meeting = await run_db(db, crud.get_meeting_by_id, meeting_id)
+    if meeting is None:
+        raise ResourceNotFound("会議")
+    if not await run_db(db, crud.has_transcript, meeting_id):
+        raise ValidationError("議事録が登録されていません")
+
+    job = await run_db(
+        db, crud.get_active_job, meeting_id=meeting_id, kind=SUMMARIZATION_JOB, stale_after=settings.JOB_STALE_SECONDS
+    )
+    if job is None:
+        job = await run_db(db, crud.create_job, meeting_id=meeting_id, kind=SUMMARIZATION_JOB)
+        service.start(job["id"], meeting_id)
+    return JSTJSONResponse(job, status_code=202)
+
+# タスク抽出ジョブの登録
+@app.post("/api/meetings/{meeting_id}/tasks/extract", response_model=schemas.Job, status_code=202)
+async def extract_meeting_tasks(
+    meeting_id: int,
+    db: Session = Depends(get_session),
+    service: ExtractionService = Depends(get_extraction_service)
+):
+    """
+    会議の要約（summary）と議事録（transcript）からアクションアイテムを抽出し、タスクとして登録するジョブを登録します。
+    担当者は参加者の名前から、期限は会議の日付を基準に「明日」「来週金曜」「10月20日」などの表現から決めます。
+    処理はバックグラウンドで行われ、抽出したタスクはまとめて登録されます（同じ内容のタスクは重複して登録しません）。
+    
+    - **meeting_id**: タスクを抽出する会議のID
+    
+    返却値：登録されたジョブ（実行中のジョブがある場合はそのジョブ）
+    """
+    meeting = await run_db(db, crud.get_meeting_by_id, meeting_id)
+    if meeting is None:
+        raise ResourceNotFound("会議")
+    if not meeting.summary and not await run_db(db, crud.has_transcript, meeting_id):
+        raise ValidationError("議事録・要約が登録されていません")
+
+    job = await run_db(
+        db, crud.get_active_job, meeting_id=meeting_id, kind=TASK_EXTRACTION_JOB, stale_after=settings.JOB_STALE_SECONDS
+    )
+    if job is None:
+        job = await run_db(db, crud.create_job, meeting_id=meeting_id, kind=TASK_EXTRACTION_JOB)
+        service.start(job["id"], meeting_id)
+    return JSTJSONResponse(job, status_code=202)
+
+# ジョブの状態取得
+@app.get("/api/jobs/{job_id}", response_model=schemas.Job)
+async def read_job(job_id: int, db: Session = Depends(get_session)):
+    """
+    バックグラウンドジョブの状態を取得します。
+    
+    - **job_id**: ジョブのID
+    
+    返却値：ジョブの状態（status: queued/running/completed/failed、progress: 0〜1）
+    """
+    job = await run_db(db, crud.get_job, job_id)
+    if job is None:
+        raise ResourceNotFound("ジョブ")
+    return JSTJSONResponse(job)
+
+# 会議・タスクをまとめてエクスポートするエンドポイント
+@app.get("/api/export/{resource}.{fmt}")
+async def export_data(
+    resource: Literal["meetings", "tasks"],
+    fmt: Literal["ndjson", "csv"],
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    すべての会議（meetings）またはタスク（tasks）をID順にエクスポートします。
+    
+    - **resource**: `meetings` または `tasks`
+    - **fmt**: `ndjson`（1行に1件のJSON）または `csv`（ヘッダー行付き。参加者はセミコロン区切り）
+    
+    データベースから少しずつ読みながら返すため、件数が多くてもメモリ使用量は一定です。
+    Accept-Encodingにgzipを指定すると圧縮して返します。議事録の本文は含みません。
+    
+    返却値：NDJSONまたはCSV（例：`GET /api/export/meetings.ndjson`）
+    """
+    # 依存関係のセッションはレスポンスの送信前に閉じられるため、同じエンジンで別のセッションを開いて読む。
+    # 非同期モードでも同期のエンジンを使う（読み込みはスレッドプールで行う）
+    bind = db.get_bind()
+    compress = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "Content-Disposition": f'attachment; filename="{resource}.{fmt}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_rows(bind, resource, fmt, settings.EXPORT_BATCH_SIZE, compress=compress),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
+# NDJSONから会議をまとめてインポートするエンドポイント
+@app.post("/api/import/meetings", response_model=schemas.ImportResult)
+async def import_meetings(
+    request: Request,
+    offset: int = Query(0, ge=0, description="この行数までを読み飛ばす（中断したインポートの next_offset）"),
+    db: Session = Depends(get_session)
+):
+    """
+    リクエストボディのNDJSON（1行に1件の会議）から会議をまとめて登録します。
+    
+    各行は POST /api/meetings と同じ項目で、tasksにタスクの配列を指定できます
+    （GET /api/export/meetings.ndjson の行もそのまま読めます）。過去の日付も登録できます。
+    IMPORT_CHUNK_SIZE行ずつ検証して1つのトランザクションで登録し、検証に失敗した行は
+    登録せずに行番号（line）とメッセージを返します。
+    
+    - **offset**: この行数までを読み飛ばします。途中で失敗した場合は、それまでにコミットされた行数
+      （CLIではチェックポイントのファイル）を指定すると続きから再開できます
+    
+    1行が IMPORT_MAX_LINE_BYTES を超えた場合（413）やデータベースのエラー（500）で途中で失敗した場合も、
+    エラーの本文にメッセージ（detail）とそれまでにコミットした分の集計を含めます。next_offset をoffsetに
+    指定すると続きから再開できます。長すぎる行は、detailの行番号をoffsetに指定すると読み飛ばせます。
+    
+    返却値：登録した件数（imported）、失敗した件数（failed）とその行（errors）、処理済みの行数（next_offset）
+    """
+    result = await import_stream(
+        db,
+        request.stream(),
+        offset,
+        chunk_size=settings.IMPORT_CHUNK_SIZE,
+        max_errors=settings.IMPORT_MAX_ERRORS,
+        max_line_bytes=settings.IMPORT_MAX_LINE_BYTES,
+    )
+    return JSTJSONResponse(result)
+
+# コネクションプールの計測値
+@app.get("/api/metrics/pool")
+async def read_pool_metrics():
+    """
+    データベースのコネクションプールの状態を取得します。
+
+    - **checked_out**: 使用中の接続数
+    - **overflow**: pool_sizeを超えて作成された接続数
+    - **checkout_wait_seconds_total**: 接続取得にかかった時間の累計
+    - **checkout_latency_ms_histogram**: 接続取得時間の累積ヒストグラム（ミリ秒）
+
+    返却値：同期エンジン（sync）と、非同期モード時は非同期エンジン（async）の計測値
+    """
+    metrics = {"sync": pool_metrics.snapshot(engine.pool)}
+    if database.async_engine is not None:
+        metrics["async"] = database.async_pool_metrics.snapshot(database.async_engine.pool)
+    return metrics
+
+
+# レスポンスキャッシュの計測値
+@app.get("/api/metrics/cache")
+async def read_cache_metrics():
+    """
+    会議の詳細・タスク一覧のレスポンスキャッシュの状態を取得します。
+
+    - **hits** / **misses**: キャッシュから返した回数 / データベースから読んだ回数
+    - **invalidations**: 更新によって無効化したキーの数
+    - **evictions**: 件数の上限を超えて捨てた数（プロセス内のキャッシュのみ）
+    - **expirations**: TTLが切れて捨てた数（プロセス内のキャッシュのみ）
+
+    返却値：キャッシュの計測値
+    """
+    return response_cache.snapshot()
+
+
+# 変更イベントの配信の計測値
+@app.get("/api/metrics/events")
+async def read_event_metrics():
+    """
+    会議の変更イベント（Server-Sent Events）の配信の状態を取得します。
+
+    - **subscribers**: 接続中の購読者数
+    - **meetings**: 購読されている会議の数
+    - **published**: 購読者のいる会議に配信したイベントの数
+    - **resyncs**: 読み込みが遅れてイベントを捨て、resyncを送った回数
+
+    返却値：このプロセスの配信の計測値
+    """
+    return event_broker.snapshot()
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, event
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from .database import Base
-from json import loads, dumps
+from .utils import serialize_participants, deserialize_participants
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # キーセットページング（date, id順）用の複合インデックス
+        Index("ix_meetings_date_id", "date", "id"),
+        # ETagの確認（更新日時だけを読む）をインデックスだけで行う
+        Index("ix_meetings_id_updated_at", "id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -14,39 +20,86 @@ class Meeting(Base):
     end_time = Column(String(5), nullable=False)
     participants = Column(Text, nullable=True)
     audio_file_path = Column(String(255), nullable=True)
-    transcript = Column(Text, nullable=True)
     summary = Column(Text, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     # リレーションシップ
     tasks = relationship("Task", back_populates="meeting", cascade="all, delete-orphan")
+    # 参加者名での検索用（participantsと同じ内容を正規化して保持する）
+    participant_links = relationship(
+        "MeetingParticipant", back_populates="meeting", cascade="all, delete-orphan"
+    )
+    # 議事録（長時間の録音でも一覧で読み込まないよう別テーブルに保持する）
+    transcript_segments = relationship(
+        "TranscriptSegment",
+        back_populates="meeting",
+        order_by="TranscriptSegment.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     @property
     def participants_list(self):
-        """participantsをJSON文字列からリストに変換して返す"""
-        if self.participants:
-            try:
-                return loads(self.participants)
-            except:
-                return []
-        return []
+        """
+        participantsをJSON文字列からリストに変換して返す（同じ値は再デコードしない）。
+        キャッシュはタプルで持ち、呼び出しごとに新しいリストを返す（変更してもキャッシュに影響しない）
+        """
+        raw = self.participants
+        cached = self.__dict__.get("_participants_cache")
+        if cached is None or cached[0] is not raw:
+            cached = (raw, tuple(deserialize_participants(raw)))
+            self.__dict__["_participants_cache"] = cached
+        return list(cached[1])
 
-    def __init__(self, **kwargs):
-        """初期化時にparticipantsをJSON文字列に変換"""
-        if 'participants' in kwargs and isinstance(kwargs['participants'], list):
-            kwargs['participants'] = dumps(kwargs['participants'])
-        super().__init__(**kwargs)
+
+class MeetingParticipant(Base):
+    __tablename__ = "meeting_participants"
+    __table_args__ = (
+        # 「参加者Xの会議一覧」を名前から引くためのインデックス
+        Index("ix_meeting_participants_name_meeting_id", "name", "meeting_id"),
+    )
+
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(30), primary_key=True)
+
+    meeting = relationship("Meeting", back_populates="participant_links")
+
+
+class TranscriptSegment(Base):
+    """議事録の1セグメント（文字起こしの場合は時刻付き）"""
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # 議事録全体を順番に読むためのインデックス
+        Index("ix_transcript_segments_meeting_id_position", "meeting_id", "position", unique=True),
+        # 時刻の範囲で読むためのインデックス
+        Index("ix_transcript_segments_meeting_id_start", "meeting_id", "start_seconds"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    start_seconds = Column(Float, nullable=True)  # 録音の先頭からの秒数（手入力の議事録はNULL）
+    end_seconds = Column(Float, nullable=True)
+    text = Column(Text, nullable=False)
+
+    meeting = relationship("Meeting", back_populates="transcript_segments")
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 担当者・ステータスでの絞り込み用
+        Index("ix_tasks_assignee_status", "assignee", "status"),
+        # 会議のタスクの最新の更新日時（ETag用）をインデックスだけで求める
+        Index("ix_tasks_meeting_id_updated_at", "meeting_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    meeting_id = Column(Integer, ForeignKey("meetings.id"))
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), index=True)
     content = Column(Text, nullable=False)
     assignee = Column(String(100))
-    due_date = Column(DateTime, nullable=True)
+    due_date = Column(DateTime, nullable=True, index=True)
     status = Column(String(20), default="pending")
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -54,18 +107,37 @@ class Task(Base):
     meeting = relationship("Meeting", back_populates="tasks")
 
 
+class Job(Base):
+    """文字起こしなどのバックグラウンド処理の状態"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # 会議ごとの実行中ジョブの検索用
+        Index("ix_jobs_meeting_id_kind", "meeting_id", "kind"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(30), nullable=False)
+    status = Column(String(20), default="queued")  # queued / running / completed / failed
+    progress = Column(Float, default=0.0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class SummaryCache(Base):
+    """LLMの要約結果（モデル・プロンプト・入力テキストのハッシュで引く）"""
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)  # SHA-256の16進文字列
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
 # SQLAlchemyイベントリスナー
-@event.listens_for(Meeting, 'before_update')
-def convert_participants_to_json(mapper, connection, target):
-    """更新時にparticipantsをJSON文字列に変換"""
-    if hasattr(target, 'participants') and isinstance(target.participants, list):
-        target.participants = dumps(target.participants)
-
-@event.listens_for(Meeting, 'load')
-def convert_participants_from_json(target, context):
-    """データベースからロード時にparticipantsをリストに変換"""
-    if target.participants:
-        try:
-            target.participants = loads(target.participants)
-        except:
-            target.participants = []
\ No newline at end of file
+@event.listens_for(Meeting.participants, "set", retval=True)
+def convert_participants_to_json(target, value, oldvalue, initiator):
+    """リストが代入されたらJSON文字列に変換（DB上もインスタンス上も常にJSON文字列で保持）"""
+    if isinstance(value, list):
+        return serialize_participants(value)
+    return value
@@ -0,0 +1,107 @@
+# app/pool_metrics.py
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# チェックアウト待ち時間ヒストグラムのバケット境界（ミリ秒）
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """コネクションプールの計測値（チェックアウト数・待ち時間・ヒストグラム）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_timeouts = 0
+            self.checkout_wait_seconds = 0.0
+            self.checkout_wait_max_seconds = 0.0
+            self.bucket_counts = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+            self.connects = 0
+            self.invalidations = 0
+
+    def observe_checkout(self, seconds: float, timed_out: bool = False):
+        elapsed_ms = seconds * 1000
+        index = len(CHECKOUT_BUCKETS_MS)
+        for i, bound in enumerate(CHECKOUT_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.checkout_wait_seconds += seconds
+            self.checkout_wait_max_seconds = max(self.checkout_wait_max_seconds, seconds)
+            self.bucket_counts[index] += 1
+
+    def observe_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def observe_invalidate(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        """プールの現在の状態と累計値を辞書で返す"""
+        with self._lock:
+            # ヒストグラムはPrometheus形式と同じく累積値で返す
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip(CHECKOUT_BUCKETS_MS + ("+Inf",), self.bucket_counts):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            data = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_seconds_total": round(self.checkout_wait_seconds, 6),
+                "checkout_wait_seconds_max": round(self.checkout_wait_max_seconds, 6),
+                "checkout_latency_ms_histogram": histogram,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return data
+
+
+class _CheckoutTimingMixin:
+    """プールからのコネクション取得（待ちを含む）にかかった時間を計測する"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.metrics.observe_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start)
+        return conn
+
+
+def instrumented_pool_class(metrics: PoolMetrics, async_driver: bool = False):
+    """metricsに計測値を記録するQueuePoolのサブクラスを返す"""
+    base = AsyncAdaptedQueuePool if async_driver else QueuePool
+    # dispose()でプールが作り直されても計測値を引き継げるようクラス属性で持つ
+    return type(f"Instrumented{base.__name__}", (_CheckoutTimingMixin, base), {"metrics": metrics})
+
+
+def attach_pool_listeners(engine, metrics: PoolMetrics):
+    """新規接続・接続破棄（pre-ping失敗など）の回数を記録する"""
+    event.listen(engine, "connect", lambda dbapi_conn, record: metrics.observe_connect())
+    event.listen(engine, "invalidate", lambda dbapi_conn, record, exc: metrics.observe_invalidate())
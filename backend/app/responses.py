@@ -0,0 +1,34 @@
+# app/responses.py
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from .utils import to_jst, DATETIME_FORMAT
+
+
+def _default(obj: Any) -> Any:
+    # utils.CustomJSONEncoderと同じく、日時はJSTに変換してフォーマットする
+    if isinstance(obj, datetime):
+        return to_jst(obj).strftime(DATETIME_FORMAT)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjsonでJSONのバイト列に変換"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class JSTJSONResponse(JSONResponse):
+    """
+    orjsonで直接エンコードするJSONレスポンス。
+
+    エンドポイントがこのレスポンスを返すと、FastAPIはresponse_modelによる
+    出力の再検証とjsonable_encoderを行わない（JSONResponseを継承しているので、
+    OpenAPIのドキュメントにはresponse_modelのスキーマが出力される）。
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
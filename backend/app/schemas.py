@@ -13,6 +13,49 @@ from .utils import (
 )
 import re
 
+# 担当者名・参加者名に使える文字
+NAME_PATTERN = re.compile(r"^[\w\-\u3040-\u30FF\u3400-\u4DBF\u4E00-\u9FFF]+$")
+TASK_STATUSES = ("pending", "in_progress", "completed")
+
+
+# 項目ごとの検証（モデルのバリデーターと、モデルを使わない一括インポート（importer）で共通）
+def check_task_content(v: str) -> str:
+    if len(v) > 1000:
+        raise ContentLengthError(max_length=1000)
+    return v
+
+def check_assignee(v: Optional[str]) -> Optional[str]:
+    if v is not None:
+        if not NAME_PATTERN.match(v):
+            raise ValidationError("担当者IDは英数字・アンダースコア・ハイフン・ひらがな・カタカナ・漢字のみ使用可能です")
+        if len(v) > 30:
+            raise ValidationError("担当者名は30文字以内で入力してください")
+    return v
+
+def check_task_status(v: str) -> str:
+    if v not in TASK_STATUSES:
+        raise ValidationError(f"ステータスは {', '.join(TASK_STATUSES)} のいずれかにしてください")
+    return v
+
+def check_time(v: str) -> str:
+    if not validate_time_format(v):
+        raise ValidationError("時刻は HH:MM 形式で入力してください（例: 09:30）")
+    if not validate_time_interval(v):
+        raise ValidationError("時刻は10分単位で指定してください")
+    return v
+
+def check_participants(v: List[str]) -> List[str]:
+    if len(v) > 20:
+        raise ValidationError("参加者は20名以内にしてください")
+    if not v:
+        return []
+    for participant in v:
+        if len(participant) > 30:
+            raise ValidationError("参加者名は30文字以内で入力してください")
+        if not NAME_PATTERN.match(participant):
+            raise ValidationError("参加者名は英数字・アンダースコア・ハイフン・ひらがな・カタカナ・漢字のみ使用可能です")
+    return v
+
 
 class TaskBase(BaseModel):
     content: str = Field(
@@ -22,7 +65,7 @@ class TaskBase(BaseModel):
     )
     assignee: Optional[str] = Field(
         None,
-        pattern=r"^[\w\-\u3040-\u30FF\u3400-\u4DBF\u4E00-\u9FFF]+$",
+        pattern=NAME_PATTERN.pattern,
         max_length=30,  # 追加：参加者名の最大文字数
         description="担当者のユーザーID"
     )
@@ -39,28 +82,17 @@ class TaskBase(BaseModel):
     @field_validator('content')
     @classmethod
     def validate_content(cls, v):
-        if len(v) > 1000:
-            raise ContentLengthError(max_length=1000)
-        return v
+        return check_task_content(v)
 
     @field_validator('assignee')
     @classmethod
     def validate_assignee(cls, v):
-        if v is not None:
-            if not re.match(r"^[\w\-\u3040-\u30FF\u3400-\u4DBF\u4E00-\u9FFF]+$", v):
-                raise ValidationError("担当者IDは英数字・アンダースコア・ハイフン・ひらがな・カタカナ・漢字のみ使用可能です")
-            if len(v) > 30:
-                raise ValidationError("担当者名は30文字以内で入力してください")
-        return v
+        return check_assignee(v)
 
     @field_validator('status')
     @classmethod
     def validate_status(cls, v):
-        
-        allowed_status = ['pending', 'in_progress', 'completed']
-        if v not in allowed_status:
-            raise ValidationError(f"ステータスは {', '.join(allowed_status)} のいずれかにしてください")
-        return v
+        return check_task_status(v)
 
     @field_validator('due_date')
     @classmethod
@@ -79,6 +111,13 @@ class TaskBase(BaseModel):
         return v
 
 
+def check_time_range(start_time: str, end_time: str):
+    """開始・終了時刻の前後関係と会議時間を検証する"""
+    if start_time >= end_time:
+        raise ValidationError("終了時刻は開始時刻より後にしてください")
+    if not validate_meeting_duration(start_time, end_time):
+        raise ValidationError("会議時間は3時間以内にしてください")
+
 class MeetingBase(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,  # SQLAlchemyモデルとの互換性を維持
@@ -121,11 +160,7 @@ class MeetingBase(BaseModel):
     @field_validator('start_time', 'end_time')
     @classmethod
     def validate_time_format(cls, v):
-        if not validate_time_format(v):
-            raise ValidationError("時刻は HH:MM 形式で入力してください（例: 09:30）")
-        if not validate_time_interval(v):
-            raise ValidationError("時刻は10分単位で指定してください")
-        return v
+        return check_time(v)
 
     # 終了時刻バリデーター（修正）
     @field_validator('end_time')
@@ -134,10 +169,7 @@ class MeetingBase(BaseModel):
         try:
             start_time = info.data.get('start_time')
             if start_time and v:
-                if start_time >= v:
-                    raise ValidationError("終了時刻は開始時刻より後にしてください")
-                if not validate_meeting_duration(start_time, v):
-                    raise ValidationError("会議時間は3時間以内にしてください")
+                check_time_range(start_time, v)
         except ValidationError:
             raise
         except Exception as e:
@@ -148,23 +180,33 @@ class MeetingBase(BaseModel):
     @field_validator('participants')
     @classmethod
     def validate_participants_length(cls, v):
-        if len(v) > 20:
-            raise ValidationError("参加者は20名以内にしてください")
-        if not v:
-            return []
-        for participant in v:
-            if len(participant) > 30:
-                raise ValidationError("参加者名は30文字以内で入力してください")
-            if not re.match(r"^[\w\-\u3040-\u30FF\u3400-\u4DBF\u4E00-\u9FFF]+$", participant):
-                raise ValidationError("参加者名は英数字・アンダースコア・ハイフン・ひらがな・カタカナ・漢字のみ使用可能です")
-        return v
+        return check_participants(v)
 
 class TaskCreate(TaskBase):
     pass    # TaskBaseを継承するだけで、meeting_idは不要
 
-class Task(TaskBase):
+class TaskUpdate(TaskBase):
+    """タスクの部分更新（送信された項目だけを検証する）"""
+    content: Optional[str] = Field(None, max_length=1000, description="タスクの内容")
+    status: Optional[str] = Field(None, description="タスクの状態")
+
+    @field_validator('content', 'status', mode='before')
+    @classmethod
+    def reject_null(cls, v, info):
+        if v is None:
+            raise ValidationError(f"{info.field_name}にnullは指定できません")
+        return v
+
+# レスポンス用のモデル（入力用のバリデーターを継承しない）
+# 保存済みのデータは検証済みのため、読み取り時にバリデーターを再実行しない。
+# 過去の日付になった会議・期限切れのタスクもそのまま返せる。
+class Task(BaseModel):
     id: int
     meeting_id: int
+    content: str
+    assignee: Optional[str] = None
+    due_date: Optional[datetime] = None
+    status: str = "pending"
     created_at: datetime
     updated_at: datetime
 
@@ -175,11 +217,116 @@ class Task(TaskBase):
 class MeetingCreate(MeetingBase):
     pass  # MeetingBaseを継承
 
-class Meeting(MeetingBase):
+class MeetingUpdate(MeetingBase):
+    """
+    会議の部分更新（送信された項目だけを検証する）。
+    開始・終了時刻の片方だけを送信した場合の前後関係は、保存済みの値と合わせて検証する（crud.patch_meeting）。
+    """
+    title: Optional[str] = Field(None, min_length=1, max_length=100, description="会議のタイトル")
+    date: Optional[datetime] = Field(None, description="会議の日付")
+    start_time: Optional[str] = Field(None, description="開始時刻（HH:MM形式）")
+    end_time: Optional[str] = Field(None, description="終了時刻（HH:MM形式）")
+    participants: Optional[List[str]] = Field(None, description="参加者リスト")
+
+    @field_validator('title', 'date', 'start_time', 'end_time', 'participants', mode='before')
+    @classmethod
+    def reject_null(cls, v, info):
+        if v is None:
+            raise ValidationError(f"{info.field_name}にnullは指定できません")
+        return v
+
+class Meeting(BaseModel):
     id: int
+    title: str
     date: datetime
+    start_time: str
+    end_time: str
+    participants: List[str] = []
+    audio_file_path: Optional[str] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     tasks: List[Task] = []
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MeetingPartial(BaseModel):
+    """fieldsで項目を指定した場合の会議（指定した項目だけを含む）"""
+    id: Optional[int] = None
+    title: Optional[str] = None
+    date: Optional[datetime] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    participants: Optional[List[str]] = None
+    audio_file_path: Optional[str] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    tasks: Optional[List[Task]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkError(BaseModel):
+    index: int  # リクエストの配列での位置
+    detail: str
+
+
+class MeetingBulkResult(BaseModel):
+    created: List[Meeting] = []
+    errors: List[BulkError] = []
+
+
+class TaskBulkResult(BaseModel):
+    created: List[Task] = []
+    updated: List[Task] = []
+    deleted: List[int] = []
+    errors: List[BulkError] = []
+
+
+class ImportLineError(BaseModel):
+    line: int  # NDJSONの行番号（1から）
+    detail: str
+
+
+class ImportResult(BaseModel):
+    imported: int  # 登録した会議の数
+    failed: int  # 検証に失敗した行の数
+    errors: List[ImportLineError] = []  # 失敗した行（IMPORT_MAX_ERRORS件まで）
+    next_offset: int  # コミット済みの行数（offsetに指定すると続きから再開する）
+
+
+class SearchResult(BaseModel):
+    id: int
+    title: str
+    date: datetime
+    start_time: str
+    end_time: str
+    score: float  # 関連度（大きいほど関連が高い）
+
+
+class TranscriptSegment(BaseModel):
+    start: Optional[float] = None
+    end: Optional[float] = None
+    text: str
+
+
+class Transcript(BaseModel):
+    meeting_id: int
+    segments: List[TranscriptSegment] = []
+
+
+class Job(BaseModel):
+    id: int
+    meeting_id: int
+    kind: str
+    status: str
+    progress: float = 0.0
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,364 @@
+# app/search.py
+"""
+会議の全文検索（タイトル・議事録・要約・タスク）
+
+日本語は単語の区切りがないため、文字のバイグラム（2文字ずつずらした語）に
+分割した文字列を索引にする。英数字は単語単位。検索語も同じ規則で分割し、
+語の並びをフレーズとして検索する。
+
+  - SQLite：FTS5の仮想テーブル（rowid = 会議ID）、bm25で順位付け
+  - PostgreSQL：tsvector列とGINインデックスのテーブル、ts_rank_cdで順位付け
+    （tsvectorの仕様上、1語あたりの位置は256件・位置は16383までしか保持されない）
+
+索引は会議の本文（タイトル・議事録・要約）の meeting_search と、タスクの meeting_task_search に分ける。
+タスクの作成・内容の更新では、タスクの索引だけを作り直す（長い議事録を分割し直さない）。
+複数の語はどちらかの索引に含まれていればよい（本文とタスクにまたがってもヒットする）。
+
+索引はSessionのafter_flushイベントで、変更のあった会議の行を作り直して同期する。
+一括INSERTなどORMのイベントを経由しない更新は、mark_dirty・mark_tasks_dirtyで指定するとコミット前に作り直す。
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import DDL, DateTime, Float, bindparam, event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import Base
+
+# 英数字の語、または英数字以外の文字（かな・漢字など）の連続
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\W\da-z_]+")
+
+# Session.info に変更のあった会議IDを溜めるキー（一括DELETEなどイベントが発生しない更新用）
+DIRTY_KEY = "search_dirty_meeting_ids"
+TASKS_DIRTY_KEY = "search_dirty_task_meeting_ids"
+
+# 列の重み（タイトル・議事録・要約の順。タスクは要約と同じ重み）
+SQLITE_WEIGHTS = (10.0, 1.0, 4.0)
+SQLITE_TASK_WEIGHT = 4.0
+
+# 索引のテーブル（モデルにはなく、SQLのDDLで作成する。SQLiteのFTS5は同じ名前で始まるテーブルも作る）
+SEARCH_TABLES = ("meeting_search", "meeting_task_search")
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meeting_search "
+    "USING fts5(title, transcript, summary, tokenize='unicode61')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meeting_task_search USING fts5(tasks, tokenize='unicode61')",
+)
+POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS meeting_search ("
+    "meeting_id INTEGER PRIMARY KEY REFERENCES meetings (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_meeting_search_document ON meeting_search USING GIN (document)",
+    "CREATE TABLE IF NOT EXISTS meeting_task_search ("
+    "meeting_id INTEGER PRIMARY KEY REFERENCES meetings (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_meeting_task_search_document ON meeting_task_search USING GIN (document)",
+)
+
+# create_all / drop_all で索引のテーブルも作成・削除する
+for statement in SQLITE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for table in SEARCH_TABLES:
+    event.listen(Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {table}"))
+
+
+def _words(value: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", value or "").lower())
+
+
+def _bigrams(word: str) -> List[str]:
+    if word.isascii() or len(word) == 1:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def tokenize(value: Optional[str]) -> str:
+    """索引用に、語（日本語はバイグラム）を空白区切りで並べた文字列にする"""
+    return " ".join(token for word in _words(value) for token in _bigrams(word))
+
+
+def build_terms(q: str, dialect: str) -> List[str]:
+    """検索語を、空白区切りの語ごとに索引の検索式にする"""
+    terms = []
+    for word in _words(q):
+        tokens = _bigrams(word)
+        # 日本語1文字の語はその文字で始まるバイグラムの前方一致で探す
+        prefix = len(word) == 1 and not word.isascii()
+        if dialect == "postgresql":
+            terms.append(f"{tokens[0]}:*" if prefix else " <-> ".join(tokens))
+        else:
+            terms.append(f"{tokens[0]}*" if prefix else '"' + " ".join(tokens) + '"')
+    return terms
+
+
+def build_query(q: str, dialect: str, operator: str = "AND") -> Optional[str]:
+    """
+    検索語を索引の検索式にする（operator="AND"は空白区切りの語をすべて含むもの、"OR"はいずれかを含むもの）。
+    検索できる語がない場合はNone。
+    """
+    terms = build_terms(q, dialect)
+    if not terms:
+        return None
+    if dialect == "postgresql":
+        return (" & " if operator == "AND" else " | ").join(terms)
+    return f" {operator} ".join(terms)
+
+
+def mark_dirty(db: Session, meeting_id: int):
+    """ORMのイベントを経由しない更新（一括DELETEなど）の後で、会議の本文の索引を作り直す対象にする"""
+    db.info.setdefault(DIRTY_KEY, set()).add(meeting_id)
+
+
+def mark_tasks_dirty(db: Session, meeting_id: int):
+    """ORMのイベントを経由しないタスクの更新の後で、会議のタスクの索引を作り直す対象にする"""
+    db.info.setdefault(TASKS_DIRTY_KEY, set()).add(meeting_id)
+
+
+# 更新された場合に索引を作り直す属性（ステータスの変更などでは作り直さない）
+INDEXED_ATTRIBUTES = {
+    models.Meeting: ("title", "summary"),
+    models.TranscriptSegment: ("text",),
+}
+TASK_INDEXED_ATTRIBUTES = ("content", "meeting_id")
+
+
+def _changed_meeting_ids(session: Session) -> Tuple[Set[int], Set[int]]:
+    """(本文の索引を作り直す会議ID, タスクの索引を作り直す会議ID)"""
+    ids = set(session.info.pop(DIRTY_KEY, ()))
+    task_ids = set(session.info.pop(TASKS_DIRTY_KEY, ()))
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, models.Meeting):
+            # 削除された会議は両方の索引から削除する
+            ids.add(obj.id)
+            task_ids.add(obj.id)
+        elif isinstance(obj, models.TranscriptSegment):
+            ids.add(obj.meeting_id)
+        elif isinstance(obj, models.Task):
+            task_ids.add(obj.meeting_id)
+    for obj in session.dirty:
+        if isinstance(obj, models.Task):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in TASK_INDEXED_ATTRIBUTES):
+                task_ids.add(obj.meeting_id)
+                # タスクが別の会議に移動した場合は移動元も作り直す
+                task_ids.update(state.attrs.meeting_id.history.deleted)
+            continue
+        attributes = INDEXED_ATTRIBUTES.get(type(obj))
+        if attributes is None:
+            continue
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in attributes):
+            ids.add(obj.id if isinstance(obj, models.Meeting) else obj.meeting_id)
+    ids.discard(None)
+    task_ids.discard(None)
+    return ids, task_ids
+
+
+# 1回の文で作り直す会議の数（IN句のパラメーター数を抑える）
+REINDEX_BATCH_SIZE = 500
+
+
+def reindex_meetings(connection, meeting_ids: Iterable[int]):
+    """
+    会議の本文（タイトル・議事録・要約）の索引の行を現在の内容で作り直す（会議が削除されていれば行を削除する）。
+    会議・議事録の読み込みと索引の削除・登録は、まとめた会議ごとに1回ずつ行う。
+    """
+    _reindex(connection, meeting_ids, _reindex_batch)
+
+
+def reindex_tasks(connection, meeting_ids: Iterable[int]):
+    """会議のタスクの索引の行を現在のタスクで作り直す（タスクがなければ行を削除する）"""
+    _reindex(connection, meeting_ids, _reindex_tasks_batch)
+
+
+def _reindex(connection, meeting_ids: Iterable[int], reindex_batch):
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+    meeting_ids = list(meeting_ids)
+    for start in range(0, len(meeting_ids), REINDEX_BATCH_SIZE):
+        reindex_batch(connection, dialect, meeting_ids[start:start + REINDEX_BATCH_SIZE])
+
+
+def _delete_rows(connection, dialect: str, table: str, meeting_ids: List[int]):
+    key = "rowid" if dialect == "sqlite" else "meeting_id"
+    connection.execute(
+        text(f"DELETE FROM {table} WHERE {key} IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": meeting_ids},
+    )
+
+
+def _reindex_batch(connection, dialect: str, meeting_ids: List[int]):
+    _delete_rows(connection, dialect, "meeting_search", meeting_ids)
+
+    meetings = connection.execute(
+        select(models.Meeting.id, models.Meeting.title, models.Meeting.summary)
+        .where(models.Meeting.id.in_(meeting_ids))
+        .order_by(models.Meeting.id)
+    ).all()
+    if not meetings:
+        return
+    transcripts = defaultdict(list)
+    for meeting_id, segment in connection.execute(
+        select(models.TranscriptSegment.meeting_id, models.TranscriptSegment.text)
+        .where(models.TranscriptSegment.meeting_id.in_(meeting_ids))
+        .order_by(models.TranscriptSegment.meeting_id, models.TranscriptSegment.position)
+    ):
+        transcripts[meeting_id].append(segment)
+
+    documents = [
+        {
+            "id": meeting.id,
+            "title": tokenize(meeting.title),
+            "transcript": tokenize("\n".join(transcripts[meeting.id])),
+            "summary": tokenize(meeting.summary),
+        }
+        for meeting in meetings
+    ]
+    if dialect == "sqlite":
+        connection.execute(text(
+            "INSERT INTO meeting_search (rowid, title, transcript, summary) "
+            "VALUES (:id, :title, :transcript, :summary)"
+        ), documents)
+    else:
+        connection.execute(text(
+            "INSERT INTO meeting_search (meeting_id, document) VALUES (:id, "
+            "setweight(to_tsvector('simple', :title), 'A') || "
+            "setweight(to_tsvector('simple', :summary), 'B') || "
+            "setweight(to_tsvector('simple', :transcript), 'D'))"
+        ), documents)
+
+
+def _reindex_tasks_batch(connection, dialect: str, meeting_ids: List[int]):
+    _delete_rows(connection, dialect, "meeting_task_search", meeting_ids)
+
+    tasks = defaultdict(list)
+    for meeting_id, content in connection.execute(
+        select(models.Task.meeting_id, models.Task.content)
+        .where(models.Task.meeting_id.in_(meeting_ids))
+        .order_by(models.Task.meeting_id, models.Task.id)
+    ):
+        tasks[meeting_id].append(content)
+    if not tasks:
+        return
+
+    documents = [
+        {"id": meeting_id, "tasks": tokenize("\n".join(contents))}
+        for meeting_id, contents in tasks.items()
+    ]
+    if dialect == "sqlite":
+        connection.execute(text("INSERT INTO meeting_task_search (rowid, tasks) VALUES (:id, :tasks)"), documents)
+    else:
+        connection.execute(text(
+            "INSERT INTO meeting_task_search (meeting_id, document) "
+            "VALUES (:id, setweight(to_tsvector('simple', :tasks), 'B'))"
+        ), documents)
+
+
+def rebuild_search_index(connection, batch_size: int = 1000):
+    """すべての会議の索引を作り直す（データ投入後に使う）"""
+    last_id = 0
+    while True:
+        ids = connection.execute(
+            select(models.Meeting.id).where(models.Meeting.id > last_id).order_by(models.Meeting.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        reindex_meetings(connection, ids)
+        reindex_tasks(connection, ids)
+        last_id = ids[-1]
+
+
+def _reindex_changed(session: Session, meeting_ids: Set[int], task_meeting_ids: Set[int]):
+    if meeting_ids:
+        reindex_meetings(session.connection(), sorted(meeting_ids))
+    if task_meeting_ids:
+        reindex_tasks(session.connection(), sorted(task_meeting_ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session: Session, flush_context):
+    # フラッシュ済みの内容は同じトランザクション内で読めるので、ここで索引を更新する
+    _reindex_changed(session, *_changed_meeting_ids(session))
+
+
+@event.listens_for(Session, "before_commit")
+def _sync_marked_meetings(session: Session):
+    # 一括INSERTだけのトランザクションのように、フラッシュする変更がなく
+    # after_flushが発生しない場合も、mark_dirty・mark_tasks_dirtyで指定された会議の索引を作り直す
+    if session.info.get(DIRTY_KEY) or session.info.get(TASKS_DIRTY_KEY):
+        session.flush()
+        _reindex_changed(session, set(session.info.pop(DIRTY_KEY, ())), set(session.info.pop(TASKS_DIRTY_KEY, ())))
+
+
+def search_meetings(db: Session, q: str, skip: int = 0, limit: int = 20):
+    """
+    検索語に一致する会議を関連度の高い順に返す。
+    検索できる語がない場合はNone。
+    """
+    dialect = db.get_bind().dialect.name
+    terms = build_terms(q, dialect)
+    if not terms:
+        return None
+    params = {
+        "all": build_query(q, dialect),
+        "any": build_query(q, dialect, operator="OR"),
+        "skip": skip,
+        "limit": limit,
+        **{f"term{i}": term for i, term in enumerate(terms)},
+    }
+    # 索引のテーブル（table）を検索式のパラメーター（param）で検索し、会議IDとscoreを返すSELECT・会議IDだけを返すSELECT
+    if dialect == "postgresql":
+        ranked = (
+            "SELECT meeting_id AS id, ts_rank_cd(document, to_tsquery('simple', :{param})) AS score "
+            "FROM {table} WHERE document @@ to_tsquery('simple', :{param})"
+        )
+        matched = "SELECT meeting_id FROM {table} WHERE document @@ to_tsquery('simple', :{param})"
+        task_weight = ""
+    else:
+        # bm25は小さいほど関連度が高いので、符号を反転してscoreにする（{weights}は列の重み）
+        ranked = "SELECT rowid AS id, -bm25({table}{weights}) AS score FROM {table} WHERE {table} MATCH :{param}"
+        matched = "SELECT rowid FROM {table} WHERE {table} MATCH :{param}"
+        task_weight = f" * {SQLITE_TASK_WEIGHT}"
+
+    # すべての語を本文に含む会議（doc）に、タスクの関連度を加える。
+    # タスクにいずれかの語を含む会議（task）のうち本文だけでは一致しないものは、
+    # 語ごとに本文・タスクのどちらかに含まれていれば一致とする（語が本文とタスクにまたがる場合）
+    task_only = f"id NOT IN ({matched.format(table='meeting_search', param='all')})"
+    for i in range(len(terms) if len(terms) > 1 else 0):
+        task_only += (
+            f" AND (id IN ({matched.format(table='meeting_search', param=f'term{i}')})"
+            f" OR id IN ({matched.format(table='meeting_task_search', param=f'term{i}')}))"
+        )
+    weights = "".join(f", {weight}" for weight in SQLITE_WEIGHTS)
+    doc = ranked.format(table="meeting_search", weights=weights, param="all")
+    task = ranked.format(table="meeting_task_search", weights="", param="any")
+    # 会議の行は順位付けしたページの分だけ読む
+    statement = text(
+        f"WITH doc AS ({doc}), "
+        f"task AS (SELECT id, score{task_weight} AS score FROM ({task}) AS task_hits), "
+        "ranked AS ("
+        "SELECT doc.id, doc.score + COALESCE(task.score, 0) AS score FROM doc LEFT JOIN task ON task.id = doc.id "
+        f"UNION ALL SELECT id, score FROM task WHERE {task_only} "
+        "ORDER BY score DESC, id LIMIT :limit OFFSET :skip) "
+        "SELECT m.id, m.title, m.date, m.start_time, m.end_time, ranked.score "
+        "FROM ranked JOIN meetings m ON m.id = ranked.id "
+        "ORDER BY ranked.score DESC, m.id"
+    )
+    rows = db.execute(statement.columns(date=DateTime, score=Float), params)
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "date": row.date,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "score": float(row.score),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,76 @@
+# app/storage.py
+"""
+アップロードされた音声ファイルの保存
+
+リクエストボディを一定サイズのブロックごとにハッシュ計算しながら一時ファイルへ
+書き込み、完了後に内容のハッシュ（SHA-256）をファイル名にして移動する。
+同じ内容のファイルは一度だけ保存され、メモリ使用量はファイルサイズによらず一定。
+"""
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterator, NamedTuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .exceptions import PayloadTooLarge, ValidationError
+
+# ディスクへの書き込み単位
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+
+class StoredFile(NamedTuple):
+    path: str
+    sha256: str
+    size: int
+    created: bool  # Falseの場合は同じ内容のファイルが既に保存されていた
+
+
+def _write_block(f, digest, block: bytearray):
+    # ハッシュ計算と書き込みはイベントループを止めないようスレッドで行う
+    digest.update(block)
+    f.write(block)
+
+
+def _store(temp_path: str, directory: str, sha256: str) -> bool:
+    path = os.path.join(directory, sha256[:2], sha256)
+    if os.path.exists(path):
+        os.remove(temp_path)
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(temp_path, path)
+    return True
+
+
+async def save_stream(stream: AsyncIterator[bytes], directory: str, max_bytes: int) -> StoredFile:
+    """
+    バイト列のストリームを directory に保存する。
+
+    max_bytes を超えた時点で PayloadTooLarge を送出し、書きかけのファイルは削除する。
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    block = bytearray()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for data in stream:
+                size += len(data)
+                if size > max_bytes:
+                    raise PayloadTooLarge(max_bytes)
+                block += data
+                if len(block) >= WRITE_BLOCK_SIZE:
+                    await run_in_threadpool(_write_block, f, digest, block)
+                    block.clear()
+            if block:
+                await run_in_threadpool(_write_block, f, digest, block)
+        if size == 0:
+            raise ValidationError("音声ファイルが空です")
+        sha256 = digest.hexdigest()
+        created = await run_in_threadpool(_store, temp_path, directory, sha256)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return StoredFile(os.path.join(directory, sha256[:2], sha256), sha256, size, created)
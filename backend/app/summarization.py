@@ -0,0 +1,249 @@
+# app/summarization.py
+"""
+LLMによる議事録の要約ジョブ
+
+議事録をトークン数で区切ったチャンクに分け、チャンクごとの要約（map）を
+同時実行数を制限して並行に求め、それらを1つの要約にまとめる（reduce）。
+まとめる要約が1回の入力に収まらない場合は、1つになるまでreduceを繰り返す。
+
+LLMの呼び出し結果は、モデル・プロンプト・入力テキストのハッシュをキーにして
+summary_cacheテーブルに保存する。議事録が変わっていなければ再実行してもAPIは
+呼ばれず、議事録の一部が変わった場合も変わったチャンクとreduceだけを呼び出す。
+"""
+import asyncio
+import hashlib
+from typing import Callable, List, Optional, Protocol
+
+from . import crud
+from .core.config import get_settings
+from .database import SessionLocal
+from .jobs import BackgroundJobService
+
+
+SUMMARIZATION_JOB = "summarization"
+
+MAP_PROMPT = (
+    "あなたは会議の議事録を要約するアシスタントです。"
+    "以下は会議の議事録の一部です。決定事項・議論の要点・今後の対応を漏らさず、"
+    "日本語の箇条書きで簡潔に要約してください。"
+)
+REDUCE_PROMPT = (
+    "あなたは会議の議事録を要約するアシスタントです。"
+    "以下は1つの会議の議事録を部分ごとに要約したものです。重複をまとめ、"
+    "会議全体の決定事項・議論の要点・今後の対応を日本語の箇条書きで簡潔にまとめてください。"
+)
+
+
+class Tokenizer(Protocol):
+    """トークン数の計算に使うエンコーダー（tiktokenのEncodingと同じメソッド）"""
+
+    def encode_ordinary(self, text: str) -> List[int]: ...
+
+    def decode(self, tokens: List[int]) -> str: ...
+
+
+class LLMClient(Protocol):
+    """要約に使うLLMのクライアント"""
+
+    model: str
+
+    async def complete(self, system: str, prompt: str) -> str: ...
+
+    async def aclose(self) -> None: ...
+
+
+class OpenAIChatClient:
+    """OpenAI互換のChat Completions APIのクライアント"""
+
+    def __init__(
+        self,
+        model: str,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_tokens: int = 512,
+        timeout: float = 60.0,
+    ):
+        from openai import AsyncOpenAI  # 要約を実行するときだけimportする
+        self.model = model
+        self._max_tokens = max_tokens
+        # 空文字の設定は未設定として扱う（環境変数・SDKの既定値を使う）
+        self._client = AsyncOpenAI(api_key=api_key or None, base_url=base_url or None, timeout=timeout)
+
+    async def complete(self, system: str, prompt: str) -> str:
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=self._max_tokens,
+            temperature=0,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    async def aclose(self):
+        await self._client.close()
+
+
+def default_client_factory() -> LLMClient:
+    settings = get_settings()
+    return OpenAIChatClient(
+        model=settings.SUMMARY_MODEL,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_tokens=settings.SUMMARY_MAX_TOKENS,
+        timeout=settings.SUMMARY_TIMEOUT_SECONDS,
+    )
+
+
+def default_tokenizer_factory(model: str) -> Tokenizer:
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # tiktokenが知らないモデル（互換APIのローカルモデルなど）は近い語彙で数える
+        return tiktoken.get_encoding("o200k_base")
+
+
+def cache_key(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def split_text(text: str, tokenizer: Tokenizer, max_tokens: int) -> List[str]:
+    """
+    テキストを行の区切りで、1チャンクがmax_tokens以下になるように分ける。
+    1行でmax_tokensを超える行はトークンの位置で分ける。
+    """
+    chunks: List[str] = []
+    lines: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        tokens = tokenizer.encode_ordinary(line + "\n")
+        if lines and size + len(tokens) > max_tokens:
+            chunks.append("\n".join(lines))
+            lines, size = [], 0
+        if len(tokens) > max_tokens:
+            chunks.extend(
+                tokenizer.decode(tokens[i:i + max_tokens]).strip()
+                for i in range(0, len(tokens), max_tokens)
+            )
+            continue
+        lines.append(line)
+        size += len(tokens)
+    if lines:
+        chunks.append("\n".join(lines))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def pack_texts(texts: List[str], tokenizer: Tokenizer, max_tokens: int) -> List[List[str]]:
+    """
+    テキストを順番に、合計がmax_tokens以下になるようにまとめる。
+    reduceのたびに数が減るよう、1つのまとまりには必ず2つ以上入れる（最後の1つを除く）。
+    """
+    groups: List[List[str]] = []
+    group: List[str] = []
+    size = 0
+    for text in texts:
+        tokens = len(tokenizer.encode_ordinary(text + "\n\n"))
+        if len(group) >= 2 and size + tokens > max_tokens:
+            groups.append(group)
+            group, size = [], 0
+        group.append(text)
+        size += tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+class SummarizationService(BackgroundJobService):
+    """要約ジョブをバックグラウンドで実行し、結果をDBに保存する"""
+
+    name = "summarization"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], LLMClient] = default_client_factory,
+        tokenizer_factory: Callable[[str], Tokenizer] = default_tokenizer_factory,
+        session_factory=SessionLocal,
+        chunk_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        super().__init__(session_factory)
+        settings = get_settings()
+        self._client_factory = client_factory
+        self._tokenizer_factory = tokenizer_factory
+        self._chunk_tokens = chunk_tokens or settings.SUMMARY_CHUNK_TOKENS
+        self._concurrency = concurrency or settings.SUMMARY_CONCURRENCY
+
+    def execute(self, job_id: int, meeting_id: int):
+        with self._session_factory() as db:
+            transcript = crud.get_transcript_text(db, meeting_id)
+        if not transcript:
+            raise ValueError("議事録がありません")
+        # ジョブごとにこのスレッドでイベントループを動かす
+        summary = asyncio.run(self.summarize(transcript, job_id=job_id))
+        with self._session_factory() as db:
+            crud.save_summary(db, job_id=job_id, meeting_id=meeting_id, summary=summary)
+
+    async def summarize(self, transcript: str, job_id: Optional[int] = None) -> str:
+        """議事録を要約する（キャッシュにある呼び出しはAPIを呼ばない）"""
+        client = self._client_factory()
+        try:
+            # 議事録全体の結果がキャッシュにあればチャンクに分けることもしない
+            key = cache_key(client.model, str(self._chunk_tokens), MAP_PROMPT, REDUCE_PROMPT, transcript)
+            summary = self._get_cached(key)
+            if summary is not None:
+                return summary
+
+            tokenizer = self._tokenizer_factory(client.model)
+            semaphore = asyncio.Semaphore(self._concurrency)
+            chunks = split_text(transcript, tokenizer, self._chunk_tokens)
+            done = 0
+
+            async def summarize_chunk(chunk: str) -> str:
+                nonlocal done
+                result = await self._complete(client, semaphore, MAP_PROMPT, chunk)
+                done += 1
+                if job_id is not None:
+                    # 最後のreduceの分を残して進捗を更新する
+                    self._update_job(job_id, progress=done / (len(chunks) + 1))
+                return result
+
+            summaries = list(await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks)))
+            while len(summaries) > 1:
+                groups = pack_texts(summaries, tokenizer, self._chunk_tokens)
+                summaries = list(await asyncio.gather(*(
+                    self._complete(client, semaphore, REDUCE_PROMPT, "\n\n".join(group))
+                    for group in groups
+                )))
+            summary = summaries[0] if summaries else ""
+            self._save_cached(key, summary)
+            return summary
+        finally:
+            await client.aclose()
+
+    async def _complete(self, client: LLMClient, semaphore: asyncio.Semaphore, system: str, prompt: str) -> str:
+        key = cache_key(client.model, system, prompt)
+        result = self._get_cached(key)
+        if result is None:
+            async with semaphore:
+                result = await client.complete(system, prompt)
+            # 途中で失敗しても、再実行では完了済みの呼び出しを繰り返さない
+            self._save_cached(key, result)
+        return result
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        with self._session_factory() as db:
+            return crud.get_cached_summary(db, key)
+
+    def _save_cached(self, key: str, summary: str):
+        with self._session_factory() as db:
+            crud.save_cached_summary(db, key, summary)
+
+
+summarization_service = SummarizationService()
+
+
+# エンドポイントが使う要約サービスの依存関係
+def get_summarization_service() -> SummarizationService:
+    return summarization_service
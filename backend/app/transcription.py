@@ -0,0 +1,134 @@
+# app/transcription.py
+"""
+Whisperによる文字起こしジョブの実行
+
+モデルのロードと推論はワーカープロセス（ProcessPoolExecutor）でのみ行い、
+リクエストハンドラーはジョブを登録してすぐに返す。ジョブの進行は
+専用のスレッドで管理し、結果と状態はjobsテーブルに書き込む。
+
+長時間の録音は無音の位置でチャンクに分割し（app.audio）、チャンクごとに
+ワーカーへ投入する。各ワーカーがデコードするのは自分のチャンクだけなので、
+ワーカーあたりのメモリはチャンクの長さで決まり、処理時間はワーカー数に応じて短くなる。
+"""
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from . import crud
+from .audio import Chunk, Segment, load_audio_range, plan_chunks, scan_audio, stitch_segments
+from .core.config import get_settings
+from .database import SessionLocal
+from .jobs import BackgroundJobService
+
+TRANSCRIPTION_JOB = "transcription"
+
+# ワーカープロセスごとに一度だけロードするモデル
+_model = None
+_language = None
+
+
+def load_model(model_name: str, language: Optional[str] = None):
+    """ワーカープロセスの初期化時にWhisperモデルをロードする"""
+    global _model, _language
+    import whisper  # 重い依存のため、ワーカープロセス内でのみimportする
+    _model = whisper.load_model(model_name, device="cpu")
+    # チャンクごとに言語を推定させると短いチャンクで誤判定するため固定する
+    _language = language or None
+
+
+def plan_file(audio_path: str) -> List[Chunk]:
+    """音声ファイルの分割点を決める（ワーカープロセスで実行する）"""
+    settings = get_settings()
+    return plan_chunks(
+        scan_audio(audio_path),
+        chunk_seconds=settings.TRANSCRIPTION_CHUNK_SECONDS,
+        overlap_seconds=settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+    )
+
+
+def transcribe_chunk(audio_path: str, start: float, end: float) -> List[Segment]:
+    """ワーカープロセスで音声ファイルの一部を文字起こしする"""
+    audio = load_audio_range(audio_path, start, end)
+    result = _model.transcribe(audio, fp16=False, language=_language, condition_on_previous_text=False)
+    return [
+        Segment(start + segment["start"], start + segment["end"], segment["text"].strip())
+        for segment in result["segments"]
+        if segment["text"].strip()
+    ]
+
+
+def default_executor_factory() -> Executor:
+    settings = get_settings()
+    # uvicornやtorchのスレッドを引き継がないよう、forkではなくspawnで起動する
+    return ProcessPoolExecutor(
+        max_workers=settings.TRANSCRIPTION_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=load_model,
+        initargs=(settings.WHISPER_MODEL, settings.WHISPER_LANGUAGE),
+    )
+
+
+class TranscriptionService(BackgroundJobService):
+    """文字起こしジョブをワーカープロセスに投入し、結果をDBに保存する"""
+
+    name = "transcription"
+
+    def __init__(
+        self,
+        executor_factory: Callable[[], Executor] = default_executor_factory,
+        plan: Callable[[str], List[Chunk]] = plan_file,
+        transcribe: Callable[[str, float, float], List[Segment]] = transcribe_chunk,
+        session_factory=SessionLocal,
+    ):
+        super().__init__(session_factory)
+        self._executor_factory = executor_factory
+        self._executor: Optional[Executor] = None
+        self._plan = plan
+        self._transcribe = transcribe
+
+    @property
+    def executor(self) -> Executor:
+        # ワーカープロセスは最初のジョブで起動する（起動時・importのコストにしない）
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            return self._executor
+
+    def execute(self, job_id: int, meeting_id: int, audio_path: str):
+        segments = self._transcribe_chunks(job_id, audio_path)
+        with self._session_factory() as db:
+            crud.save_transcript(db, job_id=job_id, meeting_id=meeting_id, segments=segments)
+
+    def _transcribe_chunks(self, job_id: int, audio_path: str) -> List[Segment]:
+        executor = self.executor
+        chunks = executor.submit(self._plan, audio_path).result()
+        futures = {
+            executor.submit(self._transcribe, audio_path, chunk.start, chunk.end): index
+            for index, chunk in enumerate(chunks)
+        }
+        results: List[List[Segment]] = [[] for _ in chunks]
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                self._update_job(job_id, progress=done / len(chunks))
+        except BaseException:
+            # 1チャンクでも失敗したら残りのチャンクは実行しない
+            for future in futures:
+                future.cancel()
+            raise
+        return stitch_segments(chunks, results)
+
+    def shutdown(self, wait: bool = True):
+        super().shutdown(wait=wait)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+transcription_service = TranscriptionService()
+
+
+# エンドポイントが使う文字起こしサービスの依存関係
+def get_transcription_service() -> TranscriptionService:
+    return transcription_service
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone, timedelta
-from typing import Any, Optional, Dict
+from typing import Any, Iterable, List, Optional, Dict, Tuple
+import base64
 import json
 import re
 
@@ -25,10 +26,11 @@ def to_utc(dt: datetime) -> datetime:
     return dt.astimezone(UTC)
 
 # 時刻検証関数
+TIME_PATTERN = re.compile(r'^([0-1][0-9]|2[0-3]):([0-5][0-9])$')
+
 def validate_time_format(time_str: str) -> bool:
     """HH:MM形式の時刻文字列を検証"""
-    pattern = r'^([0-1][0-9]|2[0-3]):([0-5][0-9])$'
-    if not re.match(pattern, time_str):
+    if not TIME_PATTERN.match(time_str):
         return False
     return True
 
@@ -40,12 +42,13 @@ def validate_time_interval(time_str: str) -> bool:
     except ValueError:
         return False
 
+def _minutes(time_str: str) -> int:
+    hour, minute = time_str.split(':')
+    return int(hour) * 60 + int(minute)
+
 def validate_meeting_duration(start_time: str, end_time: str) -> bool:
-    """会議時間が3時間以内かを検証"""
-    start = datetime.strptime(start_time, TIME_FORMAT)
-    end = datetime.strptime(end_time, TIME_FORMAT)
-    duration = end - start
-    return duration <= timedelta(hours=MAX_MEETING_HOURS)
+    """会議時間が3時間以内かを検証（HH:MM形式の検証後に呼ぶ。strptimeは一括インポートで遅いため使わない）"""
+    return _minutes(end_time) - _minutes(start_time) <= MAX_MEETING_HOURS * 60
 
 # JSON変換用のカスタムエンコーダー
 class CustomJSONEncoder(json.JSONEncoder):
@@ -81,6 +84,56 @@ def deserialize_participants(participants_json: Optional[str]) -> list:
     except json.JSONDecodeError:
         return []
 
+# ページングカーソル
+def encode_cursor(date: datetime, meeting_id: int) -> str:
+    """(date, id)を不透明なカーソル文字列に変換"""
+    raw = json.dumps([date.isoformat(), meeting_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """カーソル文字列を(date, id)に戻す。不正な場合はValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, meeting_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_str), int(meeting_id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+# 議事録テキストとセグメントの変換
+TRANSCRIPT_LINE_PATTERN = re.compile(r"^\[(\d{2,}):(\d{2}):(\d{2})\] ?(.*)$")
+
+def format_timestamp(seconds: float) -> str:
+    """秒数をHH:MM:SS形式に変換"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def format_transcript(segments: Iterable[Tuple[Optional[float], Optional[float], str]]) -> str:
+    """(開始秒, 終了秒, 本文)のセグメントを「[HH:MM:SS] 本文」の行にする（時刻がなければ本文のみ）"""
+    return "\n".join(
+        text if start is None else f"[{format_timestamp(start)}] {text}"
+        for start, _, text in segments
+    )
+
+def parse_transcript(transcript: Optional[str]) -> List[Tuple[Optional[float], Optional[float], str]]:
+    """議事録テキストをセグメントに分割（format_transcriptの逆変換）"""
+    segments = []
+    for line in (transcript or "").split("\n"):
+        match = TRANSCRIPT_LINE_PATTERN.match(line)
+        if match:
+            hours, minutes, seconds, text = match.groups()
+            start = float(int(hours) * 3600 + int(minutes) * 60 + int(seconds))
+            if segments and segments[-1][0] is not None and segments[-1][1] is None:
+                segments[-1][1] = start
+            segments.append([start, None, text])
+        elif segments:
+            # 時刻のない行は直前のセグメントの続き
+            segments[-1][2] += "\n" + line
+        else:
+            segments.append([None, None, line])
+    if segments == [[None, None, ""]]:
+        return []
+    return [tuple(segment) for segment in segments]
+
 # エラーメッセージ生成
 def format_validation_error(message: str) -> Dict[str, Any]:
     """バリデーションエラーメッセージの整形"""
@@ -0,0 +1,93 @@
+# benchmarks/bench_bulk_endpoints.py
+"""
+一括エンドポイントと1件ずつのエンドポイントのスループット
+
+    python -m benchmarks.bench_bulk_endpoints [件数]
+
+N件の会議の作成とN件のタスクの完了（statusの変更）を
+  - 1件ずつ：POST /api/meetings、PUT /api/tasks/{id} をN回
+  - 一括：POST /api/meetings/bulk、PATCH /api/tasks/bulk を1回
+で実行し、経過時間と1秒あたりの件数を表示する（一時ファイルのSQLite、TestClient経由）。
+"""
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import get_session
+from app.main import app
+from app.utils import DATETIME_FORMAT, JST
+from .common import make_engine, make_session
+
+
+def meeting(i: int) -> dict:
+    date = (datetime.now(JST) + timedelta(days=1 + i // 50)).replace(hour=10, minute=0, second=0, microsecond=0)
+    return {
+        "title": f"会議{i}",
+        "date": date.strftime(DATETIME_FORMAT),
+        "start_time": "10:00",
+        "end_time": "11:00",
+        "participants": ["田中", "鈴木"],
+        "transcript": "[00:00:00] 開始します\n[00:30:00] 以上です",
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(count: int = 300):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = make_engine()
+    db = make_session(engine)
+
+    def override_get_session():
+        try:
+            yield db
+        finally:
+            db.expunge_all()
+
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        with TestClient(app) as client:
+            def create_one_by_one():
+                for i in range(count):
+                    assert client.post("/api/meetings", json=meeting(i)).status_code == 200
+
+            def create_bulk():
+                result = client.post("/api/meetings/bulk", json=[meeting(i) for i in range(count)]).json()
+                assert len(result["created"]) == count, result["errors"][:3]
+
+            meeting_id = client.post("/api/meetings", json=meeting(0)).json()["id"]
+            task = {"content": "資料を作成する", "assignee": "田中", "status": "pending"}
+            tasks = client.patch(
+                "/api/tasks/bulk", json=[{"op": "create", "meeting_id": meeting_id, **task}] * count
+            ).json()["created"]
+
+            def update_one_by_one():
+                for t in tasks:
+                    assert client.put(f"/api/tasks/{t['id']}", json={**task, "status": "completed"}).status_code == 200
+
+            def update_bulk():
+                result = client.patch("/api/tasks/bulk", json=[{"id": t["id"], "status": "completed"} for t in tasks])
+                assert len(result.json()["updated"]) == count
+
+            print(f"rows={count}")
+            for label, fn in (
+                ("POST /api/meetings x N", create_one_by_one),
+                ("POST /api/meetings/bulk", create_bulk),
+                ("PUT /api/tasks/{id} x N", update_one_by_one),
+                ("PATCH /api/tasks/bulk", update_bulk),
+            ):
+                seconds = timed(fn)
+                print(f"{label:<26} {seconds * 1000:10.1f} ms  {count / seconds:10.0f} rows/s")
+    finally:
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
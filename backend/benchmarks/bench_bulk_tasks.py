@@ -0,0 +1,63 @@
+# benchmarks/bench_bulk_tasks.py
+"""
+抽出したタスクの一括登録
+
+    python -m benchmarks.bench_bulk_tasks [タスク数]
+
+1つの会議にN件のタスクを
+  - 1件ずつ：crud.create_task（タスクごとにバリデーション・コミット・refresh）
+  - 一括：crud.save_extracted_tasks（1回のINSERT ... RETURNINGと1回のコミット）
+で登録し、経過時間（中央値）とINSERT文・コミットの回数を表示する
+（どちらも後片付けのDELETEとコミットを含む）。
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event
+
+from app import crud, models
+from app.extraction import ActionItem
+from .common import make_engine, make_session, measure, seed_meetings
+
+
+def main(count: int = 500):
+    engine = make_engine()
+    seed_meetings(engine, 1)
+    db = make_session(engine)
+    due = datetime.now(timezone.utc) + timedelta(days=7)
+    items = [ActionItem(f"作業{i}を行う", "田中", due) for i in range(count)]
+    counts = {"insert": 0, "commit": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks"):
+            counts["insert"] += 1
+
+    @event.listens_for(engine, "commit")
+    def count_commits(conn):
+        counts["commit"] += 1
+
+    def one_by_one():
+        for item in items:
+            crud.create_task(db, {"meeting_id": 1, **item._asdict()})
+
+    def bulk():
+        job = crud.create_job(db, meeting_id=1, kind="task_extraction")
+        crud.save_extracted_tasks(db, job_id=job["id"], meeting_id=1, items=items)
+
+    print(f"tasks={count}")
+    for label, fn in (("create_task x N", one_by_one), ("save_extracted_tasks", bulk)):
+        def run():
+            fn()
+            db.execute(delete(models.Task))
+            db.commit()
+            db.expunge_all()
+
+        run()  # ウォームアップ
+        counts.update(insert=0, commit=0)
+        ms = measure(run, repeat=5)
+        print(f"{label:<24} {ms:9.2f} ms  inserts/run={counts['insert'] // 5:<5} commits/run={counts['commit'] // 5}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
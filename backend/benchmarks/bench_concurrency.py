@@ -0,0 +1,89 @@
+# benchmarks/bench_concurrency.py
+"""
+同期モードと非同期モードの同時実行性能の比較（負荷テスト）
+
+    python -m benchmarks.bench_concurrency [同時リクエスト数]
+
+GET /api/meetings/{id} を同時に投げ、スループットとスレッドプールの
+最大使用数を表示する。同期モードはスレッドプール上限（既定40）で頭打ちになり、
+非同期モードはスレッドを使わない。
+"""
+import asyncio
+import logging
+import sys
+import time
+
+import anyio
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_session, to_async_url
+from app.main import app
+from .common import make_engine, seed_meetings
+
+
+async def _run(concurrency: int, rounds: int = 5):
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    peak = 0
+    done = asyncio.Event()
+
+    async def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, limiter.borrowed_tokens)
+            await asyncio.sleep(0.001)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sampler = asyncio.create_task(sample())
+        start = time.perf_counter()
+        for _ in range(rounds):
+            responses = await asyncio.gather(
+                *[client.get(f"/api/meetings/{i % 100 + 1}") for i in range(concurrency)]
+            )
+            assert all(r.status_code == 200 for r in responses), {r.status_code: r.text for r in responses}
+        elapsed = time.perf_counter() - start
+        done.set()
+        await sampler
+    return concurrency * rounds / elapsed, peak
+
+
+async def _main(concurrency: int):
+    engine = make_engine()
+    seed_meetings(engine, 100, tasks_per_meeting=3)
+    SyncSession = sessionmaker(autoflush=False, bind=engine)
+
+    def sync_session():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async_engine = create_async_engine(to_async_url(str(engine.url)), pool_size=50)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def async_session():
+        async with AsyncSession() as db:
+            yield db
+
+    print(f"concurrency={concurrency}")
+    print(f"{'mode':>6} {'req/s':>10} {'peak threads':>13}")
+    try:
+        for mode, dependency in [("sync", sync_session), ("async", async_session)]:
+            app.dependency_overrides[get_session] = dependency
+            rps, peak = await _run(concurrency)
+            print(f"{mode:>6} {rps:>10.0f} {peak:>13}")
+    finally:
+        app.dependency_overrides.clear()
+        await async_engine.dispose()
+
+
+def main(concurrency: int = 500):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(_main(concurrency))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
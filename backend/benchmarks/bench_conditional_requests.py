@@ -0,0 +1,86 @@
+# benchmarks/bench_conditional_requests.py
+"""
+ポーリングでのETag（If-None-Match）による転送量とレイテンシの削減
+
+    python -m benchmarks.bench_conditional_requests [ポーリング回数]
+
+3時間分の議事録・長い要約・20件のタスクを持つ会議の GET /api/meetings/{id} を、
+10回に1回タスクを更新しながらポーリングし、
+  - 毎回全体を取得する
+  - 前回のETagをIf-None-Matchで送る（変更がなければ304）
+の転送量（本文の合計）とレイテンシ（中央値）を、レスポンスキャッシュのあり・なしで比較する。
+キャッシュなしの304は、インデックスだけを読むクエリ（crud.get_meeting_version）で返す。
+"""
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import models
+from app.cache import LRUCache, response_cache
+from app.database import get_session
+from app.main import app
+from app.utils import format_transcript
+from .common import make_engine, make_session, seed_meetings
+
+
+def main(polls: int = 200):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transcript = format_transcript(
+        (float(start), float(start + 10), f"{start}秒からの発言です。" * 4) for start in range(0, 3 * 3600, 10)
+    )
+    engine = make_engine()
+    seed_meetings(engine, 1, tasks_per_meeting=20, transcript=transcript, summary="要約の本文。" * 2000)
+    # seed_meetingsの更新日時は未来の日時なので、更新で版が変わるよう過去にする
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    with engine.begin() as conn:
+        for model in (models.Meeting, models.Task):
+            conn.execute(update(model.__table__).values(updated_at=past))
+    db = make_session(engine)
+
+    def override_get_session():
+        try:
+            yield db
+        finally:
+            db.expunge_all()
+
+    app.dependency_overrides[get_session] = override_get_session
+    backend = response_cache.backend
+    try:
+        with TestClient(app) as client:
+            task_id = client.get("/api/meetings/1/tasks/").json()[0]["id"]
+            print(f"polls={polls} (10回に1回タスクを更新)")
+            for cache_label, cache_backend in (("no cache", None), ("cache", LRUCache(1024))):
+                response_cache.backend = cache_backend
+                for conditional in (False, True):
+                    etag = None
+                    received = 0
+                    not_modified = 0
+                    samples = []
+                    for i in range(polls):
+                        if i % 10 == 0:
+                            status = "completed" if i % 20 else "pending"
+                            client.patch(f"/api/tasks/{task_id}", json={"status": status})
+                        headers = {"If-None-Match": etag} if conditional and etag else {}
+                        start = time.perf_counter()
+                        response = client.get("/api/meetings/1", headers=headers)
+                        samples.append((time.perf_counter() - start) * 1000)
+                        received += len(response.content)
+                        not_modified += response.status_code == 304
+                        etag = response.headers.get("etag")
+                    label = f"{cache_label}, {'If-None-Match' if conditional else 'full GET'}"
+                    print(
+                        f"{label:<28} {statistics.median(samples):8.2f} ms  "
+                        f"{received / 1024 / 1024:8.2f} MB total  304={not_modified}"
+                    )
+    finally:
+        response_cache.backend = backend
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
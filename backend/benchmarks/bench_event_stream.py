@@ -0,0 +1,142 @@
+# benchmarks/bench_event_stream.py
+"""
+変更イベント（GET /api/meetings/{id}/events）の同時接続の負荷テスト
+
+    python -m benchmarks.bench_event_stream [接続数]
+
+1つのイベントループで指定した数のSSE接続をASGIアプリに直接張り（httpxのASGITransportは
+レスポンスを最後まで溜めるため使わない）、
+  - 待機中の接続1つあたりのメモリ（tracemalloc）とデータベースの使用中の接続数
+  - スレッドプールで実行したタスクの更新（crud.patch_task）から各接続にイベントが届くまでの時間
+を表示する。配信はイベントループごとに1回のcall_soon_threadsafeでまとめて行う。
+"""
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, schemas
+from app.database import get_session
+from app.events import event_broker
+from app.main import app
+from .common import make_engine, seed_meetings
+
+
+class Connection:
+    """1つのSSE接続（受信したイベントの時刻を記録する）"""
+
+    def __init__(self):
+        self.disconnected = asyncio.Event()
+        self.status = None
+        self.received = []  # (時刻, 本文)
+        self.waiter = None
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message.get("body"):
+            self.received.append((time.perf_counter(), message["body"]))
+            if self.waiter is not None and b"event: task.updated" in message["body"]:
+                self.waiter.set_result(None)
+                self.waiter = None
+
+    async def run(self, meeting_id: int):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/meetings/{meeting_id}/events",
+            "raw_path": f"/api/meetings/{meeting_id}/events".encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"bench"), (b"accept", b"text/event-stream")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        await app(scope, self.receive, self.send)
+
+
+async def _wait_for_subscribers(count: int):
+    while event_broker.snapshot()["subscribers"] != count:
+        await asyncio.sleep(0.01)
+
+
+async def _main(connections: int, updates: int):
+    engine = make_engine()
+    seed_meetings(engine, 1, tasks_per_meeting=1)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+    def session():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_session] = session
+    loop = asyncio.get_running_loop()
+    try:
+        with SessionLocal() as db:
+            task_id = crud.get_tasks_by_meeting(db, 1)[0].id
+
+        # 初回のリクエストでのミドルウェアの構築などを計測に含めない
+        warmup = Connection()
+        warmup_run = asyncio.ensure_future(warmup.run(1))
+        await _wait_for_subscribers(1)
+        warmup.disconnected.set()
+        await warmup_run
+        await _wait_for_subscribers(0)
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        clients = [Connection() for _ in range(connections)]
+        runs = [asyncio.ensure_future(client.run(1)) for client in clients]
+        await _wait_for_subscribers(connections)
+        idle = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        assert all(client.status == 200 for client in clients)
+        print(f"connections={connections}")
+        print(f"memory per idle connection   {idle / connections / 1024:8.2f} KB")
+        print(f"database connections in use  {engine.pool.checkedout():8d}")
+
+        latencies = []
+        for i in range(updates):
+            waiters = []
+            for client in clients:
+                client.waiter = loop.create_future()
+                waiters.append(client.waiter)
+            status = "completed" if i % 2 == 0 else "pending"
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                await loop.run_in_executor(None, crud.patch_task, db, task_id, schemas.TaskUpdate(status=status))
+            await asyncio.gather(*waiters)
+            arrivals = [client.received[-1][0] - start for client in clients]
+            latencies.append((statistics.median(arrivals) * 1000, max(arrivals) * 1000))
+        print(f"fan-out latency (median)     {statistics.median(l[0] for l in latencies):8.2f} ms")
+        print(f"fan-out latency (last)       {statistics.median(l[1] for l in latencies):8.2f} ms")
+        print(f"events delivered             {sum(len(c.received) for c in clients) - connections:8d}")
+
+        for client in clients:
+            client.disconnected.set()
+        await asyncio.gather(*runs)
+        await _wait_for_subscribers(0)
+        print(f"metrics                      {event_broker.snapshot()}")
+    finally:
+        app.dependency_overrides.clear()
+
+
+def main(connections: int = 1000, updates: int = 20):
+    asyncio.run(_main(connections, updates))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
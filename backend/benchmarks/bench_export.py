@@ -0,0 +1,57 @@
+# benchmarks/bench_export.py
+"""
+エクスポート（app.export）のスループットとメモリ使用量（RSS）
+
+    python -m benchmarks.bench_export [会議の件数]
+
+指定した件数（既定100万件）の会議を投入し、NDJSON・CSV・gzip圧縮したNDJSONで
+すべてを書き出す間のRSSの増加（開始時との差の最大値）と行/秒を表示する。
+比較として、一覧のAPIと同じく会議の辞書のリストを作る方法（crud.get_meetings）で
+10万件を読み込んだときのRSSの増加も表示する。
+"""
+import os
+import sys
+import time
+
+from app import crud
+from app.export import export_rows
+from .common import make_engine, make_session, seed_meetings
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+
+
+def main(count: int = 1_000_000):
+    engine = make_engine()
+    seed_meetings(engine, count)
+    print(f"meetings={count}")
+    for label, fmt, compress in (("ndjson", "ndjson", False), ("csv", "csv", False), ("ndjson+gzip", "ndjson", True)):
+        start_rss = peak_rss = rss_mb()
+        written = 0
+        start = time.perf_counter()
+        for chunk in export_rows(engine, "meetings", fmt, batch_size=1000, compress=compress):
+            written += len(chunk)
+            peak_rss = max(peak_rss, rss_mb())
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<12} {count / elapsed:10.0f} rows/s  {written / 1024 / 1024:8.1f} MB written  "
+            f"RSS +{peak_rss - start_rss:6.1f} MB"
+        )
+
+    rows = min(count, 100_000)
+    start_rss = rss_mb()
+    db = make_session(engine)
+    start = time.perf_counter()
+    meetings = crud.get_meetings(db, skip=0, limit=rows)
+    elapsed = time.perf_counter() - start
+    print(f"{'list dicts':<12} {rows / elapsed:10.0f} rows/s  ({rows} rows)          RSS +{rss_mb() - start_rss:6.1f} MB")
+    del meetings
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,92 @@
+# benchmarks/bench_import.py
+"""
+会議のインポートのスループット（行/秒）
+
+    python -m benchmarks.bench_import [行数]
+
+参加者2名・タスク2件の会議のNDJSONを、
+  - 1件ずつ作成（POST /api/meetings と同じ MeetingCreate の検証と1件ごとのコミット）
+  - 一括作成（POST /api/meetings/bulk と同じ crud.create_meetings_bulk を1000件ずつ。タスクは含まない）
+  - インポート（app.importer.import_lines。1000行ずつ検証して1つのトランザクションで登録）
+で登録したときの行/秒と、検証だけの行/秒（MeetingCreate と importer.validate_meeting）を表示する。
+1件ずつの作成は時間がかかるため、行数の1/20（最大2000行）で計測する。
+"""
+import io
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+from app import crud, models, schemas
+from app.importer import import_lines, validate_meeting
+from .common import make_engine, make_session
+
+
+def make_items(count: int):
+    # 1件ずつの作成・一括作成の検証で弾かれないよう未来の日付にする
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    return [
+        {
+            "title": f"会議{i}",
+            "date": (base + timedelta(minutes=10 * i)).isoformat(),
+            "start_time": "10:00",
+            "end_time": "11:00",
+            "participants": ["田中", "鈴木"],
+            "summary": "予算と日程を確認した。",
+            "tasks": [
+                {"content": "見積もりを作成する", "assignee": "田中", "status": "pending"},
+                {"content": "日程を調整する", "assignee": "鈴木", "status": "in_progress"},
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def rate(label: str, rows: int, elapsed: float):
+    print(f"{label:<28} {rows / elapsed:10.0f} rows/s  ({rows} rows, {elapsed:.2f} s)")
+
+
+def main(count: int = 100_000):
+    items = make_items(count)
+    body = b"".join(orjson.dumps(item) + b"\n" for item in items)
+    print(f"rows={count}  ndjson={len(body) / 1024 / 1024:.1f} MB")
+
+    sample = items[:min(count, 10_000)]
+    start = time.perf_counter()
+    for item in sample:
+        schemas.MeetingCreate.model_validate(item)
+        [schemas.TaskCreate.model_validate(task) for task in item["tasks"]]
+    rate("validate (pydantic models)", len(sample), time.perf_counter() - start)
+    start = time.perf_counter()
+    for item in sample:
+        validate_meeting(item)
+    rate("validate (importer)", len(sample), time.perf_counter() - start)
+
+    single = items[:min(count // 20, 2000)]
+    db = make_session(make_engine())
+    start = time.perf_counter()
+    for item in single:
+        meeting = crud.create_meeting(db, schemas.MeetingCreate.model_validate(item))
+        for task in item["tasks"]:
+            crud.create_task(db, {**task, "meeting_id": meeting["id"]})
+    rate("one POST per meeting", len(single), time.perf_counter() - start)
+    db.close()
+
+    db = make_session(make_engine())
+    start = time.perf_counter()
+    for offset in range(0, count, 1000):
+        crud.create_meetings_bulk(db, items[offset:offset + 1000])
+    rate("bulk create (no tasks)", count, time.perf_counter() - start)
+    db.close()
+
+    db = make_session(make_engine())
+    start = time.perf_counter()
+    result = import_lines(db, io.BytesIO(body), chunk_size=1000)
+    rate("import", result["imported"], time.perf_counter() - start)
+    assert result["failed"] == 0 and db.query(models.Task).count() == 2 * count
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
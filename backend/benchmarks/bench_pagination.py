@@ -0,0 +1,45 @@
+# benchmarks/bench_pagination.py
+"""
+OFFSET方式とカーソル方式のページング性能比較
+
+    python -m benchmarks.bench_pagination [会議数]
+
+同じ深さのページを両方式で取得し、レイテンシの中央値を表示する。
+"""
+import sys
+
+from app import crud
+from app.utils import encode_cursor
+from app.models import Meeting
+from .common import make_engine, make_session, measure, seed_meetings
+
+PAGE_SIZE = 100
+
+
+def main(total: int = 200_000):
+    engine = make_engine()
+    seed_meetings(engine, total)
+    db = make_session(engine)
+
+    print(f"meetings={total} page_size={PAGE_SIZE}")
+    print(f"{'depth':>10} {'offset(ms)':>12} {'cursor(ms)':>12}")
+    for depth in [0, total // 10, total // 2, total - PAGE_SIZE]:
+        # 直前のページ末尾の行からカーソルを作る
+        cursor = None
+        if depth:
+            last = (
+                db.query(Meeting)
+                .order_by(Meeting.date, Meeting.id)
+                .offset(depth - 1)
+                .first()
+            )
+            cursor = encode_cursor(last.date, last.id)
+
+        offset_ms = measure(lambda: crud.get_meetings(db, skip=depth, limit=PAGE_SIZE))
+        cursor_ms = measure(lambda: crud.get_meetings_after(db, cursor=cursor, limit=PAGE_SIZE))
+        db.expunge_all()
+        print(f"{depth:>10} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,71 @@
+# benchmarks/bench_participants_decode.py
+"""
+参加者リストのデコード処理のマイクロベンチマーク（1万行）
+
+    python -m benchmarks.bench_participants_decode [行数]
+
+以前の読み込み経路（loadイベントでリストに変換した値を participants_list が
+もう一度 loads し、例外を握りつぶして [] を返す）と、現在の一度だけデコードして
+インスタンスにキャッシュする経路を比較する。
+"""
+import sys
+import time
+from json import loads
+
+from app import crud
+from app.models import Meeting
+from .common import make_engine, make_session, seed_meetings
+
+
+def legacy_path(meetings):
+    """以前の処理：load時のデコード＋participants_listでの二重デコード（例外発生）"""
+    exceptions = 0
+    for meeting in meetings:
+        participants = loads(meeting.participants)  # loadイベント
+        try:
+            loads(participants)  # participants_list（リストをloadsしてTypeError）
+        except Exception:
+            exceptions += 1
+    return exceptions
+
+
+def current_path(meetings):
+    """現在の処理：一度だけデコードし、以降はキャッシュを返す"""
+    for meeting in meetings:
+        meeting.participants_list
+
+
+def main(rows: int = 10_000):
+    engine = make_engine()
+    seed_meetings(engine, rows)
+    db = make_session(engine)
+
+    meetings = db.query(Meeting).all()
+
+    start = time.perf_counter()
+    exceptions = legacy_path(meetings)
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    current_path(meetings)
+    current_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    current_path(meetings)
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    db.expunge_all()
+    start = time.perf_counter()
+    result = crud.get_meetings(db, skip=0, limit=rows)
+    list_ms = (time.perf_counter() - start) * 1000
+    empty = sum(1 for m in result if not m["participants"])
+
+    print(f"rows={rows}")
+    print(f"legacy decode path   {legacy_ms:8.2f} ms  exceptions={exceptions}")
+    print(f"decode-once path     {current_ms:8.2f} ms  exceptions=0")
+    print(f"  cached re-access   {cached_ms:8.2f} ms")
+    print(f"crud.get_meetings    {list_ms:8.2f} ms  empty participant lists={empty}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,70 @@
+# benchmarks/bench_query_plans.py
+"""
+主要クエリの実行計画とインデックスの効果
+
+    python -m benchmarks.bench_query_plans [会議数]
+
+各クエリの EXPLAIN QUERY PLAN と、インデックスあり／なしのレイテンシを表示する。
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from .common import make_engine, measure, seed_meetings
+
+# (名前, SQL, パラメータ)
+QUERIES = [
+    ("tasks by meeting", "SELECT * FROM tasks WHERE meeting_id = :meeting_id", {"meeting_id": 4242}),
+    ("tasks by assignee/status",
+     "SELECT id FROM tasks WHERE assignee = :assignee AND status = :status LIMIT 100",
+     {"assignee": "鈴木", "status": "in_progress"}),
+    ("tasks due soon",
+     "SELECT id FROM tasks WHERE due_date < :due ORDER BY due_date LIMIT 100",
+     {"due": datetime.now(timezone.utc) + timedelta(days=1)}),
+    ("meetings by date range",
+     "SELECT id FROM meetings WHERE date BETWEEN :start AND :end ORDER BY date",
+     {"start": datetime.now(timezone.utc) + timedelta(days=30),
+      "end": datetime.now(timezone.utc) + timedelta(days=31)}),
+]
+
+INDEXES = ["ix_tasks_meeting_id", "ix_tasks_assignee_status", "ix_tasks_due_date", "ix_meetings_date_id"]
+
+
+def main(total: int = 100_000):
+    engine = make_engine()
+    seed_meetings(engine, total, tasks_per_meeting=3)
+    with engine.begin() as conn:
+        # 一部のタスクに担当者・期限を散らす
+        conn.execute(text(
+            "UPDATE tasks SET assignee = '鈴木', status = 'in_progress', "
+            "due_date = datetime('now', '+' || (id % 90) || ' days') WHERE id % 50 = 0"
+        ))
+        conn.execute(text("ANALYZE"))
+
+    def run_all(conn, label):
+        results = []
+        for name, sql, params in QUERIES:
+            # 同じSQL文だとsqlite3のステートメントキャッシュから古い計画が返るためラベルを付ける
+            explain = text(f"EXPLAIN QUERY PLAN {sql} -- {label}")
+            plan = [row[3] for row in conn.execute(explain, params)]
+            ms = measure(lambda: conn.execute(text(sql), params).all())
+            results.append((name, plan, ms))
+        return results
+
+    with engine.connect() as conn:
+        indexed = run_all(conn, "indexed")
+        for index in INDEXES:
+            conn.execute(text(f"DROP INDEX {index}"))
+        unindexed = run_all(conn, "unindexed")
+        conn.rollback()
+
+    print(f"meetings={total} tasks={total * 3}")
+    for (name, plan, ms), (_, plan_without, ms_without) in zip(indexed, unindexed):
+        print(f"\n{name}")
+        print(f"  indexed   {ms:8.2f} ms  {' / '.join(plan)}")
+        print(f"  unindexed {ms_without:8.2f} ms  {' / '.join(plan_without)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
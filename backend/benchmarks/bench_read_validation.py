@@ -0,0 +1,60 @@
+# benchmarks/bench_read_validation.py
+"""
+GET系のレスポンスで1行あたりにかかる検証コストのプロファイル
+
+    python -m benchmarks.bench_read_validation [行数]
+
+以前のレスポンスモデル（MeetingBaseを継承し、日付・参加者・時刻の
+バリデーターを再実行する）と、バリデーターを持たない現在のレスポンスモデル、
+検証を行わない model_construct を1行あたりのマイクロ秒で比較する。
+"""
+import sys
+from datetime import datetime
+from typing import List
+
+from pydantic import ConfigDict
+
+from app import crud, schemas
+from .common import make_engine, make_session, measure, seed_meetings
+
+
+# 変更前のレスポンスモデルを再現したもの
+class LegacyTask(schemas.TaskBase):
+    id: int
+    meeting_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class LegacyMeeting(schemas.MeetingBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    tasks: List[LegacyTask] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+def main(rows: int = 1000):
+    engine = make_engine()
+    seed_meetings(engine, rows, tasks_per_meeting=3)
+    db = make_session(engine)
+    meetings = crud.get_meetings(db, skip=0, limit=rows)
+
+    def construct(data):
+        tasks = [schemas.Task.model_construct(**task) for task in data["tasks"]]
+        return schemas.Meeting.model_construct(**{**data, "tasks": tasks})
+
+    results = [
+        ("legacy (input validators)", lambda: [LegacyMeeting.model_validate(m) for m in meetings]),
+        ("read model (no validators)", lambda: [schemas.Meeting.model_validate(m) for m in meetings]),
+        ("model_construct", lambda: [construct(m) for m in meetings]),
+    ]
+    print(f"rows={rows} (tasks per meeting=3)")
+    for name, fn in results:
+        ms = measure(fn, repeat=10)
+        print(f"{name:<28} {ms * 1000 / rows:8.1f} us/row")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,60 @@
+# benchmarks/bench_response_cache.py
+"""
+ポーリングされる会議の詳細・タスク一覧のレスポンスキャッシュ
+
+    python -m benchmarks.bench_response_cache [議事録の時間（分）]
+
+長い議事録とタスクを持つ会議の GET /api/meetings/{id} と GET /api/meetings/{id}/tasks/ を
+  - キャッシュなし（毎回データベースから読んでエンコードする）
+  - キャッシュあり（2回目以降はキャッシュのバイト列を返す）
+で繰り返し取得し、レイテンシ（中央値）と1リクエストあたりのSQL文の数を表示する。
+"""
+import logging
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cache import LRUCache, response_cache
+from app.database import get_session
+from app.main import app
+from app.utils import format_transcript
+from .common import make_engine, make_session, measure, seed_meetings
+
+
+def main(minutes: int = 60):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transcript = format_transcript(
+        (float(start), float(start + 10), f"{start}秒からの発言です。" * 4) for start in range(0, minutes * 60, 10)
+    )
+    engine = make_engine()
+    seed_meetings(engine, 1, tasks_per_meeting=20, transcript=transcript, summary="要約の本文。" * 100)
+    db = make_session(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def override_get_session():
+        try:
+            yield db
+        finally:
+            db.expunge_all()
+
+    app.dependency_overrides[get_session] = override_get_session
+    backend = response_cache.backend
+    try:
+        with TestClient(app) as client:
+            print(f"transcript={minutes}min")
+            for label, cache_backend in (("no cache", None), ("cache", LRUCache(1024))):
+                response_cache.backend = cache_backend
+                for url in ("/api/meetings/1", "/api/meetings/1/tasks/"):
+                    client.get(url)
+                    statements.clear()
+                    ms = measure(lambda: client.get(url), repeat=50)
+                    print(f"{label:<10} {url:<24} {ms:9.3f} ms  queries/request={len(statements) / 50:.1f}")
+    finally:
+        response_cache.backend = backend
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,85 @@
+# benchmarks/bench_search.py
+"""
+全文検索（FTS5・バイグラム）のレイテンシ
+
+    python -m benchmarks.bench_search [会議数]
+
+会議ごとに語彙からランダムに作った議事録（約20セグメント・800文字）を投入し、
+索引の構築時間と、頻出語・まれな語・複数語での検索（20件・関連度順）の
+レイテンシを、議事録をLIKEで走査する場合と比較する。
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import insert, text
+
+from app import models
+from app.search import build_query, rebuild_search_index, search_meetings
+from .common import make_engine, make_session, measure, seed_meetings
+
+VOCABULARY = [
+    "予算", "売上", "広告費", "採用", "面談", "見積もり", "請求書", "契約", "納期", "品質",
+    "顧客", "要望", "開発", "リリース", "テスト", "障害", "対応", "報告", "確認", "検討",
+    "スケジュール", "資料", "共有", "来週", "今月", "課題", "改善", "提案", "承認", "調整",
+]
+RARE_WORD = "セキュリティ監査"
+SEGMENTS_PER_MEETING = 20
+
+
+def make_sentence(rng: random.Random) -> str:
+    words = rng.sample(VOCABULARY, 6)
+    return f"{words[0]}の{words[1]}について{words[2]}と{words[3]}を{words[4]}し、{words[5]}します。"
+
+
+def main(total: int = 100_000):
+    rng = random.Random(0)
+    engine = make_engine()
+    seed_meetings(engine, total, tasks_per_meeting=1)
+    with engine.begin() as conn:
+        for start in range(0, total, 5000):
+            rows = []
+            for meeting_id in range(start + 1, min(start + 5000, total) + 1):
+                for position in range(SEGMENTS_PER_MEETING):
+                    sentence = make_sentence(rng)
+                    if meeting_id % 1000 == 0 and position == 0:
+                        sentence = f"{RARE_WORD}の結果を共有します。"
+                    rows.append({
+                        "meeting_id": meeting_id,
+                        "position": position,
+                        "start_seconds": position * 10.0,
+                        "end_seconds": position * 10.0 + 10.0,
+                        "text": sentence,
+                    })
+            conn.execute(insert(models.TranscriptSegment.__table__), rows)
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    print(f"meetings={total} segments={total * SEGMENTS_PER_MEETING} "
+          f"index build {time.perf_counter() - start:.1f} s")
+
+    db = make_session(engine)
+    print(f"{'query':<22} {'hits':>8} {'fts (ms)':>10} {'LIKE (ms)':>10}")
+    for q in ("広告費", RARE_WORD, "予算 請求書", "納期 品質 障害"):
+        hits = db.execute(
+            text("SELECT count(*) FROM meeting_search WHERE meeting_search MATCH :query"),
+            {"query": build_query(q, "sqlite")},
+        ).scalar()
+        fts_ms = measure(lambda: search_meetings(db, q, limit=20), repeat=5)
+
+        # 索引なし：議事録のセグメントを走査して一致する会議を20件探す
+        conditions = " AND ".join(
+            f"EXISTS (SELECT 1 FROM transcript_segments s WHERE s.meeting_id = m.id AND s.text LIKE :w{i})"
+            for i in range(len(q.split()))
+        )
+        params = {f"w{i}": f"%{word}%" for i, word in enumerate(q.split())}
+        like_ms = measure(
+            lambda: db.execute(text(f"SELECT m.id FROM meetings m WHERE {conditions} LIMIT 20"), params).all(),
+            repeat=3,
+        )
+        print(f"{q:<22} {hits:>8} {fts_ms:>10.2f} {like_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
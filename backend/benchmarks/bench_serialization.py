@@ -0,0 +1,66 @@
+# benchmarks/bench_serialization.py
+"""
+会議一覧レスポンスのシリアライズ性能（変更前後の比較）
+
+    python -m benchmarks.bench_serialization [1ページの件数]
+
+変更前：response_modelでの再検証（全field_validator）→ jsonable_encoder → 標準json
+変更後：crudの辞書をorjsonで直接エンコード（JSTJSONResponse）
+あわせて GET /api/meetings/ のエンドツーエンドのスループットを表示する。
+"""
+import json
+import logging
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import crud, schemas
+from app.database import get_session
+from app.main import app
+from app.responses import JSTJSONResponse
+from .common import make_engine, make_session, measure, seed_meetings
+
+
+def main(page_size: int = 100):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = make_engine()
+    seed_meetings(engine, page_size, tasks_per_meeting=3, transcript="議事録の本文。" * 200)
+    db = make_session(engine)
+    meetings = crud.get_meetings(db, skip=0, limit=page_size)
+    adapter = TypeAdapter(list[schemas.Meeting])
+
+    def before():
+        validated = adapter.validate_python(meetings)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode()
+
+    def after():
+        return JSTJSONResponse(meetings).body
+
+    before_ms = measure(before)
+    after_ms = measure(after)
+
+    def override_get_session():
+        yield db
+
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        with TestClient(app) as client:
+            requests = 50
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get("/api/meetings/", params={"limit": page_size})
+            rps = requests / (time.perf_counter() - start)
+    finally:
+        app.dependency_overrides.clear()
+
+    print(f"page_size={page_size}")
+    print(f"serialize before (validate + stdlib json) {before_ms:8.2f} ms")
+    print(f"serialize after  (orjson, no validation)  {after_ms:8.2f} ms")
+    print(f"GET /api/meetings/ throughput             {rps:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,63 @@
+# benchmarks/bench_sparse_fields.py
+"""
+fields指定（列の射影）による一覧・詳細レスポンスの削減
+
+    python -m benchmarks.bench_sparse_fields [1ページの件数]
+
+長い議事録（約140KB）と要約を持つ会議を作成し、GET /api/meetings/ と
+GET /api/meetings/{id} のレスポンスサイズとレイテンシ（中央値）を
+  - 議事録込みの全項目（include_transcript=true、以前の一覧と同じ内容）
+  - デフォルト（議事録なし）
+  - ダッシュボード用の fields=id,title,date,start_time,end_time
+で比較する。
+"""
+import logging
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.database import get_session
+from app.main import app
+from app.utils import format_transcript
+from .common import make_engine, make_session, measure, seed_meetings
+
+DASHBOARD_FIELDS = "id,title,date,start_time,end_time"
+
+
+def main(page_size: int = 100):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transcript = format_transcript(
+        (float(start), float(start + 10), f"{start}秒からの発言です。" * 4) for start in range(0, 3 * 3600, 10)
+    )
+    engine = make_engine()
+    seed_meetings(engine, page_size, tasks_per_meeting=3, transcript=transcript, summary="要約の本文。" * 300)
+    db = make_session(engine)
+
+    def override_get_session():
+        try:
+            yield db
+        finally:
+            db.expunge_all()
+
+    cases = [
+        ("list full (include_transcript)", "/api/meetings/", {"limit": page_size, "include_transcript": True}),
+        ("list default", "/api/meetings/", {"limit": page_size}),
+        ("list fields=dashboard", "/api/meetings/", {"limit": page_size, "fields": DASHBOARD_FIELDS}),
+        ("detail full", "/api/meetings/1", {}),
+        ("detail fields=dashboard", "/api/meetings/1", {"fields": DASHBOARD_FIELDS}),
+    ]
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        with TestClient(app) as client:
+            print(f"page_size={page_size}")
+            for label, url, params in cases:
+                size = len(client.get(url, params=params).content)
+                repeat = 3 if params.get("include_transcript") else 20
+                ms = measure(lambda: client.get(url, params=params), repeat=repeat)
+                print(f"{label:<32} {ms:9.2f} ms  {size / 1024:10.1f} KB")
+    finally:
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,63 @@
+# benchmarks/bench_task_reindex.py
+"""
+タスクの作成・内容の更新のレイテンシと、会議の議事録の長さの関係（検索の索引の同期を含む）
+
+    python -m benchmarks.bench_task_reindex [議事録のセグメント数]
+
+議事録のない会議と、長い議事録（既定は10秒ごと3時間分の1080セグメント・約18万文字）の会議に対して、
+crud.create_task と crud.patch_task（内容の更新）の中央値を比較する。
+"""
+import random
+import sys
+
+from sqlalchemy import func, insert, select
+
+from app import crud, models, schemas
+from app.search import rebuild_search_index
+from .bench_search import VOCABULARY
+from .common import make_engine, make_session, measure, seed_meetings
+
+
+def make_segment(rng: random.Random) -> str:
+    # 1セグメント約170文字
+    return "".join(f"{word}の{rng.choice(VOCABULARY)}について確認します。" for word in rng.sample(VOCABULARY, 11))
+
+
+def main(segments: int = 1080):
+    rng = random.Random(0)
+    engine = make_engine()
+    seed_meetings(engine, 2)
+    with engine.begin() as conn:
+        conn.execute(insert(models.TranscriptSegment.__table__), [
+            {
+                "meeting_id": 2,
+                "position": position,
+                "start_seconds": position * 10.0,
+                "end_seconds": position * 10.0 + 10.0,
+                "text": make_segment(rng),
+            }
+            for position in range(segments)
+        ])
+        rebuild_search_index(conn)
+        chars = conn.execute(select(func.sum(func.length(models.TranscriptSegment.text)))).scalar()
+    print(f"transcript: {segments} segments, {chars} chars")
+
+    db = make_session(engine)
+    print(f"{'meeting':<16} {'create_task (ms)':>17} {'patch content (ms)':>19}")
+    for label, meeting_id in (("no transcript", 1), ("long transcript", 2)):
+        create_ms = measure(
+            lambda: crud.create_task(db, {"meeting_id": meeting_id, "content": "見積もりを作成する", "assignee": "田中"}),
+            repeat=50,
+        )
+        task_id = db.scalars(select(models.Task.id).where(models.Task.meeting_id == meeting_id).limit(1)).first()
+        counter = iter(range(10 ** 6))
+        patch_ms = measure(
+            lambda: crud.patch_task(db, task_id, schemas.TaskUpdate(content=f"見積もりを修正する{next(counter)}")),
+            repeat=50,
+        )
+        print(f"{label:<16} {create_ms:>17.2f} {patch_ms:>19.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1080)
@@ -0,0 +1,62 @@
+# benchmarks/bench_transcript_segments.py
+"""
+議事録をセグメントのテーブルに分けた効果
+
+    python -m benchmarks.bench_transcript_segments [1ページの件数]
+
+3時間の会議（10秒ごとのセグメント、約1,080行）の議事録を持つ会議を作成し、
+  - 一覧1ページのレスポンスサイズと時間（議事録なし＝デフォルト／include_transcript=true）
+  - 議事録の途中5分間の取得（範囲指定）と議事録全体の取得
+を比較する。
+"""
+import sys
+
+from app import crud
+from app.responses import JSTJSONResponse
+from app.utils import format_transcript
+from .common import make_engine, make_session, measure, seed_meetings
+
+HOURS = 3
+SEGMENT_SECONDS = 10
+
+
+def main(page_size: int = 100):
+    transcript = format_transcript(
+        (float(start), float(start + SEGMENT_SECONDS), f"{start}秒からの発言です。" * 4)
+        for start in range(0, HOURS * 3600, SEGMENT_SECONDS)
+    )
+    engine = make_engine()
+    seed_meetings(engine, page_size, tasks_per_meeting=3, transcript=transcript)
+    db = make_session(engine)
+
+    def page(include_transcript):
+        meetings = crud.get_meetings(db, skip=0, limit=page_size, include_transcript=include_transcript)
+        db.expunge_all()
+        return JSTJSONResponse(meetings).body
+
+    print(f"page_size={page_size} transcript={len(transcript.encode()) / 1024:.0f} KB/meeting")
+    for label, include_transcript in (("list (default)", False), ("list (include_transcript)", True)):
+        size = len(page(include_transcript))
+        ms = measure(lambda: page(include_transcript), repeat=5)
+        print(f"{label:<28} {ms:9.2f} ms  {size / 1024:10.0f} KB")
+
+    meeting_id = page_size // 2
+
+    def transcript_range():
+        segments = crud.get_transcript_segments(db, meeting_id, start=7200.0, end=7500.0)
+        db.expunge_all()
+        return segments
+
+    def transcript_all():
+        segments = crud.get_transcript_segments(db, meeting_id)
+        db.expunge_all()
+        return segments
+
+    print(f"{'transcript 02:00:00-02:05:00':<28} {measure(transcript_range):9.2f} ms  "
+          f"{len(transcript_range()):6d} segments")
+    print(f"{'transcript (all)':<28} {measure(transcript_all):9.2f} ms  "
+          f"{len(transcript_all()):6d} segments")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
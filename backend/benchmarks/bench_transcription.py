@@ -0,0 +1,114 @@
+# benchmarks/bench_transcription.py
+"""
+文字起こしワーカーのスループットとスケーリング
+
+    python -m benchmarks.bench_transcription [音声の秒数] [最大ワーカー数] [モデル名]
+
+合成した音声（発話の代わりの正弦波と短い無音の繰り返し）を、
+  - 分割なし：録音全体を1回のWhisper呼び出しで文字起こし
+  - 分割あり：無音で分割したチャンクをワーカー数 1, 2, 4, ... で並列に文字起こし
+の構成で処理し、経過時間・実時間1分あたりの音声の分数・ワーカーの最大メモリを表示する。
+モデルのロードはワーカー起動時の1回だけなので、計測から除外する（ウォームアップ）。
+"""
+import math
+import multiprocessing
+import os
+import resource
+import struct
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+from app import transcription
+from app.audio import SAMPLE_RATE, plan_chunks, scan_audio, stitch_segments
+
+# 発話の長さと無音の長さ（秒）
+SPEECH_SECONDS = 4.0
+SILENCE_SECONDS = 0.6
+
+
+def write_wav(path: str, seconds: float):
+    """発話の代わりに、音量が揺れる正弦波と無音を交互に書き出す"""
+    period = SPEECH_SECONDS + SILENCE_SECONDS
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        for second in range(int(seconds)):
+            frames = bytearray()
+            for i in range(SAMPLE_RATE):
+                t = second + i / SAMPLE_RATE
+                if t % period >= SPEECH_SECONDS:
+                    value = 0.0
+                else:
+                    value = 0.3 * (1 + math.sin(2 * math.pi * 0.5 * t)) / 2 * math.sin(2 * math.pi * 220 * t)
+                frames += struct.pack("<h", int(32767 * value))
+            f.writeframes(bytes(frames))
+
+
+def transcribe_with_peak_memory(path: str, start: float, end: float):
+    segments = transcription.transcribe_chunk(path, start, end)
+    # Linuxではキロバイト単位
+    return segments, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(path: str, chunks, workers: int, model: str):
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=transcription.load_model,
+        initargs=(model, "ja"),
+    )
+    try:
+        # ウォームアップ（全ワーカーでモデルをロードさせる）
+        list(executor.map(transcribe_with_peak_memory, [path] * workers, [0.0] * workers, [1.0] * workers))
+
+        start = time.perf_counter()
+        results = list(executor.map(
+            transcribe_with_peak_memory, [path] * len(chunks), [c.start for c in chunks], [c.end for c in chunks]
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+    segments = stitch_segments(chunks, [segments for segments, _ in results])
+    return elapsed, max(peak for _, peak in results), len(segments)
+
+
+def main(seconds: float = 600.0, max_workers: int = os.cpu_count() or 1, model: str = "tiny"):
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    write_wav(path, seconds)
+    try:
+        start = time.perf_counter()
+        chunks = plan_chunks(scan_audio(path))
+        plan_ms = (time.perf_counter() - start) * 1000
+        whole = plan_chunks(scan_audio(path), chunk_seconds=seconds * 2)
+
+        print(f"model={model} audio={seconds:.0f}s chunks={len(chunks)} (planning {plan_ms:.1f} ms)")
+        print(f"{'mode':<12} {'workers':>7} {'elapsed':>10} {'audio-min/min':>14} {'per core':>9} {'peak MB':>8}")
+        configs = [("whole", 1, whole)]
+        workers = 1
+        while workers <= max_workers:
+            configs.append(("chunked", workers, chunks))
+            workers *= 2
+        baseline = None
+        for mode, workers, plan in configs:
+            elapsed, peak, _ = run(path, plan, workers, model)
+            baseline = baseline or elapsed
+            speed = seconds / elapsed
+            print(
+                f"{mode:<12} {workers:>7} {elapsed:>9.2f}s {speed:>14.2f} {speed / workers:>9.2f} {peak:>8.0f}"
+                f"  (x{baseline / elapsed:.2f})"
+            )
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 600.0,
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1,
+        sys.argv[3] if len(sys.argv) > 3 else "tiny",
+    )
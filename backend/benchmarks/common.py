@@ -0,0 +1,90 @@
+# benchmarks/common.py
+"""ベンチマーク共通のヘルパー（一時DBの作成・データ投入・計測）"""
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from json import dumps
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.utils import parse_transcript
+
+
+def make_engine(path: str = None):
+    """一時ファイルのSQLiteにスキーマを作成してエンジンを返す"""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def make_session(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed_meetings(engine, count: int, tasks_per_meeting: int = 0, transcript: str = None,
+                  summary: str = None, batch_size: int = 10000):
+    """会議（と任意でタスク・議事録）をexecutemanyでまとめて投入する"""
+    # レスポンス検証で弾かれないよう未来の日付で作成する
+    base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    participants = dumps(["田中", "鈴木"], ensure_ascii=False)
+    segments = parse_transcript(transcript)
+    with engine.begin() as conn:
+        for start in range(0, count, batch_size):
+            rows = [
+                {
+                    "id": i + 1,
+                    "title": f"会議{i}",
+                    "date": base + timedelta(minutes=10 * i),
+                    "start_time": "10:00",
+                    "end_time": "11:00",
+                    "participants": participants,
+                    "summary": summary,
+                    "created_at": base,
+                    "updated_at": base,
+                }
+                for i in range(start, min(start + batch_size, count))
+            ]
+            conn.execute(insert(models.Meeting.__table__), rows)
+            if segments:
+                conn.execute(insert(models.TranscriptSegment.__table__), [
+                    {
+                        "meeting_id": row["id"],
+                        "position": position,
+                        "start_seconds": start_seconds,
+                        "end_seconds": end_seconds,
+                        "text": text,
+                    }
+                    for row in rows
+                    for position, (start_seconds, end_seconds, text) in enumerate(segments)
+                ])
+            if tasks_per_meeting:
+                conn.execute(insert(models.Task.__table__), [
+                    {
+                        "meeting_id": row["id"],
+                        "content": f"タスク{n}",
+                        "assignee": "田中",
+                        "status": "pending",
+                        "created_at": base,
+                        "updated_at": base,
+                    }
+                    for row in rows
+                    for n in range(tasks_per_meeting)
+                ])
+
+
+def measure(fn, repeat: int = 20) -> float:
+    """fnを繰り返し実行し、中央値（ミリ秒）を返す"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -6,13 +6,16 @@ from sqlalchemy import pool
 from alembic import context
 from app.core.config import get_settings
 from app.models import Base
+from app.search import SEARCH_TABLES
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-settings = get_settings()
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# URLが明示的に渡されていない場合はアプリの設定を使う
+if not config.get_main_option("sqlalchemy.url"):
+    settings = get_settings()
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -25,6 +28,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+# 全文検索の索引（FTS5の仮想テーブルとその内部のテーブル、PostgreSQLのtsvectorのテーブル）は
+# モデルにないため、autogenerateの比較から除く（除かないと削除するマイグレーションが生成される）
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table":
+        return not name.startswith(SEARCH_TABLES)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +59,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -70,7 +83,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,51 @@
+"""Add meeting_participants lookup table
+
+Revision ID: 0e5c93ab12f8
+Revises: d71a09c3e5b4
+Create Date: 2026-10-18 12:20:31.174502
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e5c93ab12f8'
+down_revision: Union[str, None] = 'd71a09c3e5b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    participants = op.create_table(
+        'meeting_participants',
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('meeting_id', 'name'),
+    )
+    op.create_index(
+        'ix_meeting_participants_name_meeting_id',
+        'meeting_participants',
+        ['name', 'meeting_id'],
+        unique=False,
+    )
+
+    # 既存の会議のparticipants（JSON文字列）から検索用の行を作成する
+    rows = []
+    for meeting_id, raw in op.get_bind().execute(sa.text('SELECT id, participants FROM meetings')):
+        try:
+            names = json.loads(raw) if raw else []
+        except ValueError:
+            names = []
+        rows.extend({'meeting_id': meeting_id, 'name': name} for name in dict.fromkeys(names))
+    if rows:
+        op.bulk_insert(participants, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meeting_participants_name_meeting_id', table_name='meeting_participants')
+    op.drop_table('meeting_participants')
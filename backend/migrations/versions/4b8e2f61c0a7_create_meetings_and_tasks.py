@@ -0,0 +1,70 @@
+"""Create meetings and tasks tables
+
+Revision ID: 4b8e2f61c0a7
+Revises: 9c7d186d8b17
+Create Date: 2026-10-18 10:12:04.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f61c0a7'
+down_revision: Union[str, None] = '9c7d186d8b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 以前は起動時のcreate_allでテーブルを作っていたため、
+    # 既存のデータベースではテーブル作成をスキップする
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('meetings'):
+        op.create_table(
+            'meetings',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=100), nullable=False),
+            sa.Column('date', sa.DateTime(), nullable=True),
+            sa.Column('start_time', sa.String(length=5), nullable=False),
+            sa.Column('end_time', sa.String(length=5), nullable=False),
+            sa.Column('participants', sa.Text(), nullable=True),
+            sa.Column('audio_file_path', sa.String(length=255), nullable=True),
+            sa.Column('transcript', sa.Text(), nullable=True),
+            sa.Column('summary', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_meetings_id', 'meetings', ['id'], unique=False)
+
+    if not inspector.has_table('tasks'):
+        op.create_table(
+            'tasks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('meeting_id', sa.Integer(), nullable=True),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('assignee', sa.String(length=100), nullable=True),
+            sa.Column('due_date', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False)
+
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('meetings')}
+    if 'ix_meetings_date_id' not in existing:
+        op.create_index('ix_meetings_date_id', 'meetings', ['date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_id', table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index('ix_meetings_date_id', table_name='meetings')
+    op.drop_index('ix_meetings_id', table_name='meetings')
+    op.drop_table('meetings')
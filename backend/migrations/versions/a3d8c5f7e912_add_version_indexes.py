@@ -0,0 +1,34 @@
+"""Add covering indexes for ETag version lookups
+
+Revision ID: a3d8c5f7e912
+Revises: f58b2e6d4c19
+Create Date: 2026-10-18 19:12:05.331842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8c5f7e912'
+down_revision: Union[str, None] = 'f58b2e6d4c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (インデックス名, テーブル名, カラム)
+INDEXES = [
+    ('ix_meetings_id_updated_at', 'meetings', ['id', 'updated_at']),
+    ('ix_tasks_meeting_id_updated_at', 'tasks', ['meeting_id', 'updated_at']),
+]
+
+
+def upgrade() -> None:
+    # 条件付きリクエストの304をインデックスだけを読むクエリで返すためのインデックス
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,120 @@
+"""Move meeting transcripts into transcript_segments
+
+Revision ID: b3d9e07f5a21
+Revises: 6a2f4c8d9e13
+Create Date: 2026-10-18 14:52:47.205913
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9e07f5a21'
+down_revision: Union[str, None] = '6a2f4c8d9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 議事録とセグメントの変換（このリビジョンの時点の app.utils の parse_transcript・format_transcript の写し）。
+# アプリのコードが変わっても、このマイグレーションの結果は変わらないようにする
+TRANSCRIPT_LINE_PATTERN = re.compile(r'^\[(\d{2,}):(\d{2}):(\d{2})\] ?(.*)$')
+
+
+def _parse_transcript(transcript):
+    segments = []
+    for line in (transcript or '').split('\n'):
+        match = TRANSCRIPT_LINE_PATTERN.match(line)
+        if match:
+            hours, minutes, seconds, text = match.groups()
+            start = float(int(hours) * 3600 + int(minutes) * 60 + int(seconds))
+            if segments and segments[-1][0] is not None and segments[-1][1] is None:
+                segments[-1][1] = start
+            segments.append([start, None, text])
+        elif segments:
+            # 時刻のない行は直前のセグメントの続き
+            segments[-1][2] += '\n' + line
+        else:
+            segments.append([None, None, line])
+    if segments == [[None, None, '']]:
+        return []
+    return [tuple(segment) for segment in segments]
+
+
+def _format_timestamp(seconds):
+    seconds = int(seconds)
+    return f'{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}'
+
+
+def _format_transcript(segments):
+    return '\n'.join(
+        text if start is None else f'[{_format_timestamp(start)}] {text}'
+        for start, _, text in segments
+    )
+
+
+def upgrade() -> None:
+    segments = op.create_table(
+        'transcript_segments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('start_seconds', sa.Float(), nullable=True),
+        sa.Column('end_seconds', sa.Float(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_transcript_segments_meeting_id_position',
+        'transcript_segments',
+        ['meeting_id', 'position'],
+        unique=True,
+    )
+    op.create_index(
+        'ix_transcript_segments_meeting_id_start',
+        'transcript_segments',
+        ['meeting_id', 'start_seconds'],
+        unique=False,
+    )
+
+    # 既存の議事録（「[HH:MM:SS] 本文」の行、または時刻のないテキスト）をセグメントに分割する
+    bind = op.get_bind()
+    result = bind.execute(sa.text('SELECT id, transcript FROM meetings WHERE transcript IS NOT NULL'))
+    for meeting_id, transcript in result:
+        rows = [
+            {'meeting_id': meeting_id, 'position': position,
+             'start_seconds': start, 'end_seconds': end, 'text': text}
+            for position, (start, end, text) in enumerate(_parse_transcript(transcript))
+        ]
+        if rows:
+            op.bulk_insert(segments, rows)
+
+    with op.batch_alter_table('meetings') as batch_op:
+        batch_op.drop_column('transcript')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('meetings') as batch_op:
+        batch_op.add_column(sa.Column('transcript', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    transcripts = {}
+    result = bind.execute(sa.text(
+        'SELECT meeting_id, start_seconds, end_seconds, text FROM transcript_segments '
+        'ORDER BY meeting_id, position'
+    ))
+    for meeting_id, start, end, text in result:
+        transcripts.setdefault(meeting_id, []).append((start, end, text))
+    for meeting_id, segments in transcripts.items():
+        bind.execute(
+            sa.text('UPDATE meetings SET transcript = :transcript WHERE id = :id'),
+            {'transcript': _format_transcript(segments), 'id': meeting_id},
+        )
+
+    op.drop_index('ix_transcript_segments_meeting_id_start', table_name='transcript_segments')
+    op.drop_index('ix_transcript_segments_meeting_id_position', table_name='transcript_segments')
+    op.drop_table('transcript_segments')
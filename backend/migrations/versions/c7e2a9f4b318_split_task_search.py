@@ -0,0 +1,168 @@
+"""Index task content separately from the meeting search document
+
+Revision ID: c7e2a9f4b318
+Revises: a3d8c5f7e912
+Create Date: 2026-10-19 10:24:51.418305
+
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9f4b318'
+down_revision: Union[str, None] = 'a3d8c5f7e912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# タスクの作成・更新で議事録を分割し直さないよう、タスクの内容は meeting_task_search に分ける。
+# DDLと分割の規則はこのリビジョンの時点の app.search の写し（アプリのコードが変わっても結果は変わらない）
+SQLITE_DDL = {
+    'upgrade': (
+        "CREATE VIRTUAL TABLE meeting_search USING fts5(title, transcript, summary, tokenize='unicode61')",
+        "CREATE VIRTUAL TABLE meeting_task_search USING fts5(tasks, tokenize='unicode61')",
+    ),
+    'downgrade': (
+        "CREATE VIRTUAL TABLE meeting_search "
+        "USING fts5(title, transcript, summary, tasks, tokenize='unicode61')",
+    ),
+}
+POSTGRES_SEARCH_DDL = (
+    "CREATE TABLE {table} ("
+    "meeting_id INTEGER PRIMARY KEY REFERENCES meetings (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX ix_{table}_document ON {table} USING GIN (document)",
+)
+POSTGRES_DDL = {
+    'upgrade': tuple(
+        statement.format(table=table)
+        for table in ('meeting_search', 'meeting_task_search')
+        for statement in POSTGRES_SEARCH_DDL
+    ),
+    'downgrade': tuple(statement.format(table='meeting_search') for statement in POSTGRES_SEARCH_DDL),
+}
+
+# (テーブル, SQLiteのINSERT, PostgreSQLのINSERT, 列)
+INSERTS = {
+    'upgrade': (
+        (
+            'meeting_search',
+            "INSERT INTO meeting_search (rowid, title, transcript, summary) "
+            "VALUES (:id, :title, :transcript, :summary)",
+            "INSERT INTO meeting_search (meeting_id, document) VALUES (:id, "
+            "setweight(to_tsvector('simple', :title), 'A') || "
+            "setweight(to_tsvector('simple', :summary), 'B') || "
+            "setweight(to_tsvector('simple', :transcript), 'D'))",
+            ('title', 'transcript', 'summary'),
+        ),
+        (
+            'meeting_task_search',
+            "INSERT INTO meeting_task_search (rowid, tasks) VALUES (:id, :tasks)",
+            "INSERT INTO meeting_task_search (meeting_id, document) "
+            "VALUES (:id, setweight(to_tsvector('simple', :tasks), 'B'))",
+            ('tasks',),
+        ),
+    ),
+    'downgrade': (
+        (
+            'meeting_search',
+            "INSERT INTO meeting_search (rowid, title, transcript, summary, tasks) "
+            "VALUES (:id, :title, :transcript, :summary, :tasks)",
+            "INSERT INTO meeting_search (meeting_id, document) VALUES (:id, "
+            "setweight(to_tsvector('simple', :title), 'A') || "
+            "setweight(to_tsvector('simple', :summary), 'B') || "
+            "setweight(to_tsvector('simple', :tasks), 'B') || "
+            "setweight(to_tsvector('simple', :transcript), 'D'))",
+            ('title', 'transcript', 'summary', 'tasks'),
+        ),
+    ),
+}
+
+# 英数字の語、または英数字以外の文字（かな・漢字など）の連続。日本語は文字のバイグラムにする
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\W\da-z_]+")
+
+BATCH_SIZE = 1000
+
+
+def _tokenize(value):
+    tokens = []
+    for word in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', value or '').lower()):
+        if word.isascii() or len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(tokens)
+
+
+def _documents(bind, meetings):
+    """会議の (タイトル, 議事録, 要約, タスク) を分割した文字列にする"""
+    params = {'first': meetings[0].id, 'last': meetings[-1].id}
+    transcripts = defaultdict(list)
+    for meeting_id, text in bind.execute(sa.text(
+        'SELECT meeting_id, text FROM transcript_segments WHERE meeting_id BETWEEN :first AND :last '
+        'ORDER BY meeting_id, position'
+    ), params):
+        transcripts[meeting_id].append(text)
+    tasks = defaultdict(list)
+    for meeting_id, content in bind.execute(sa.text(
+        'SELECT meeting_id, content FROM tasks WHERE meeting_id BETWEEN :first AND :last '
+        'ORDER BY meeting_id, id'
+    ), params):
+        tasks[meeting_id].append(content)
+    return [
+        {
+            'id': meeting.id,
+            'title': _tokenize(meeting.title),
+            'transcript': _tokenize('\n'.join(transcripts[meeting.id])),
+            'summary': _tokenize(meeting.summary),
+            'tasks': _tokenize('\n'.join(tasks[meeting.id])),
+            'has_tasks': bool(tasks[meeting.id]),
+        }
+        for meeting in meetings
+    ]
+
+
+def _rebuild(direction: str):
+    """索引のテーブルを作り直し、既存の会議を BATCH_SIZE 件ずつ登録する"""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        return
+    op.execute('DROP TABLE IF EXISTS meeting_task_search')
+    op.execute('DROP TABLE IF EXISTS meeting_search')
+    for statement in (SQLITE_DDL if dialect == 'sqlite' else POSTGRES_DDL)[direction]:
+        op.execute(statement)
+
+    last_id = 0
+    while True:
+        meetings = bind.execute(
+            sa.text('SELECT id, title, summary FROM meetings WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).all()
+        if not meetings:
+            break
+        documents = _documents(bind, meetings)
+        for table, sqlite_insert, postgres_insert, columns in INSERTS[direction]:
+            # タスクの索引にはタスクのある会議だけを登録する
+            rows = [
+                {'id': document['id'], **{column: document[column] for column in columns}}
+                for document in documents
+                if table != 'meeting_task_search' or document['has_tasks']
+            ]
+            if rows:
+                bind.execute(sa.text(sqlite_insert if dialect == 'sqlite' else postgres_insert), rows)
+        last_id = meetings[-1].id
+
+
+def upgrade() -> None:
+    _rebuild('upgrade')
+
+
+def downgrade() -> None:
+    _rebuild('downgrade')
@@ -0,0 +1,39 @@
+"""Add indexes for hot query paths
+
+Revision ID: d71a09c3e5b4
+Revises: 4b8e2f61c0a7
+Create Date: 2026-10-18 11:03:47.902215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71a09c3e5b4'
+down_revision: Union[str, None] = '4b8e2f61c0a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (インデックス名, テーブル名, カラム)
+INDEXES = [
+    ('ix_tasks_meeting_id', 'tasks', ['meeting_id']),
+    ('ix_tasks_assignee_status', 'tasks', ['assignee', 'status']),
+    ('ix_tasks_due_date', 'tasks', ['due_date']),
+]
+
+
+def upgrade() -> None:
+    # meetings.date は 4b8e2f61c0a7 の ix_meetings_date_id (date, id) が先頭列でカバーする
+    inspector = sa.inspect(op.get_bind())
+    existing = {index['name'] for index in inspector.get_indexes('tasks')}
+    for name, table, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,118 @@
+"""Add full-text search index for meetings
+
+Revision ID: e41c7a9b2d56
+Revises: b3d9e07f5a21
+Create Date: 2026-10-18 15:38:12.684027
+
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41c7a9b2d56'
+down_revision: Union[str, None] = 'b3d9e07f5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# このリビジョンの時点の app.search のDDLと分割の規則の写し。
+# アプリのモデル・分割の規則が変わっても、このマイグレーションの結果は変わらないようにする
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meeting_search "
+    "USING fts5(title, transcript, summary, tasks, tokenize='unicode61')"
+)
+POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS meeting_search ("
+    "meeting_id INTEGER PRIMARY KEY REFERENCES meetings (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_meeting_search_document ON meeting_search USING GIN (document)",
+)
+
+SQLITE_INSERT = sa.text(
+    "INSERT INTO meeting_search (rowid, title, transcript, summary, tasks) "
+    "VALUES (:id, :title, :transcript, :summary, :tasks)"
+)
+POSTGRES_INSERT = sa.text(
+    "INSERT INTO meeting_search (meeting_id, document) VALUES (:id, "
+    "setweight(to_tsvector('simple', :title), 'A') || "
+    "setweight(to_tsvector('simple', :summary), 'B') || "
+    "setweight(to_tsvector('simple', :tasks), 'B') || "
+    "setweight(to_tsvector('simple', :transcript), 'D'))"
+)
+
+# 英数字の語、または英数字以外の文字（かな・漢字など）の連続。日本語は文字のバイグラムにする
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[^\W\da-z_]+")
+
+BATCH_SIZE = 1000
+
+
+def _tokenize(value):
+    tokens = []
+    for word in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', value or '').lower()):
+        if word.isascii() or len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(tokens)
+
+
+def _backfill(bind, insert):
+    """既存の会議を BATCH_SIZE 件ずつ索引に登録する"""
+    last_id = 0
+    while True:
+        meetings = bind.execute(
+            sa.text('SELECT id, title, summary FROM meetings WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).all()
+        if not meetings:
+            break
+        params = {'first': meetings[0].id, 'last': meetings[-1].id}
+        transcripts = defaultdict(list)
+        for meeting_id, text in bind.execute(sa.text(
+            'SELECT meeting_id, text FROM transcript_segments WHERE meeting_id BETWEEN :first AND :last '
+            'ORDER BY meeting_id, position'
+        ), params):
+            transcripts[meeting_id].append(text)
+        tasks = defaultdict(list)
+        for meeting_id, content in bind.execute(sa.text(
+            'SELECT meeting_id, content FROM tasks WHERE meeting_id BETWEEN :first AND :last '
+            'ORDER BY meeting_id, id'
+        ), params):
+            tasks[meeting_id].append(content)
+        bind.execute(insert, [
+            {
+                'id': meeting.id,
+                'title': _tokenize(meeting.title),
+                'transcript': _tokenize('\n'.join(transcripts[meeting.id])),
+                'summary': _tokenize(meeting.summary),
+                'tasks': _tokenize('\n'.join(tasks[meeting.id])),
+            }
+            for meeting in meetings
+        ])
+        last_id = meetings[-1].id
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute(SQLITE_DDL)
+        insert = SQLITE_INSERT
+    elif bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+        insert = POSTGRES_INSERT
+    else:
+        return
+
+    # 既存の会議を索引に登録する
+    _backfill(bind, insert)
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE IF EXISTS meeting_search')
@@ -0,0 +1,32 @@
+"""Add summary_cache table for LLM summaries
+
+Revision ID: f58b2e6d4c19
+Revises: e41c7a9b2d56
+Create Date: 2026-10-18 16:47:30.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f58b2e6d4c19'
+down_revision: Union[str, None] = 'e41c7a9b2d56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'summary_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('summary_cache')
@@ -1,11 +1,17 @@
 # tests/conftest.py
 import pytest
+import time
+from pathlib import Path
+from alembic.config import Config
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from app.cache import response_cache
 from app.database import Base, get_db
 from app.main import app
 from app.core.config import get_settings, Settings
+from .test_data import get_valid_meeting_data, get_valid_task_data
 
 def get_test_settings():
     return Settings(
@@ -34,6 +40,31 @@ def db():
         db.close()
         Base.metadata.drop_all(bind=test_engine)
 
+@pytest.fixture
+def count_queries():
+    """ブロック内でテスト用DBに発行されたSQL文を記録するコンテキストマネージャーを返す"""
+    @contextmanager
+    def _count():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+    return _count
+
+@pytest.fixture
+def alembic_config(tmp_path):
+    """一時SQLiteファイルを対象にしたAlembicの設定を返す"""
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parent.parent / "migrations"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{tmp_path / 'migrated.db'}")
+    return config
+
 @pytest.fixture
 def client(db):
     def override_get_db():
@@ -43,6 +74,46 @@ def client(db):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    # テストごとにテーブルを作り直すため、前のテストの会議IDのキャッシュを残さない
+    response_cache.clear()
+    response_cache.reset()
     with TestClient(app) as client:
         yield client
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def install_job_service(client):
+    """
+    ジョブのサービス（文字起こし・要約・タスク抽出）をエンドポイントの依存関係に差し替える関数を返す。
+    差し替えたサービスはテストの終わりに停止する。
+    """
+    services = []
+
+    def install(dependency, service):
+        app.dependency_overrides[dependency] = lambda: service
+        services.append(service)
+        return service
+
+    yield install
+    for service in services:
+        service.shutdown()
+
+def wait_for_job(client, job_id, timeout=5.0):
+    """ジョブが完了または失敗するまで待ち、ジョブを返す"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+def create_meeting(client, **fields):
+    """会議を作成して返す（fieldsで get_valid_meeting_data の項目を上書きする）"""
+    return client.post("/api/meetings", json={**get_valid_meeting_data(), **fields}).json()
+
+def create_meeting_with_task(client, **fields):
+    """議事録とタスクを1件持つ会議を作成し、(会議, タスク) を返す"""
+    meeting = create_meeting(client, **{"transcript": "[00:00:10] 広告費を確認します", **fields})
+    task = client.post(f"/api/meetings/{meeting['id']}/tasks/", json=get_valid_task_data()).json()
+    return meeting, task
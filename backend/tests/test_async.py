@@ -0,0 +1,72 @@
+import asyncio
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import crud
+from app.database import get_session, run_db, to_async_url
+from app.main import app
+from app.schemas import MeetingCreate
+from .conftest import get_test_settings
+from .test_data import get_valid_meeting_data
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db(db):
+    # 同期フィクスチャで作成したテスト用DBに非同期ドライバで接続する
+    async_engine = create_async_engine(to_async_url(get_test_settings().DATABASE_URL))
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    async with AsyncTestingSessionLocal() as session:
+        yield session
+    await async_engine.dispose()
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+@pytest.mark.anyio
+async def test_crud_runs_on_async_session(async_db):
+    meeting = await run_db(async_db, crud.create_meeting, meeting=MeetingCreate(**get_valid_meeting_data()))
+    meetings = await run_db(async_db, crud.get_meetings, skip=0, limit=10)
+
+    assert [m["id"] for m in meetings] == [meeting["id"]]
+    assert meetings[0]["participants"] == ["田中", "鈴木"]
+
+
+@pytest.mark.anyio
+async def test_async_endpoints_do_not_use_threadpool(async_db):
+    meeting = await run_db(async_db, crud.create_meeting, meeting=MeetingCreate(**get_valid_meeting_data()))
+
+    async def override_get_session():
+        yield async_db
+
+    # スレッドプールのトークンをすべて占有しても、非同期モードのリクエストは処理される
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    holders = [object() for _ in range(int(limiter.total_tokens))]
+    for holder in holders:
+        limiter.acquire_on_behalf_of_nowait(holder)
+
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with anyio.fail_after(5):
+                responses = await asyncio.gather(
+                    *[client.get(f"/api/meetings/{meeting['id']}") for _ in range(20)]
+                )
+    finally:
+        app.dependency_overrides.clear()
+        for holder in holders:
+            limiter.release_on_behalf_of(holder)
+
+    assert all(r.status_code == 200 for r in responses)
+    assert responses[0].json()["title"] == meeting["title"]
@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.audio import (
+    FRAME_SECONDS,
+    Chunk,
+    Segment,
+    frame_rms,
+    plan_chunks,
+    stitch_segments
+)
+from app.utils import format_transcript
+
+
+def speech_with_pauses(seconds, pause_every, pause_seconds=0.5):
+    """一定間隔で無音が入るフレーム音量の列"""
+    levels = np.full(int(seconds / FRAME_SECONDS), 0.3)
+    for start in np.arange(pause_every, seconds, pause_every):
+        levels[int(start / FRAME_SECONDS):int((start + pause_seconds) / FRAME_SECONDS)] = 0.0
+    return levels
+
+
+def test_frame_rms():
+    samples = np.concatenate([np.zeros(320), np.full(320, 0.5), np.ones(100)]).astype(np.float32)
+    assert np.allclose(frame_rms(samples), [0.0, 0.5])
+
+
+def test_plan_chunks_cuts_at_silence():
+    # 7秒ごとに無音があるので、60秒付近の無音（56秒、63秒）のどちらかで区切られる
+    levels = speech_with_pauses(3 * 3600, pause_every=7)
+    chunks = plan_chunks(levels, chunk_seconds=60, search_seconds=10, overlap_seconds=1.0)
+
+    assert chunks[0].own_start == 0 and chunks[-1].own_end == 3 * 3600
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.own_start == previous.own_end
+        assert chunk.start == chunk.own_start - 0.5
+        # 区切りは無音の中
+        assert levels[int(chunk.own_start / FRAME_SECONDS)] == 0.0
+    # 3時間の録音でも1チャンクは上限の長さに収まる
+    assert max(chunk.end - chunk.start for chunk in chunks) <= 60 + 10 + 1.0
+
+
+def test_plan_chunks_short_audio():
+    levels = speech_with_pauses(30, pause_every=7)
+    assert plan_chunks(levels, chunk_seconds=60) == [Chunk(0.0, 30.0, 0.0, 30.0)]
+    assert plan_chunks(np.zeros(0)) == []
+
+
+def test_stitch_segments_removes_overlap():
+    chunks = [Chunk(0.0, 60.5, 0.0, 60.0), Chunk(59.5, 120.0, 60.0, 120.0)]
+    results = [
+        [Segment(1.0, 5.0, "こんにちは"), Segment(57.0, 60.4, "予算は来週までに確定します")],
+        [
+            # のりしろ部分で前のチャンクと同じセグメントが返る（中心時刻で前のチャンクが採用）
+            Segment(59.5, 60.4, "確定します"),
+            # 境界をまたぐ文の前半が前のチャンクの末尾と重複している
+            Segment(60.2, 63.0, "確定しますので、各自確認してください"),
+            Segment(64.0, 66.0, "以上です"),
+        ],
+    ]
+
+    segments = stitch_segments(chunks, results)
+
+    assert [segment.text for segment in segments] == [
+        "こんにちは",
+        "予算は来週までに確定します",
+        "ので、各自確認してください",
+        "以上です",
+    ]
+    assert format_transcript(segments).splitlines()[-1] == "[00:01:04] 以上です"
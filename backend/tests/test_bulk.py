@@ -0,0 +1,104 @@
+from .conftest import create_meeting
+from .test_data import get_future_date, get_valid_meeting_data, get_valid_task_data
+
+
+def meeting_data(title, **fields):
+    return {**get_valid_meeting_data(), "title": title, **fields}
+
+
+def create_meeting_with_tasks(client, count):
+    meeting = create_meeting(client)
+    tasks = [
+        client.post(f"/api/meetings/{meeting['id']}/tasks/", json={**get_valid_task_data(), "content": f"タスク{i}"}).json()
+        for i in range(count)
+    ]
+    return meeting, tasks
+
+
+def test_create_meetings_bulk(client):
+    items = [
+        meeting_data("予算会議", participants=["田中", "鈴木"], transcript="[00:00:10] 広告費を確認します"),
+        meeting_data("過去の会議", date="2020-01-01T10:00:00+0900"),
+        meeting_data("定例", participants=["田中"]),
+        {"title": "項目不足"},
+    ]
+    response = client.post("/api/meetings/bulk", json=items)
+    assert response.status_code == 200
+    result = response.json()
+    assert [meeting["title"] for meeting in result["created"]] == ["予算会議", "定例"]
+    assert result["created"][0]["participants"] == ["田中", "鈴木"]
+    assert result["created"][0]["transcript"] == "[00:00:10] 広告費を確認します"
+    assert result["created"][0]["tasks"] == []
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+    assert "過去の日付" in result["errors"][0]["detail"]
+    # 必須項目の不足は項目名付きで返す
+    assert result["errors"][1]["detail"] == "date: Field required"
+
+    # 作成した会議は参加者・議事録・検索の索引も1件ずつ作成した場合と同じになる
+    budget = client.get(f"/api/meetings/{result['created'][0]['id']}").json()
+    assert budget["transcript"] == "[00:00:10] 広告費を確認します"
+    titles = [meeting["title"] for meeting in client.get("/api/participants/田中/meetings").json()]
+    assert titles == ["予算会議", "定例"]
+    assert [r["id"] for r in client.get("/api/search", params={"q": "広告費"}).json()] == [budget["id"]]
+
+
+def test_create_meetings_bulk_uses_one_insert_per_table(client, count_queries):
+    items = [meeting_data(f"会議{i}", participants=["田中", "鈴木"], transcript="[00:00:00] 開始\n[00:01:00] 終了")
+             for i in range(50)]
+    with count_queries() as statements:
+        result = client.post("/api/meetings/bulk", json=items).json()
+    assert len(result["created"]) == 50
+    assert [meeting["title"] for meeting in result["created"]] == [f"会議{i}" for i in range(50)]
+    for table in ("meetings", "meeting_participants", "transcript_segments", "meeting_search"):
+        assert sum(s.startswith(f"INSERT INTO {table} ") for s in statements) == 1, table
+
+
+def test_apply_tasks_bulk(client):
+    meeting, tasks = create_meeting_with_tasks(client, 3)
+    items = [
+        {"id": tasks[0]["id"], "status": "completed"},
+        {"op": "delete", "id": tasks[1]["id"]},
+        {"op": "create", "meeting_id": meeting["id"], "content": "追加のタスク", "assignee": "鈴木"},
+        {"id": tasks[2]["id"], "status": "done"},
+        {"id": 9999, "status": "completed"},
+        {"op": "create", "meeting_id": 9999, "content": "会議がない"},
+        {"op": "delete", "id": tasks[0]["id"]},
+        {"op": "archive", "id": tasks[2]["id"]},
+        {"id": tasks[2]["id"], "content": None},
+    ]
+    response = client.patch("/api/tasks/bulk", json=items)
+    assert response.status_code == 200
+    result = response.json()
+
+    # 送信した項目だけが更新される
+    assert [(task["id"], task["status"], task["content"]) for task in result["updated"]] == [
+        (tasks[0]["id"], "completed", "タスク0")
+    ]
+    assert result["deleted"] == [tasks[1]["id"]]
+    assert [(task["content"], task["assignee"]) for task in result["created"]] == [("追加のタスク", "鈴木")]
+    assert [error["index"] for error in result["errors"]] == [3, 4, 5, 6, 7, 8]
+    assert "ステータス" in result["errors"][0]["detail"]
+    assert result["errors"][1]["detail"] == "タスクが見つかりませんでした。"
+    assert result["errors"][2]["detail"] == "会議が見つかりませんでした。"
+    assert "複数回" in result["errors"][3]["detail"]
+
+    current = {task["content"]: task["status"] for task in client.get(f"/api/meetings/{meeting['id']}/tasks/").json()}
+    assert current == {"タスク0": "completed", "タスク2": "pending", "追加のタスク": "pending"}
+
+
+def test_apply_tasks_bulk_updates_in_one_statement(client, count_queries):
+    meeting, tasks = create_meeting_with_tasks(client, 30)
+    items = [{"id": task["id"], "status": "completed"} for task in tasks]
+    items[0]["due_date"] = get_future_date(5)
+
+    with count_queries() as statements:
+        result = client.patch("/api/tasks/bulk", json=items).json()
+    assert len(result["updated"]) == 30
+    # 項目の組み合わせ（statusのみ / status・due_date）ごとに1回のUPDATE文
+    assert sum(s.startswith("UPDATE tasks ") for s in statements) == 2
+    assert all(task["status"] == "completed" for task in client.get(f"/api/meetings/{meeting['id']}/tasks/").json())
+
+
+def test_bulk_size_limits(client):
+    assert client.post("/api/meetings/bulk", json=[]).status_code == 422
+    assert client.patch("/api/tasks/bulk", json=[{"id": 1, "status": "completed"}] * 1001).status_code == 422
@@ -0,0 +1,186 @@
+import asyncio
+
+from app.cache import CachedResponse, LRUCache, ResponseCache, response_cache
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSharedBackend:
+    """共有のキャッシュ（Redisなど）の代わりに、複数のResponseCacheから使う辞書"""
+    local = False
+
+    def __init__(self):
+        self.values = {}
+        self.generations = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def generation(self, key):
+        return self.generations.get(key)
+
+    def set(self, key, value, ttl, generation=None):
+        if self.generations.get(key) == generation:
+            self.values[key] = value
+
+    def delete(self, keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.generations[key] = b"%d" % (int(self.generations.get(key, b"0")) + 1)
+
+    def clear(self):
+        self.values.clear()
+
+    def stats(self):
+        return {"entries": len(self.values)}
+
+
+def cached(cache, key):
+    response = asyncio.run(cache.get(key))
+    return response and response.body
+
+
+def put(cache, key, body, token=None):
+    token = asyncio.run(cache.begin(key)) if token is None else token
+    asyncio.run(cache.put(key, CachedResponse(body, {"ETag": 'W/"1"'}), token))
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=2, clock=clock)
+    cache.set("a", b"1", ttl=10)
+    cache.set("b", b"2", ttl=10)
+    assert cache.get("a") == b"1"  # aを最近使ったものにする
+    cache.set("c", b"3", ttl=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" and cache.get("c") == b"3"
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "entries": 1, "max_entries": 2, "bytes": 1, "max_bytes": None, "evictions": 1, "expirations": 1,
+    }
+
+
+def test_lru_cache_evicts_by_total_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=10)
+    cache.set("a", b"1234", ttl=10)
+    cache.set("b", b"5678", ttl=10)
+    cache.set("a", b"12", ttl=10)  # 置き換えた値の分だけ数える
+    assert cache.stats()["bytes"] == 6
+    cache.set("c", b"abcdef", ttl=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12" and cache.get("c") == b"abcdef"
+
+    # 上限より大きい値は保存せず、他の値も捨てない
+    cache.set("d", b"x" * 11, ttl=10)
+    assert cache.get("d") is None
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 8
+
+
+def test_response_cache_counts_and_skips_stale_loads():
+    cache = ResponseCache(LRUCache(max_entries=10), ttl=60)
+    assert cached(cache, "meeting:1") is None
+    put(cache, "meeting:1", b'{"id":1}')
+    assert asyncio.run(cache.get("meeting:1")) == CachedResponse(b'{"id":1}', {"ETag": 'W/"1"'})
+
+    # 読み込み中に無効化された内容は保存しない
+    token = asyncio.run(cache.begin("meeting:3"))
+    cache.invalidate_meetings([3])
+    put(cache, "meeting:3", b'{"id":3}', token)
+    assert cached(cache, "meeting:3") is None
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["invalidations"]) == (1, 2, 2)
+
+
+def test_shared_backend_is_invalidated_for_every_worker():
+    backend = FakeSharedBackend()
+    worker_a, worker_b = ResponseCache(backend, ttl=60), ResponseCache(backend, ttl=60)
+    put(worker_a, "meeting:1", b"old")
+    assert cached(worker_b, "meeting:1") == b"old"
+
+    worker_a.invalidate_meetings([1])
+    assert cached(worker_b, "meeting:1") is None
+    assert (worker_b.snapshot()["hits"], worker_b.snapshot()["misses"]) == (1, 1)
+
+
+def test_shared_backend_skips_loads_raced_by_other_workers():
+    backend = FakeSharedBackend()
+    worker_a, worker_b = ResponseCache(backend, ttl=60), ResponseCache(backend, ttl=60)
+    # Aが読み込んでいる間にBが同じ会議を無効化した場合、Aの読んだ古い内容は保存しない
+    token = asyncio.run(worker_a.begin("meeting:1"))
+    worker_b.invalidate_meetings([1])
+    put(worker_a, "meeting:1", b"old", token)
+    assert cached(worker_b, "meeting:1") is None
+
+    # 無効化の後に読み始めた内容は保存する
+    put(worker_a, "meeting:1", b"new")
+    assert cached(worker_b, "meeting:1") == b"new"
+
+
+def test_polling_does_not_touch_database(client, count_queries):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    client.post(f"/api/meetings/{meeting['id']}/tasks/", json=get_valid_task_data())
+    first = client.get(f"/api/meetings/{meeting['id']}").json()
+    client.get(f"/api/meetings/{meeting['id']}/tasks/")
+
+    with count_queries() as statements:
+        for _ in range(3):
+            assert client.get(f"/api/meetings/{meeting['id']}").json() == first
+            assert len(client.get(f"/api/meetings/{meeting['id']}/tasks/").json()) == 1
+    assert statements == []
+    metrics = client.get("/api/metrics/cache").json()
+    assert (metrics["hits"], metrics["misses"]) == (6, 2)
+
+
+def test_writes_invalidate_only_their_meeting(client):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    other = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    url, tasks_url = f"/api/meetings/{meeting['id']}", f"/api/meetings/{meeting['id']}/tasks/"
+
+    def poll():
+        client.get(f"/api/meetings/{other['id']}")
+        return client.get(url).json(), client.get(tasks_url).json()
+
+    poll()
+    task = client.post(tasks_url, json=get_valid_task_data()).json()
+    detail, tasks = poll()
+    assert [t["id"] for t in detail["tasks"]] == [task["id"]] and len(tasks) == 1
+
+    client.put(f"/api/tasks/{task['id']}", json={**get_valid_task_data(), "status": "in_progress"})
+    assert poll()[1][0]["status"] == "in_progress"
+    client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    assert poll()[0]["tasks"][0]["status"] == "completed"
+    client.patch("/api/tasks/bulk", json=[{"id": task["id"], "content": "一括で変更"}])
+    assert poll()[1][0]["content"] == "一括で変更"
+    client.delete(f"/api/tasks/{task['id']}")
+    assert poll()[1] == []
+
+    client.put(url, json={**get_valid_meeting_data(), "title": "PUTで変更"})
+    assert poll()[0]["title"] == "PUTで変更"
+    client.patch(url, json={"title": "PATCHで変更"})
+    assert poll()[0]["title"] == "PATCHで変更"
+
+    # 他の会議のキャッシュは無効化しない
+    misses = client.get("/api/metrics/cache").json()["misses"]
+    client.get(f"/api/meetings/{other['id']}")
+    assert client.get("/api/metrics/cache").json()["misses"] == misses
+
+    client.delete(url)
+    assert client.get(url).status_code == 404
+    assert client.get(tasks_url).status_code == 404
+    assert response_cache.snapshot()["invalidations"] > 0
+
+
+def test_missing_meeting_tasks_are_not_cached(client):
+    # 存在しない会議のタスク一覧は404で、キャッシュに保存しない
+    for meeting_id in range(9000, 9010):
+        assert client.get(f"/api/meetings/{meeting_id}/tasks/").status_code == 404
+    assert client.get("/api/metrics/cache").json()["entries"] == 0
@@ -0,0 +1,74 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from app import crud
+from app.cache import response_cache
+from .conftest import create_meeting_with_task
+from .test_data import get_valid_meeting_data, get_valid_task_data
+from .test_query_plans import explain
+
+
+def test_etag_changes_with_meeting_and_tasks(client):
+    meeting, task = create_meeting_with_task(client)
+    url = f"/api/meetings/{meeting['id']}"
+    response = client.get(url)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "no-cache"
+    assert "last-modified" in response.headers
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    # タスク一覧も同じ版で確認できる
+    assert client.get(f"{url}/tasks/", headers={"If-None-Match": etag}).status_code == 304
+
+    def changed():
+        nonlocal etag
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        etag = response.headers["etag"]
+        return response.json()
+
+    client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    assert changed()["tasks"][0]["status"] == "completed"
+    # 議事録だけの変更・タスクの削除でも版が変わる
+    client.put(url, json={**get_valid_meeting_data(), "date": meeting["date"], "transcript": "[00:00:20] 変更"})
+    assert changed()["transcript"] == "[00:00:20] 変更"
+    client.delete(f"/api/tasks/{task['id']}")
+    assert changed()["tasks"] == []
+
+
+def test_if_modified_since(client):
+    meeting, _ = create_meeting_with_task(client)
+    url = f"/api/meetings/{meeting['id']}"
+    last_modified = client.get(url).headers["last-modified"]
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    assert client.get(url, headers={"If-Modified-Since": earlier}).status_code == 200
+    # If-None-Matchがある場合はIf-Modified-Sinceより優先する
+    headers = {"If-None-Match": 'W/"0-0-0"', "If-Modified-Since": last_modified}
+    assert client.get(url, headers=headers).status_code == 200
+    assert client.get(url, headers={"If-Modified-Since": "invalid date"}).status_code == 200
+
+
+def test_not_modified_uses_only_an_index_lookup(client, db, count_queries):
+    meeting, _ = create_meeting_with_task(client)
+    url = f"/api/meetings/{meeting['id']}"
+    etag = client.get(url).headers["etag"]
+
+    # キャッシュにない場合も、会議の行・議事録を読まずに1回のクエリで304を返す
+    response_cache.clear()
+    with count_queries() as statements:
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert len(statements) == 1
+    plan = explain(db, statements[0], (meeting["id"],))
+    assert any("COVERING INDEX ix_meetings_id_updated_at" in detail for detail in plan)
+    assert any("COVERING INDEX ix_tasks_meeting_id_updated_at" in detail for detail in plan)
+
+    # 304で返した版は詳細から求める版と同じ
+    assert client.get(url).headers["etag"] == etag
+    assert crud.get_meeting_version(db, 9999) is None
+    assert client.get("/api/meetings/9999", headers={"If-None-Match": etag}).status_code == 404
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timezone, timedelta
 from app.crud import (
     create_meeting,
@@ -6,6 +7,7 @@ from app.crud import (
     get_tasks_by_meeting,
     update_task
 )
+from app import models
 from app.schemas import MeetingCreate, TaskCreate
 from app.models import Meeting, Task
 from app.utils import JST, to_utc
@@ -43,6 +45,33 @@ def test_get_meetings_crud(db):
     assert meetings[0]["start_time"] == meeting_data["start_time"]
     assert meetings[0]["end_time"] == meeting_data["end_time"]
 
+def test_participants_decoded_once_after_reload(db, monkeypatch):
+    meeting_data = get_valid_meeting_data()
+    create_meeting(db, MeetingCreate(**meeting_data))
+
+    # DBから読み直しても参加者が空にならない
+    db.expunge_all()
+    meetings = get_meetings(db, skip=0, limit=10)
+    assert meetings[0]["participants"] == meeting_data["participants"]
+
+    # 同じ値に対しては一度だけデコードし、キャッシュを返す
+    meeting = db.query(Meeting).first()
+    assert isinstance(meeting.participants, str)
+    decoded = []
+    monkeypatch.setattr(models, "deserialize_participants", lambda raw: decoded.append(raw) or json.loads(raw))
+    first = meeting.participants_list
+    assert meeting.participants_list == first
+    assert len(decoded) == 1
+
+    # 返したリストを変更してもキャッシュ（次に返す値）は変わらない
+    first.append("部外者")
+    assert meeting.participants_list == meeting_data["participants"]
+    assert len(decoded) == 1
+
+    # 値を変更するとキャッシュも更新される
+    meeting.participants = ["佐藤"]
+    assert meeting.participants_list == ["佐藤"]
+
 def test_create_task_crud(db):
     # 会議を作成
     meeting_data = get_valid_meeting_data()
@@ -100,4 +129,40 @@ def test_update_task_crud(db):
     
     assert updated_task.content == "更新されたタスク"
     assert updated_task.assignee == "鈴木"
-    assert updated_task.status == "completed"
\ No newline at end of file
+    assert updated_task.status == "completed"
+
+def test_get_meetings_query_count_is_constant(db, count_queries):
+    # タスク付きの会議を複数作成
+    for _ in range(6):
+        meeting = create_meeting(db, MeetingCreate(**get_valid_meeting_data()))
+        for _ in range(2):
+            task_data = get_valid_task_data()
+            task_data["meeting_id"] = meeting["id"]
+            create_task(db, task_data)
+
+    # ページサイズを増やしても発行されるSQLの数は変わらない
+    counts = []
+    for limit in (1, 3, 6):
+        db.expire_all()
+        with count_queries() as statements:
+            meetings = get_meetings(db, skip=0, limit=limit)
+        assert len(meetings) == limit
+        assert all(len(m["tasks"]) == 2 for m in meetings)
+        counts.append(len(statements))
+
+    assert counts == [2, 2, 2]
+
+
+def test_get_meetings_with_fields_selects_only_those_columns(db, count_queries):
+    for _ in range(3):
+        create_meeting(db, MeetingCreate(**{**get_valid_meeting_data(), "transcript": "議事録", "summary": "要約"}))
+    db.expunge_all()
+
+    with count_queries() as statements:
+        meetings = get_meetings(db, skip=0, limit=10, fields={"id", "title"})
+
+    assert meetings[0].keys() == {"id", "title"}
+    # 会議のSELECT 1回だけで、タスク・議事録は読み込まない
+    assert len(statements) == 1
+    assert "meetings.summary" not in statements[0]
+    assert "meetings.participants" not in statements[0]
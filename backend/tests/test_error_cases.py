@@ -14,6 +14,12 @@ def test_meeting_not_found(client):
     assert response.status_code == 404
     assert "会議が見つかりません" in response.json()["detail"]
 
+def test_invalid_cursor(client):
+    """不正なカーソルでの一覧取得テスト"""
+    response = client.get("/api/meetings/", params={"cursor": "不正なカーソル"})
+    assert response.status_code == 422
+    assert "カーソル" in response.json()["detail"]
+
 def test_invalid_meeting_data(client):
     """無効な会議データのテスト"""
     # タイトルが空のケース
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import orjson
+
+from app import crud, schemas
+from app.events import MEETING_DELETED, RESYNC, EventBroker, Subscription, event_broker
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+
+def parse_events(body: bytes):
+    """SSEの本文から (event, data) の一覧を取り出す（コメント行とretryは無視する）"""
+    events = []
+    for block in body.split(b"\n\n"):
+        fields = dict(line.split(b": ", 1) for line in block.split(b"\n") if line and not line.startswith(b":"))
+        if b"event" in fields:
+            events.append((fields[b"event"].decode(), orjson.loads(fields[b"data"])))
+    return events
+
+
+def test_broker_fans_out_from_other_threads():
+    broker = EventBroker(queue_size=10)
+
+    async def main():
+        subscriptions = [broker.subscribe(1) for _ in range(1000)]
+        other = broker.subscribe(2)
+        assert broker.snapshot()["subscribers"] == 1001
+        # crudはスレッドプールで動くため、別のスレッドから配信する
+        thread = threading.Thread(target=broker.publish, args=(1, "task.created", {"id": 5}))
+        thread.start()
+        thread.join()
+        events = [await subscription.get(timeout=1) for subscription in subscriptions]
+        assert set(events) == {("task.created", b'id: 1\nevent: task.created\ndata: {"id":5}\n\n')}
+        assert await other.get(timeout=0.01) is None
+        for subscription in subscriptions + [other]:
+            broker.unsubscribe(subscription)
+
+    asyncio.run(main())
+    assert broker.snapshot() == {"subscribers": 0, "meetings": 0, "published": 1, "resyncs": 0}
+    # 購読者がいなければ何もしない
+    broker.publish(1, "task.created", {"id": 6})
+    assert broker.snapshot()["published"] == 1
+
+
+def test_slow_subscriber_gets_resync():
+    broker = EventBroker(queue_size=3)
+
+    async def main():
+        slow = broker.subscribe(1)
+        fast = broker.subscribe(1)
+        for i in range(5):
+            broker.publish(1, "task.updated", {"id": i})
+            await asyncio.sleep(0)
+            assert (await fast.get(timeout=1))[0] == "task.updated"
+        # 溢れたイベントは捨てて resync だけを残し、その後のイベントは続けて届ける
+        assert (await slow.get(timeout=1))[0] == RESYNC
+        assert (await slow.get(timeout=1))[1].endswith(b'data: {"id":4}\n\n')
+        assert await slow.get(timeout=0.01) is None
+
+    asyncio.run(main())
+    assert broker.snapshot()["resyncs"] == 1
+
+
+def test_meeting_deleted_is_delivered_after_overflow():
+    broker = EventBroker(queue_size=3)
+
+    async def main():
+        slow = broker.subscribe(1)
+        for i in range(3):
+            broker.publish(1, "task.updated", {"id": i})
+        broker.publish(1, MEETING_DELETED, {"id": 1})
+        await asyncio.sleep(0)
+        # キューが溢れても meeting.deleted は捨てず、resync の後に届けて配信を終えられるようにする
+        assert (await slow.get(timeout=1))[0] == RESYNC
+        assert (await slow.get(timeout=1))[0] == MEETING_DELETED
+        assert await slow.get(timeout=0.01) is None
+
+        # resync と並べて入らない大きさのキューでも meeting.deleted は届く
+        tiny = Subscription(1, queue_size=1)
+        assert tiny.deliver(("task.updated", b"")) is True
+        assert tiny.deliver((MEETING_DELETED, b"")) is False
+        assert (await tiny.get(timeout=1))[0] == MEETING_DELETED
+
+    asyncio.run(main())
+    assert broker.snapshot()["resyncs"] == 1
+
+
+def test_crud_publishes_after_commit(db):
+    meeting = crud.create_meeting(db, schemas.MeetingCreate(**get_valid_meeting_data()))
+
+    async def main():
+        subscription = event_broker.subscribe(meeting["id"])
+        try:
+            def write():
+                task = crud.create_task(db, {**get_valid_task_data(), "meeting_id": meeting["id"]})
+                crud.patch_task(db, task.id, schemas.TaskUpdate(status="completed"))
+                crud.delete_task(db, task.id)
+                return task.id
+
+            task_id = await asyncio.get_running_loop().run_in_executor(None, write)
+            events = [await subscription.get(timeout=1) for _ in range(3)]
+            return task_id, [(event_type, orjson.loads(frame.split(b"data: ", 1)[1])) for event_type, frame in events]
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    task_id, events = asyncio.run(main())
+    assert [event_type for event_type, _ in events] == ["task.created", "task.updated", "task.deleted"]
+    assert events[0][1]["id"] == task_id
+    assert events[1][1]["status"] == "completed"
+    assert events[2][1] == {"id": task_id, "meeting_id": meeting["id"]}
+
+
+def test_event_stream_endpoint(client):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    url = f"/api/meetings/{meeting['id']}"
+    assert client.get("/api/meetings/9999/events").status_code == 404
+
+    result = {}
+    listener = threading.Thread(target=lambda: result.update(response=client.get(f"{url}/events")))
+    listener.start()
+    deadline = time.monotonic() + 5
+    while client.get("/api/metrics/events").json()["subscribers"] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    task = client.post(f"{url}/tasks/", json=get_valid_task_data()).json()
+    client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    client.patch(url, json={"title": "変更後のタイトル"})
+    client.delete(url)
+    # meeting.deleted を送ると配信を終える
+    listener.join(timeout=5)
+    assert not listener.is_alive()
+
+    response = result["response"]
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.content.startswith(b"retry: 3000\n\n")
+    events = parse_events(response.content)
+    assert [event_type for event_type, _ in events] == [
+        "task.created", "task.updated", "meeting.updated", "meeting.deleted",
+    ]
+    assert events[1][1]["status"] == "completed"
+    assert events[2][1]["id"] == meeting["id"]
+    assert client.get("/api/metrics/events").json()["subscribers"] == 0
@@ -0,0 +1,126 @@
+import csv
+import gzip
+import io
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from sqlalchemy import insert
+
+from app import models
+from app.export import accepts_gzip, export_rows
+from .conftest import create_meeting, test_engine
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+
+def read_csv(response):
+    # 先頭のBOMを除いて読む
+    return list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+
+
+def create_meetings(client, count):
+    meetings = []
+    for i in range(count):
+        meeting = create_meeting(client, title=f"会議{i}", participants=["田中", "鈴木"])
+        client.post(f"/api/meetings/{meeting['id']}/tasks/", json=get_valid_task_data())
+        meetings.append(meeting)
+    return meetings
+
+
+def test_export_meetings_ndjson_matches_api(client):
+    meetings = create_meetings(client, 3)
+    response = client.get("/api/export/meetings.ndjson", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="meetings.ndjson"'
+    assert "content-encoding" not in response.headers
+
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert response.content.endswith(b"\n")
+    # 日時の形式・参加者のリストは一覧のAPIと同じ（タスク・議事録は含めない）
+    listed = client.get("/api/meetings/").json()
+    assert rows == [{key: value for key, value in meeting.items() if key != "tasks"} for meeting in listed]
+    assert [row["id"] for row in rows] == [meeting["id"] for meeting in meetings]
+    assert rows[0]["participants"] == ["田中", "鈴木"]
+
+
+def test_export_tasks_csv(client):
+    meetings = create_meetings(client, 2)
+    response = client.get("/api/export/tasks.csv")
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    # Excelが文字コードを判定できるようBOMを付ける
+    assert response.content.startswith("\ufeffid,".encode())
+    rows = read_csv(response)
+    tasks = client.get(f"/api/meetings/{meetings[1]['id']}/tasks/").json()
+    assert len(rows) == 2
+    assert rows[1] == {key: "" if value is None else str(value) for key, value in tasks[0].items()}
+
+    meetings_csv = read_csv(client.get("/api/export/meetings.csv"))
+    assert meetings_csv[0]["participants"] == "田中;鈴木"
+    assert meetings_csv[0]["audio_file_path"] == ""
+
+
+def test_export_csv_neutralizes_formulas(client):
+    meeting = client.post("/api/meetings", json={
+        **get_valid_meeting_data(), "title": "=HYPERLINK(\"http://example.com\")", "participants": ["-田中"],
+    }).json()
+    for content in ("+1+1", "-2+3", "@SUM(A1)", "通常のタスク"):
+        client.post(f"/api/meetings/{meeting['id']}/tasks/", json={**get_valid_task_data(), "content": content})
+
+    # 数式として解釈される文字で始まる値は ' を付けて文字列にする（NDJSONはそのまま）
+    tasks = read_csv(client.get("/api/export/tasks.csv"))
+    assert [task["content"] for task in tasks] == ["'+1+1", "'-2+3", "'@SUM(A1)", "通常のタスク"]
+    meetings = read_csv(client.get("/api/export/meetings.csv"))
+    assert meetings[0]["title"] == "'=HYPERLINK(\"http://example.com\")"
+    assert meetings[0]["participants"] == "'-田中"
+    assert client.get("/api/export/meetings.ndjson").json()["title"].startswith("=")
+
+
+def test_export_gzip(client):
+    create_meetings(client, 2)
+    plain = client.get("/api/export/meetings.ndjson", headers={"Accept-Encoding": "identity"}).content
+    with client.stream("GET", "/api/export/meetings.ndjson", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        compressed = b"".join(response.iter_raw())
+    assert gzip.decompress(compressed) == plain
+
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0, identity")
+    assert not accepts_gzip(None)
+
+
+def test_export_rejects_unknown_resource(client):
+    assert client.get("/api/export/jobs.ndjson").status_code == 422
+    assert client.get("/api/export/meetings.xml").status_code == 422
+
+
+def test_export_memory_does_not_grow_with_rows(db):
+    base = datetime.now(timezone.utc) + timedelta(days=1)
+
+    def seed(start, count):
+        with test_engine.begin() as conn:
+            conn.execute(insert(models.Meeting.__table__), [
+                {
+                    "id": i, "title": f"会議{i}", "date": base, "start_time": "10:00", "end_time": "11:00",
+                    "participants": '["田中", "鈴木"]', "created_at": base, "updated_at": base,
+                }
+                for i in range(start, start + count)
+            ])
+
+    def peak_memory():
+        tracemalloc.start()
+        try:
+            rows = sum(chunk.count(b"\n") for chunk in export_rows(test_engine, "meetings", "ndjson", batch_size=200))
+            return rows, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    seed(1, 1000)
+    small_rows, small_peak = peak_memory()
+    seed(1001, 9000)
+    large_rows, large_peak = peak_memory()
+    assert (small_rows, large_rows) == (1000, 10000)
+    # 10倍の行数でも、使用するメモリは1回分（batch_size行）の読み込みとエンコードの分だけ
+    assert large_peak < small_peak * 1.5
@@ -0,0 +1,182 @@
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import crud
+from app.extraction import (
+    ActionItem,
+    ExtractionService,
+    LLMExtractor,
+    RuleBasedExtractor,
+    end_of_day,
+    get_extraction_service,
+    parse_due_date,
+    parse_llm_items,
+)
+from app.jobs import BackgroundJobService
+from app.utils import DATETIME_FORMAT, JST
+from .conftest import TestingSessionLocal, wait_for_job
+from .test_data import get_valid_meeting_data
+from .test_summarization import CharTokenizer
+
+# 2026-10-14（水）
+REFERENCE = date(2026, 10, 14)
+
+TRANSCRIPT = (
+    "[00:00:05] 本日の議題は予算です\n"
+    "[00:01:00] 田中さんは明日までに見積もりを作成してください。鈴木さんが会場を確認します\n"
+    "[00:02:00] 以上です"
+)
+
+
+@pytest.fixture
+def service(install_job_service):
+    return install_job_service(
+        get_extraction_service,
+        ExtractionService(extractor_factory=RuleBasedExtractor, session_factory=TestingSessionLocal),
+    )
+
+
+def test_parse_due_date():
+    assert parse_due_date("10月20日までに提出", REFERENCE) == date(2026, 10, 20)
+    assert parse_due_date("2027/1/5に報告", REFERENCE) == date(2027, 1, 5)
+    # 年のない日付が会議より前なら翌年
+    assert parse_due_date("3/1までに", REFERENCE) == date(2027, 3, 1)
+    assert parse_due_date("来週金曜までに", REFERENCE) == date(2026, 10, 23)
+    assert parse_due_date("今週の金曜日に", REFERENCE) == date(2026, 10, 16)
+    assert parse_due_date("明日までに", REFERENCE) == date(2026, 10, 15)
+    assert parse_due_date("明後日に", REFERENCE) == date(2026, 10, 16)
+    assert parse_due_date("3日後に", REFERENCE) == date(2026, 10, 17)
+    assert parse_due_date("月末までに", REFERENCE) == date(2026, 10, 31)
+    assert parse_due_date("13月40日", REFERENCE) is None
+    assert parse_due_date("資料を作成します", REFERENCE) is None
+
+
+def test_rule_based_extractor():
+    text = "- 予算案を共有する予定\n" + TRANSCRIPT
+    reference = datetime(2026, 10, 14, 1, 0)  # JSTの10:00
+    items = asyncio.run(RuleBasedExtractor().extract(text, ["田中", "鈴木"], reference))
+    assert items == [
+        ActionItem("予算案を共有する予定"),
+        ActionItem("田中さんは明日までに見積もりを作成してください。", "田中", end_of_day(date(2026, 10, 15))),
+        ActionItem("鈴木さんが会場を確認します", "鈴木"),
+    ]
+    # 期限はその日の終わり（JST）
+    assert items[1].due_date.astimezone(JST).strftime("%Y-%m-%d %H:%M") == "2026-10-15 23:59"
+
+
+def test_parse_llm_items():
+    response = "抽出結果です。\n```json\n" + json.dumps([
+        {"content": "見積もりを作成する", "assignee": "田中", "due_date": "2026-10-15"},
+        {"content": "会場を確認する", "assignee": "佐藤", "due_date": "未定"},
+        {"content": ""},
+    ], ensure_ascii=False) + "\n```"
+    assert parse_llm_items(response, ["田中", "鈴木"]) == [
+        ActionItem("見積もりを作成する", "田中", end_of_day(date(2026, 10, 15))),
+        # 参加者以外の担当者・解釈できない期限は空にする
+        ActionItem("会場を確認する"),
+    ]
+    with pytest.raises(ValueError):
+        parse_llm_items("該当なし", [])
+
+
+def test_llm_extractor_prompts_with_participants_and_date():
+    class Client:
+        model = "fake-model"
+        systems = []
+
+        async def complete(self, system, prompt):
+            self.systems.append(system)
+            return '[{"content": "見積もりを作成する", "assignee": "田中", "due_date": null}]'
+
+        async def aclose(self):
+            pass
+
+    client = Client()
+    extractor = LLMExtractor(client_factory=lambda: client, tokenizer_factory=lambda model: CharTokenizer(),
+                             chunk_tokens=60, concurrency=2)
+    items = asyncio.run(extractor.extract(TRANSCRIPT, ["田中", "鈴木"], datetime(2026, 10, 14, 1, 0)))
+    # 議事録は1行ずつ3チャンクに分かれ、チャンクごとに抽出する
+    assert items == [ActionItem("見積もりを作成する", "田中")] * 3
+    assert "田中、鈴木" in client.systems[0]
+    assert "2026-10-14" in client.systems[0]
+
+
+def test_extract_meeting_tasks(client, service):
+    data = {**get_valid_meeting_data(), "transcript": TRANSCRIPT, "summary": "- 予算案を共有する予定"}
+    meeting = client.post("/api/meetings", json=data).json()
+
+    response = client.post(f"/api/meetings/{meeting['id']}/tasks/extract")
+    assert response.status_code == 202
+    assert response.json()["kind"] == "task_extraction"
+    assert wait_for_job(client, response.json()["id"])["status"] == "completed"
+
+    tasks = client.get(f"/api/meetings/{meeting['id']}/tasks/").json()
+    assert [(task["content"], task["assignee"]) for task in tasks] == [
+        ("予算案を共有する予定", None),
+        ("田中さんは明日までに見積もりを作成してください。", "田中"),
+        ("鈴木さんが会場を確認します", "鈴木"),
+    ]
+    meeting_day = datetime.strptime(meeting["date"], DATETIME_FORMAT).date()
+    assert tasks[1]["due_date"] == f"{meeting_day + timedelta(days=1)}T23:59:00+0900"
+
+    # 登録したタスクは検索の索引にも反映される
+    assert [r["id"] for r in client.get("/api/search", params={"q": "見積もり"}).json()] == [meeting["id"]]
+
+    # 再実行しても同じタスクは重複して登録しない
+    job = client.post(f"/api/meetings/{meeting['id']}/tasks/extract").json()
+    assert wait_for_job(client, job["id"])["status"] == "completed"
+    assert len(client.get(f"/api/meetings/{meeting['id']}/tasks/").json()) == 3
+
+
+def test_extraction_job_fails_when_saving_tasks_fails(client, service, monkeypatch):
+    data = {**get_valid_meeting_data(), "transcript": TRANSCRIPT}
+    meeting = client.post("/api/meetings", json=data).json()
+
+    def broken_save(*args, **kwargs):
+        raise RuntimeError("タスクを保存できません")
+
+    # 結果の保存で失敗しても実行中のまま残らず、次のジョブを登録できる
+    monkeypatch.setattr(crud, "save_extracted_tasks", broken_save)
+    job = client.post(f"/api/meetings/{meeting['id']}/tasks/extract").json()
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "failed"
+    assert "タスクを保存できません" in job["error"]
+
+    monkeypatch.undo()
+    retry = client.post(f"/api/meetings/{meeting['id']}/tasks/extract").json()
+    assert retry["id"] != job["id"]
+    assert wait_for_job(client, retry["id"])["status"] == "completed"
+
+
+def test_job_service_must_implement_execute():
+    class Incomplete(BackgroundJobService):
+        name = "incomplete"
+
+    # 実装し忘れはジョブの実行時ではなく作成時にわかる
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_extract_tasks_without_text(client, service):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    assert client.post(f"/api/meetings/{meeting['id']}/tasks/extract").status_code == 422
+    assert client.post("/api/meetings/9999/tasks/extract").status_code == 404
+
+
+def test_extracted_tasks_are_inserted_in_one_statement(client, db, count_queries):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    job = crud.create_job(db, meeting_id=meeting["id"], kind="task_extraction")
+    items = [ActionItem(f"作業{i}を行う", "田中", end_of_day(date(2026, 10, 15))) for i in range(500)]
+
+    with count_queries() as statements:
+        crud.save_extracted_tasks(db, job_id=job["id"], meeting_id=meeting["id"], items=items)
+
+    inserts = [s for s in statements if s.startswith("INSERT INTO tasks")]
+    assert len(inserts) == 1
+    tasks = crud.get_tasks_by_meeting(db, meeting["id"])
+    assert len(tasks) == 500
+    assert tasks[0].content == "作業0を行う"
+    assert crud.get_job(db, job["id"])["status"] == "completed"
@@ -0,0 +1,152 @@
+import io
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy.exc import OperationalError
+
+from app import crud, models
+from app.importer import import_lines, parse_datetime, run_import, write_checkpoint
+from .test_data import get_valid_meeting_data
+
+
+def ndjson(items) -> bytes:
+    return b"".join(orjson.dumps(item) + b"\n" for item in items)
+
+
+def meeting_line(title, **fields):
+    return {"title": title, "date": "2020-04-01T10:00:00+09:00", "start_time": "10:00", "end_time": "11:00", **fields}
+
+
+def test_import_meetings_with_tasks(client):
+    body = ndjson([
+        meeting_line(
+            "移行した会議",
+            participants=["田中", "鈴木"],
+            transcript="[00:00:10] 予算を確認します",
+            tasks=[{"content": "見積もりを出す", "assignee": "田中", "due_date": "2020-04-10"}],
+        ),
+        meeting_line("時刻が不正", end_time="09:00"),
+        meeting_line("担当者が不正", tasks=[{"content": "確認", "assignee": "田中 太郎"}]),
+    ]) + b"\n{not json\n" + ndjson([meeting_line("2件目")])
+    response = client.post("/api/import/meetings", content=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert result["next_offset"] == 6
+    assert result["errors"] == [
+        {"line": 2, "detail": "end_time: 終了時刻は開始時刻より後にしてください"},
+        {"line": 3, "detail": "tasks.0.assignee: 担当者IDは英数字・アンダースコア・ハイフン・ひらがな・カタカナ・漢字のみ使用可能です"},
+        {"line": 5, "detail": "JSONの形式が不正です"},
+    ]
+
+    # 過去の日付のまま登録され、参加者の検索・議事録・タスクも作成される
+    meeting = client.get("/api/participants/鈴木/meetings").json()[0]
+    assert meeting["title"] == "移行した会議"
+    assert meeting["date"] == "2020-04-01T10:00:00+0900"
+    detail = client.get(f"/api/meetings/{meeting['id']}").json()
+    assert detail["transcript"] == "[00:00:10] 予算を確認します"
+    assert detail["tasks"][0]["content"] == "見積もりを出す"
+    assert detail["tasks"][0]["status"] == "pending"
+    assert [item["title"] for item in client.get("/api/search", params={"q": "予算"}).json()] == ["移行した会議"]
+
+
+def test_import_reads_exported_lines_and_resumes_from_offset(client):
+    for title in ("会議A", "会議B"):
+        client.post("/api/meetings", json={**get_valid_meeting_data(), "title": title})
+    exported = client.get("/api/export/meetings.ndjson").content
+    # エクスポートした行（id・作成日時を含む）をそのまま読み、offset行目までは読み飛ばす
+    result = client.post("/api/import/meetings", params={"offset": 1}, content=exported).json()
+    assert result == {"imported": 1, "failed": 0, "errors": [], "next_offset": 2}
+    titles = [meeting["title"] for meeting in client.get("/api/meetings/").json()]
+    assert titles == ["会議A", "会議B", "会議B"]
+
+
+def test_import_rejects_too_long_line(client, monkeypatch):
+    from app.main import settings
+    monkeypatch.setattr(settings, "IMPORT_MAX_LINE_BYTES", 200)
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 1)
+    body = ndjson([meeting_line("短い会議"), meeting_line("長い会議", summary="要約" * 100), meeting_line("最後の会議")])
+    response = client.post("/api/import/meetings", content=body)
+    assert response.status_code == 413
+    # それまでにコミットした行数と、長すぎる行の行番号を返す
+    result = response.json()
+    assert result["detail"].startswith("2行目: ")
+    assert (result["imported"], result["next_offset"]) == (1, 1)
+
+    # 長すぎる行を読み飛ばして再開する
+    result = client.post("/api/import/meetings", params={"offset": 2}, content=body).json()
+    assert result == {"imported": 1, "failed": 0, "errors": [], "next_offset": 3}
+    assert [m["title"] for m in client.get("/api/meetings/").json()] == ["短い会議", "最後の会議"]
+
+
+def test_import_resumes_after_database_error(client, monkeypatch):
+    from app.main import settings
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    import_meetings = crud.import_meetings
+    calls = []
+
+    def flaky_import(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return import_meetings(db, rows)
+
+    body = ndjson([meeting_line(f"会議{i}") for i in range(5)])
+    monkeypatch.setattr(crud, "import_meetings", flaky_import)
+    response = client.post("/api/import/meetings", content=body)
+    # 2つ目のチャンクで失敗しても、1つ目のチャンクのコミット済みの行数を返す
+    assert response.status_code == 500
+    assert response.json() == {
+        "detail": "データベース処理中にエラーが発生しました",
+        "imported": 2, "failed": 0, "errors": [], "next_offset": 2,
+    }
+
+    monkeypatch.setattr(crud, "import_meetings", import_meetings)
+    result = client.post("/api/import/meetings", params={"offset": 2}, content=body).json()
+    assert result == {"imported": 3, "failed": 0, "errors": [], "next_offset": 5}
+    assert [m["title"] for m in client.get("/api/meetings/").json()] == [f"会議{i}" for i in range(5)]
+
+
+def test_import_commits_each_chunk(db):
+    lines = ndjson([meeting_line(f"会議{i}") for i in range(5)] + [meeting_line("不正", start_time="10:05")])
+    progress = []
+    result = import_lines(
+        db, io.BytesIO(lines), chunk_size=2, max_errors=0,
+        on_chunk=lambda p, errors: progress.append((p.next_offset, db.query(models.Meeting).count(), errors)),
+    )
+    # チャンクごとにコミットされ、コミットした行数が next_offset になる
+    assert [(offset, count) for offset, count, _ in progress] == [(2, 2), (4, 4), (6, 5), (6, 5)]
+    assert progress[2][2] == [{"line": 6, "detail": "start_time: 時刻は10分単位で指定してください"}]
+    assert result == {"imported": 5, "failed": 1, "errors": [], "next_offset": 6}
+
+
+def test_run_import_resumes_from_checkpoint(db, tmp_path):
+    path = tmp_path / "meetings.ndjson"
+    path.write_bytes(ndjson([meeting_line(f"会議{i}") for i in range(4)] + [{"title": "日付なし"}]))
+    checkpoint = str(tmp_path / "meetings.checkpoint")
+    # 2行目までをコミットした後に中断した
+    write_checkpoint(checkpoint, 2)
+    errors = io.StringIO()
+    result = run_import(db, str(path), checkpoint, chunk_size=2, errors_out=errors)
+    assert result == {"imported": 2, "failed": 1, "next_offset": 5}
+    assert [m.title for m in db.query(models.Meeting).order_by(models.Meeting.id)] == ["会議2", "会議3"]
+    assert orjson.loads(errors.getvalue()) == {"line": 5, "detail": "start_time: 必須の項目です"}
+    assert orjson.loads(open(checkpoint).read()) == {"next_offset": 5}
+    # 完了後に再実行しても登録し直さない
+    assert run_import(db, str(path), checkpoint, errors_out=errors)["imported"] == 0
+
+
+def test_parse_datetime():
+    expected = datetime(2020, 4, 1, 1, 0, tzinfo=timezone.utc)
+    for value in ("2020-04-01T10:00:00+0900", "2020-04-01T10:00+09:00", "2020-04-01 01:00:00Z", "2020-04-01T10:00"):
+        assert parse_datetime(value) == expected
+    assert parse_datetime("2020-04-01") == datetime(2020, 3, 31, 15, 0, tzinfo=timezone.utc)
+    assert parse_datetime("2020-04-01T10:00:00.5+09:00").microsecond == 500000
+    for value in ("2020-02-30", "2020/04/01", 20200401):
+        try:
+            parse_datetime(value)
+        except Exception as e:
+            assert "無効な日付形式です" in e.message
+        else:
+            raise AssertionError(value)
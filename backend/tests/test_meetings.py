@@ -2,8 +2,10 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from app.models import Meeting
 from app.utils import JST, to_utc
 from .test_data import (
+    get_future_date,
     get_valid_meeting_data,
     get_valid_task_data,
     get_invalid_meeting_data,
@@ -63,6 +65,42 @@ class TestMeetings:
         assert len(data) > 0
         assert data[0]["title"] == meeting_data["title"]
 
+    def test_get_meetings_includes_tasks(self, client):
+        # 会議とタスクを作成
+        meeting_data = get_valid_meeting_data()
+        meeting_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+        task_data = get_valid_task_data()
+        client.post(f"/api/meetings/{meeting_id}/tasks/", json=task_data)
+
+        # 一覧でもタスクが返る
+        response = client.get("/api/meetings/")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data[0]["tasks"]) == 1
+        assert data[0]["tasks"][0]["content"] == task_data["content"]
+
+    def test_get_meetings_cursor_pagination(self, client):
+        # 日付が逆順になるように会議を作成
+        for days in [5, 4, 3, 2, 1]:
+            meeting_data = get_valid_meeting_data()
+            meeting_data["date"] = get_future_date(days)
+            meeting_data["title"] = f"会議{days}"
+            client.post("/api/meetings", json=meeting_data)
+
+        # カーソルを辿って全ページを取得
+        titles = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get("/api/meetings/", params={"cursor": cursor, "limit": 2})
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            titles.extend(m["title"] for m in page)
+            cursor = response.headers.get("X-Next-Cursor")
+
+        # 日付順にすべての会議が重複なく返る
+        assert titles == ["会議1", "会議2", "会議3", "会議4", "会議5"]
+
     def test_get_meeting_by_id(self, client):
         # 会議を作成
         meeting_data = get_valid_meeting_data()
@@ -76,6 +114,30 @@ class TestMeetings:
         assert data["id"] == meeting_id
         assert data["title"] == meeting_data["title"]
 
+    def test_meeting_dates_are_formatted_in_jst(self, client):
+        meeting_data = get_valid_meeting_data()
+        meeting_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+
+        response = client.get(f"/api/meetings/{meeting_id}")
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        # 入力したJSTの日時がそのままの形式で返る
+        assert data["date"] == meeting_data["date"]
+        assert data["created_at"].endswith("+0900")
+
+    def test_get_past_meeting(self, client, db):
+        # 日付が過ぎた会議も取得できる
+        past = datetime.now(JST) - timedelta(days=7)
+        meeting = Meeting(title="過去の会議", date=to_utc(past), start_time="10:00",
+                          end_time="11:00", participants=["田中"])
+        db.add(meeting)
+        db.commit()
+
+        response = client.get(f"/api/meetings/{meeting.id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "過去の会議"
+        assert client.get("/api/meetings/").status_code == 200
+
     def test_update_meeting(self, client):
         # 会議を作成
         meeting_data = get_valid_meeting_data()
@@ -105,6 +167,103 @@ class TestMeetings:
         get_response = client.get(f"/api/meetings/{meeting_id}")
         assert get_response.status_code == 404
 
+    def test_get_participant_meetings(self, client):
+        # 参加者の異なる会議を作成
+        meeting_data = get_valid_meeting_data()
+        meeting_data["participants"] = ["田中", "佐藤"]
+        tanaka_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+        meeting_data["participants"] = ["鈴木"]
+        suzuki_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+
+        response = client.get("/api/participants/田中/meetings")
+        assert response.status_code == 200
+        assert [m["id"] for m in response.json()] == [tanaka_id]
+
+        # 参加者を更新すると検索結果も変わる
+        update_data = get_valid_meeting_data()
+        update_data["participants"] = ["田中"]
+        client.put(f"/api/meetings/{suzuki_id}", json=update_data)
+        response = client.get("/api/participants/田中/meetings")
+        assert sorted(m["id"] for m in response.json()) == sorted([tanaka_id, suzuki_id])
+        assert client.get("/api/participants/鈴木/meetings").json() == []
+
+    def test_transcript_is_omitted_from_lists(self, client):
+        meeting_data = get_valid_meeting_data()
+        meeting_data["transcript"] = "[00:00:05] 開始します\n[00:10:00] 予算の確認"
+        meeting_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+
+        # 一覧には議事録の本文を含めない（指定した場合のみ含める）
+        listed = client.get("/api/meetings/").json()[0]
+        assert "transcript" not in listed
+        listed = client.get("/api/meetings/", params={"include_transcript": True}).json()[0]
+        assert listed["transcript"] == meeting_data["transcript"]
+
+        detail = client.get(f"/api/meetings/{meeting_id}").json()
+        assert detail["transcript"] == meeting_data["transcript"]
+
+        # transcriptを送信しない更新では議事録を残す
+        update_data = get_valid_meeting_data()
+        del update_data["transcript"]
+        update_data["title"] = "更新後の会議"
+        updated = client.put(f"/api/meetings/{meeting_id}", json=update_data).json()
+        assert updated["transcript"] == meeting_data["transcript"]
+
+    def test_get_transcript_range(self, client):
+        meeting_data = get_valid_meeting_data()
+        meeting_data["transcript"] = "\n".join(
+            f"[00:{minute:02d}:00] {minute}分の発言" for minute in range(0, 60, 5)
+        )
+        meeting_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+
+        response = client.get(f"/api/meetings/{meeting_id}/transcript", params={"from": 600, "to": 1200})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meeting_id"] == meeting_id
+        assert [segment["text"] for segment in data["segments"]] == ["10分の発言", "15分の発言"]
+        assert data["segments"][0] == {"start": 600.0, "end": 900.0, "text": "10分の発言"}
+
+        # 範囲の途中から始めても、その時刻を含むセグメントから返す
+        data = client.get(f"/api/meetings/{meeting_id}/transcript", params={"from": 1000}).json()
+        assert data["segments"][0]["text"] == "15分の発言"
+        assert data["segments"][-1]["text"] == "55分の発言"
+
+        data = client.get(f"/api/meetings/{meeting_id}/transcript").json()
+        assert len(data["segments"]) == 12
+
+        assert client.get(f"/api/meetings/{meeting_id}/transcript", params={"from": 600, "to": 600}).status_code == 422
+        assert client.get("/api/meetings/9999/transcript").status_code == 404
+
+    def test_get_meetings_with_fields(self, client):
+        meeting_data = get_valid_meeting_data()
+        meeting_data["transcript"] = "[00:00:05] 開始します"
+        meeting_data["summary"] = "予算を確認した"
+        meeting_id = client.post("/api/meetings", json=meeting_data).json()["id"]
+        client.post(f"/api/meetings/{meeting_id}/tasks/", json=get_valid_task_data())
+
+        fields = "id,title,date,start_time,end_time"
+        response = client.get("/api/meetings/", params={"fields": fields})
+        assert response.status_code == 200
+        assert list(response.json()[0]) == ["id", "title", "date", "start_time", "end_time"]
+
+        response = client.get("/api/meetings/", params={"fields": "title,tasks,transcript", "cursor": ""})
+        meeting = response.json()[0]
+        assert list(meeting) == ["title", "transcript", "tasks"]
+        assert meeting["transcript"] == meeting_data["transcript"]
+        assert meeting["tasks"][0]["content"] == get_valid_task_data()["content"]
+
+        response = client.get(f"/api/meetings/{meeting_id}", params={"fields": "id, summary, participants"})
+        assert response.json() == {
+            "id": meeting_id,
+            "participants": meeting_data["participants"],
+            "summary": meeting_data["summary"],
+        }
+
+    def test_get_meetings_with_unknown_fields(self, client):
+        response = client.get("/api/meetings/", params={"fields": "id,password"})
+        assert response.status_code == 422
+        assert "password" in response.json()["detail"]
+        assert client.get("/api/meetings/1", params={"fields": ","}).status_code == 422
+
 class TestTasks:
     def test_create_task(self, client):
         # 会議を作成
@@ -0,0 +1,121 @@
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+
+def test_upgrade_creates_schema(alembic_config):
+    command.upgrade(alembic_config, "head")
+
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    try:
+        inspector = inspect(engine)
+        assert {"meetings", "tasks", "meeting_participants", "jobs", "transcript_segments", "meeting_search", "meeting_task_search", "summary_cache"} <= set(inspector.get_table_names())
+        meeting_indexes = {index["name"] for index in inspector.get_indexes("meetings")}
+        assert {"ix_meetings_date_id", "ix_meetings_id_updated_at"} <= meeting_indexes
+        task_indexes = {index["name"] for index in inspector.get_indexes("tasks")}
+        assert {"ix_tasks_meeting_id", "ix_tasks_assignee_status", "ix_tasks_due_date", "ix_tasks_meeting_id_updated_at"} <= task_indexes
+    finally:
+        engine.dispose()
+
+    # 初期状態まで戻せる
+    command.downgrade(alembic_config, "base")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    try:
+        assert "meetings" not in inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
+
+
+def test_transcripts_are_moved_into_segments(alembic_config):
+    command.upgrade(alembic_config, "6a2f4c8d9e13")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO meetings (id, title, start_time, end_time, transcript) "
+                "VALUES (1, '定例', '10:00', '11:00', :transcript), (2, 'メモ', '10:00', '11:00', '手入力の議事録')"
+            ), {"transcript": "[00:00:00] 開始\n[00:01:30] 議題1"})
+
+        command.upgrade(alembic_config, "head")
+        assert "transcript" not in {c["name"] for c in inspect(engine).get_columns("meetings")}
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT meeting_id, position, start_seconds, end_seconds, text "
+                "FROM transcript_segments ORDER BY meeting_id, position"
+            )).all()
+        assert [tuple(row) for row in rows] == [
+            (1, 0, 0.0, 90.0, "開始"),
+            (1, 1, 90.0, None, "議題1"),
+            (2, 0, None, None, "手入力の議事録"),
+        ]
+
+        # 戻すと元のテキストに復元される
+        command.downgrade(alembic_config, "6a2f4c8d9e13")
+        with engine.connect() as conn:
+            transcripts = dict(conn.execute(text("SELECT id, transcript FROM meetings")).all())
+        assert transcripts == {1: "[00:00:00] 開始\n[00:01:30] 議題1", 2: "手入力の議事録"}
+    finally:
+        engine.dispose()
+
+
+def test_search_index_is_backfilled(alembic_config):
+    command.upgrade(alembic_config, "b3d9e07f5a21")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO meetings (id, title, start_time, end_time, summary) "
+                "VALUES (1, '予算会議', '10:00', '11:00', '広告費を見直す'), (2, 'メモ', '10:00', '11:00', NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO transcript_segments (meeting_id, position, text) VALUES (1, 0, 'Q3の売上')"
+            ))
+            conn.execute(text("INSERT INTO tasks (meeting_id, content, status) VALUES (1, '請求書を発行', 'pending')"))
+
+        command.upgrade(alembic_config, "e41c7a9b2d56")
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT rowid, title, transcript, summary, tasks FROM meeting_search ORDER BY rowid"
+            )).all()
+        assert [tuple(row) for row in rows] == [
+            (1, "予算 算会 会議", "q3 の売 売上", "広告 告費 費を を見 見直 直す", "請求 求書 書を を発 発行"),
+            (2, "メモ", "", "", ""),
+        ]
+    finally:
+        engine.dispose()
+
+
+def test_task_search_is_split_from_meeting_search(alembic_config):
+    command.upgrade(alembic_config, "a3d8c5f7e912")
+    engine = create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO meetings (id, title, start_time, end_time) "
+                "VALUES (1, '予算会議', '10:00', '11:00'), (2, 'メモ', '10:00', '11:00')"
+            ))
+            conn.execute(text(
+                "INSERT INTO transcript_segments (meeting_id, position, text) VALUES (1, 0, '売上の確認')"
+            ))
+            conn.execute(text("INSERT INTO tasks (meeting_id, content, status) VALUES (1, '請求書を発行', 'pending')"))
+
+        command.upgrade(alembic_config, "c7e2a9f4b318")
+        with engine.connect() as conn:
+            documents = conn.execute(text("SELECT rowid, title, transcript, summary FROM meeting_search ORDER BY rowid")).all()
+            tasks = conn.execute(text("SELECT rowid, tasks FROM meeting_task_search ORDER BY rowid")).all()
+        assert [tuple(row) for row in documents] == [(1, "予算 算会 会議", "売上 上の の確 確認", ""), (2, "メモ", "", "")]
+        assert [tuple(row) for row in tasks] == [(1, "請求 求書 書を を発 発行")]
+
+        # 戻すとタスクを含む1つの索引に戻る
+        command.downgrade(alembic_config, "a3d8c5f7e912")
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT rowid, tasks FROM meeting_search ORDER BY rowid")).all()
+        assert "meeting_task_search" not in inspect(engine).get_table_names()
+        assert [tuple(row) for row in rows] == [(1, "請求 求書 書を を発 発行"), (2, "")]
+    finally:
+        engine.dispose()
+
+
+def test_autogenerate_ignores_search_index(alembic_config):
+    command.upgrade(alembic_config, "head")
+    # モデルとマイグレーションの結果に差分がなく、索引のテーブルを削除するマイグレーションも生成されない
+    command.check(alembic_config)
@@ -0,0 +1,78 @@
+from .conftest import create_meeting_with_task
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+
+def test_patch_meeting(client):
+    meeting, _ = create_meeting_with_task(client)
+    response = client.patch(f"/api/meetings/{meeting['id']}", json={"title": "予算会議", "participants": ["佐藤"]})
+    assert response.status_code == 200
+    patched = response.json()
+    assert patched["title"] == "予算会議"
+    assert patched["participants"] == ["佐藤"]
+    # 送信しなかった項目は変わらない（議事録・タスクはレスポンスに含めない）
+    assert patched["start_time"] == meeting["start_time"]
+    assert "transcript" not in patched and "tasks" not in patched
+
+    current = client.get(f"/api/meetings/{meeting['id']}").json()
+    assert current["title"] == "予算会議"
+    assert current["transcript"] == "[00:00:10] 広告費を確認します"
+    assert len(current["tasks"]) == 1
+    assert client.get("/api/participants/佐藤/meetings").json()[0]["id"] == meeting["id"]
+    assert client.get("/api/participants/田中/meetings").json() == []
+
+    # 議事録を送信した場合はセグメントと検索の索引を置き換える
+    patched = client.patch(f"/api/meetings/{meeting['id']}", json={"transcript": "[00:00:20] 会場を予約します"}).json()
+    assert patched["transcript"] == "[00:00:20] 会場を予約します"
+    assert [r["id"] for r in client.get("/api/search", params={"q": "会場"}).json()] == [meeting["id"]]
+    assert client.get("/api/search", params={"q": "広告費"}).json() == []
+
+
+def test_patch_meeting_validates_only_sent_fields(client):
+    meeting, _ = create_meeting_with_task(client)
+    url = f"/api/meetings/{meeting['id']}"
+    assert client.patch(url, json={"title": None}).status_code == 422
+    assert client.patch(url, json={"start_time": "10:05"}).status_code == 422
+    assert client.patch(url, json={}).status_code == 422
+    # 片方だけの時刻は保存済みの値と合わせて検証する（開始10:00）
+    assert client.patch(url, json={"end_time": "09:00"}).status_code == 422
+    assert client.patch(url, json={"end_time": "14:00"}).status_code == 422
+    assert client.patch(url, json={"end_time": "12:00"}).json()["end_time"] == "12:00"
+    assert client.patch("/api/meetings/9999", json={"title": "なし"}).status_code == 404
+    assert client.patch("/api/meetings/9999", json={"end_time": "12:00"}).status_code == 404
+
+
+def test_patch_task(client):
+    meeting, task = create_meeting_with_task(client)
+    response = client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    assert response.status_code == 200
+    patched = response.json()
+    assert patched["status"] == "completed"
+    assert patched["content"] == task["content"]
+    assert patched["due_date"] == task["due_date"]
+
+    assert client.patch(f"/api/tasks/{task['id']}", json={"status": "done"}).status_code == 422
+    assert client.patch(f"/api/tasks/{task['id']}", json={"content": None}).status_code == 422
+    assert client.patch(f"/api/tasks/{task['id']}", json={}).status_code == 422
+    assert client.patch("/api/tasks/9999", json={"status": "completed"}).status_code == 404
+
+    # 内容を変更した場合は検索の索引に反映される
+    client.patch(f"/api/tasks/{task['id']}", json={"content": "見積もりを作成する"})
+    assert [r["id"] for r in client.get("/api/search", params={"q": "見積もり"}).json()] == [meeting["id"]]
+
+
+def test_patch_issues_a_single_update_without_select(client, count_queries):
+    meeting, task = create_meeting_with_task(client)
+
+    with count_queries() as statements:
+        assert client.patch(f"/api/tasks/{task['id']}", json={"status": "completed"}).status_code == 200
+    queries = [s for s in statements if s.split()[0] in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+    assert len(queries) == 1
+    assert queries[0].startswith("UPDATE tasks SET status=")
+    assert "RETURNING" in queries[0]
+
+    with count_queries() as statements:
+        url = f"/api/meetings/{meeting['id']}"
+        assert client.patch(url, json={"start_time": "13:00", "end_time": "14:00"}).status_code == 200
+    queries = [s for s in statements if s.split()[0] in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+    assert len(queries) == 1
+    assert queries[0].startswith("UPDATE meetings SET start_time=")
@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.pool_metrics import PoolMetrics, attach_pool_listeners, instrumented_pool_class
+from .conftest import get_test_settings
+
+
+def test_pool_metrics_track_checkouts():
+    metrics = PoolMetrics()
+    engine = create_engine(
+        get_test_settings().DATABASE_URL,
+        poolclass=instrumented_pool_class(metrics),
+        pool_size=2,
+        max_overflow=1,
+    )
+    attach_pool_listeners(engine, metrics)
+    try:
+        # プールサイズを超えて接続を取得するとoverflowが増える
+        connections = [engine.connect() for _ in range(3)]
+        for conn in connections:
+            conn.execute(text("SELECT 1"))
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["checked_out"] == 3
+        assert snapshot["overflow"] == 1
+        assert snapshot["connects"] == 3
+
+        for conn in connections:
+            conn.close()
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["checkouts"] == 3
+        assert snapshot["checkout_latency_ms_histogram"]["+Inf"] == 3
+
+        # dispose()でプールが作り直されても計測値は引き継がれる
+        engine.dispose()
+        assert isinstance(engine.pool, QueuePool)
+        with engine.connect():
+            pass
+        assert metrics.snapshot(engine.pool)["checkouts"] == 4
+    finally:
+        engine.dispose()
+
+
+def test_read_pool_metrics(client):
+    response = client.get("/api/metrics/pool")
+    assert response.status_code == 200
+    data = response.json()["sync"]
+    assert "checked_out" in data
+    assert "checkout_latency_ms_histogram" in data
@@ -0,0 +1,79 @@
+"""crudが発行するすべてのクエリの実行計画を確認するインデックスアドバイザー"""
+import re
+
+from sqlalchemy import event
+
+from app import crud
+from app.schemas import MeetingCreate, TaskCreate
+from .conftest import test_engine
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+# 一覧取得のように全件走査が仕様上避けられないクエリ
+FULL_SCAN_ALLOWED = {"get_meetings"}
+
+# インデックスを使わないテーブル走査（"SCAN tasks" など）。
+# FTS5の仮想テーブルは "VIRTUAL TABLE INDEX 0:=" のように制約があれば索引で検索している
+FULL_SCAN = re.compile(
+    r"^SCAN (\w+)\b(?! USING (COVERING )?INDEX| USING INTEGER PRIMARY KEY| VIRTUAL TABLE INDEX \d+:\S)"
+)
+
+
+def explain(db, statement, parameters):
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[3] for row in rows]
+
+
+def run_crud_workload(db):
+    """crudの各関数を呼び出し、関数名ごとに発行されたSQLを記録する"""
+    captured = {}
+    current = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            current.append((statement, parameters))
+
+    def call(name, *args, **kwargs):
+        current.clear()
+        result = getattr(crud, name)(db, *args, **kwargs)
+        captured[name] = list(current)
+        return result
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        meeting_data = {**get_valid_meeting_data(), "transcript": "[00:00:00] 開始\n[00:05:00] 議題"}
+        meeting = call("create_meeting", MeetingCreate(**meeting_data))
+        call("create_meeting", MeetingCreate(**get_valid_meeting_data()))
+        call("get_meetings", skip=0, limit=10)
+        _, cursor = call("get_meetings_after", cursor=None, limit=1)
+        call("get_meetings_after", cursor=cursor, limit=1)
+        call("get_meeting_by_id", meeting["id"])
+        call("get_meeting_detail", meeting["id"])
+        call("get_meeting_version", meeting["id"])
+        call("get_transcript_segments", meeting["id"], start=60.0, end=600.0)
+        call("get_meetings_by_participant", "田中")
+        call("update_meeting", meeting["id"], MeetingCreate(**meeting_data))
+        task_data = {**get_valid_task_data(), "meeting_id": meeting["id"]}
+        task = call("create_task", task_data)
+        call("get_tasks_by_meeting", meeting["id"])
+        call("update_task", task.id, TaskCreate(**get_valid_task_data()))
+        call("delete_task", task.id)
+        call("delete_meeting", meeting["id"])
+    finally:
+        event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def test_crud_queries_are_index_backed(db):
+    captured = run_crud_workload(db)
+    assert captured
+
+    problems = []
+    for name, statements in captured.items():
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        for statement, parameters in statements:
+            for detail in explain(db, statement, parameters):
+                if FULL_SCAN.match(detail):
+                    problems.append(f"{name}: {detail}\n  {statement}")
+
+    assert not problems, "インデックスを使わないクエリがあります:\n" + "\n".join(problems)
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 import pytest
-from app.schemas import MeetingCreate, TaskCreate
+from app.schemas import Meeting, MeetingCreate, TaskCreate
 from pydantic import ValidationError as PydanticValidationError
 from app.exceptions import ValidationError as AppValidationError
 
@@ -53,4 +53,30 @@ with pytest.raises(AppValidationError):
             assignee="田中",
             due_date="2028-02-15T10:00:00",
             status="invalid_status"  # 許可されていないステータス
-        )
\ No newline at end of file
+        )
+
+
+def test_meeting_read_model_skips_input_validation():
+    # 過去の日付・期限切れのタスクでもレスポンス用モデルは作成できる
+    past = datetime.now() - timedelta(days=30)
+    meeting = Meeting.model_validate({
+        "id": 1,
+        "title": "過去の会議",
+        "date": past,
+        "start_time": "10:00",
+        "end_time": "11:00",
+        "participants": ["田中"],
+        "created_at": past,
+        "updated_at": past,
+        "tasks": [{
+            "id": 1,
+            "meeting_id": 1,
+            "content": "期限切れのタスク",
+            "due_date": past,
+            "status": "pending",
+            "created_at": past,
+            "updated_at": past,
+        }],
+    })
+    assert meeting.date == past
+    assert meeting.tasks[0].due_date == past
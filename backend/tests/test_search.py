@@ -0,0 +1,98 @@
+from app import search
+from .conftest import create_meeting
+from .test_data import get_valid_meeting_data, get_valid_task_data
+
+
+def search_ids(client, q, **params):
+    response = client.get("/api/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()]
+
+
+def test_tokenize_uses_bigrams_for_japanese():
+    assert search.tokenize("予算会議 Q3 Review") == "予算 算会 会議 q3 review"
+    # 全角英数字も半角と同じ語になる
+    assert search.tokenize("ＡＰＩ設計") == "api 設計"
+    assert search.build_query("予算会議 api", "sqlite") == '"予算 算会 会議" AND "api"'
+    assert search.build_query("予 api", "postgresql") == "予:* & api"
+    assert search.build_query("!?", "sqlite") is None
+
+
+def test_search_meetings(client):
+    budget = create_meeting(client, title="予算会議", transcript="[00:00:10] 来期の広告費を確認します")
+    ads = create_meeting(client, title="定例", summary="広告費の見直しを決定")
+    other = create_meeting(client, title="採用面談")
+
+    assert search_ids(client, "予算") == [budget["id"]]
+    assert sorted(search_ids(client, "広告費")) == sorted([budget["id"], ads["id"]])
+    # すべての語を含む会議だけ
+    assert search_ids(client, "広告費 見直し") == [ads["id"]]
+    # 語の並びが一致しない場合はヒットしない（「費広」は本文にない）
+    assert search_ids(client, "費広") == []
+    assert search_ids(client, "面談") == [other["id"]]
+
+    result = client.get("/api/search", params={"q": "予算"}).json()[0]
+    assert result["title"] == "予算会議"
+    assert result["score"] > 0
+
+
+def test_search_ranks_title_matches_first(client):
+    in_transcript = create_meeting(client, title="定例", transcript="[00:00:10] セキュリティの話をしました")
+    in_title = create_meeting(client, title="セキュリティ定例")
+
+    assert search_ids(client, "セキュリティ") == [in_title["id"], in_transcript["id"]]
+    # ページング
+    assert search_ids(client, "セキュリティ", limit=1) == [in_title["id"]]
+    assert search_ids(client, "セキュリティ", skip=1, limit=1) == [in_transcript["id"]]
+
+
+def test_search_index_follows_updates(client):
+    meeting = create_meeting(client, title="予算会議", transcript="[00:00:10] 見積もりを確認")
+
+    # タスクの内容も検索できる
+    client.post(f"/api/meetings/{meeting['id']}/tasks/", json={**get_valid_task_data(), "content": "請求書を発行する"})
+    assert search_ids(client, "請求書") == [meeting["id"]]
+
+    # 議事録・タイトルを更新すると古い内容ではヒットしなくなる
+    update = {**get_valid_meeting_data(), "title": "営業会議", "transcript": "[00:00:05] 受注の報告"}
+    client.put(f"/api/meetings/{meeting['id']}", json=update)
+    assert search_ids(client, "見積もり") == []
+    assert search_ids(client, "予算") == []
+    assert search_ids(client, "受注") == [meeting["id"]]
+    assert search_ids(client, "請求書") == [meeting["id"]]
+
+    client.delete(f"/api/meetings/{meeting['id']}")
+    assert search_ids(client, "受注") == []
+    assert search_ids(client, "請求書") == []
+
+
+def test_search_terms_may_span_transcript_and_tasks(client):
+    meeting = create_meeting(client, title="定例", transcript="[00:00:10] 広告費を確認します")
+    client.post(f"/api/meetings/{meeting['id']}/tasks/", json={**get_valid_task_data(), "content": "請求書を発行する"})
+    create_meeting(client, title="別の会議", transcript="[00:00:10] 広告費の話")
+
+    # 議事録とタスクにまたがる語もすべて含むものとして検索できる
+    assert search_ids(client, "広告費 請求書") == [meeting["id"]]
+    assert search_ids(client, "請求書 面談") == []
+
+
+def test_task_write_does_not_reindex_transcript(client, count_queries):
+    transcript = "\n".join(f"[{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}] 予算の確認{i}" for i in range(0, 3600, 10))
+    meeting = create_meeting(client, title="予算会議", transcript=transcript)
+
+    with count_queries() as statements:
+        task = client.post(
+            f"/api/meetings/{meeting['id']}/tasks/", json={**get_valid_task_data(), "content": "請求書を発行する"}
+        ).json()
+        client.patch(f"/api/tasks/{task['id']}", json={"content": "領収書を発行する"})
+    # タスクの索引だけを作り直し、議事録は読み直さない
+    assert any("meeting_task_search" in statement for statement in statements)
+    assert not any("transcript_segments" in statement or "meeting_search " in statement for statement in statements)
+    assert search_ids(client, "領収書") == [meeting["id"]]
+    assert search_ids(client, "請求書") == []
+    assert search_ids(client, "予算") == [meeting["id"]]
+
+
+def test_search_requires_terms(client):
+    assert client.get("/api/search", params={"q": "!!"}).status_code == 422
+    assert client.get("/api/search").status_code == 422
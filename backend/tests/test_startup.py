@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from alembic import command
+
+BACKEND_DIR = Path(__file__).parent.parent
+# import＋最初のリクエストまでの許容時間（秒）
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "5"))
+
+STARTUP_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+statements = []
+event.listen(Engine, "before_cursor_execute",
+             lambda conn, cursor, statement, *args: statements.append(statement))
+
+import app.main
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+
+with TestClient(app.main.app) as client:
+    assert client.get("/api/meetings/").status_code == 200
+first_request = time.perf_counter()
+
+ddl = [s for s in statements if s.lstrip().upper().startswith(("CREATE", "ALTER", "DROP", "PRAGMA"))]
+print(json.dumps({
+    "import_seconds": imported - start,
+    "first_request_seconds": first_request - imported,
+    "ddl": ddl,
+}))
+"""
+
+
+def test_startup_does_no_ddl_and_is_fast(alembic_config):
+    # スキーマはマイグレーションで作成しておく
+    command.upgrade(alembic_config, "head")
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": alembic_config.get_main_option("sqlalchemy.url"),
+        "DEBUG": "false",
+        "DB_CREATE_SCHEMA_ON_STARTUP": "false",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"startup: import={timings['import_seconds']:.3f}s "
+          f"first_request={timings['first_request_seconds']:.3f}s")
+
+    assert timings["ddl"] == []
+    assert timings["import_seconds"] + timings["first_request_seconds"] < STARTUP_BUDGET_SECONDS
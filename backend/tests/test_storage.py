@@ -0,0 +1,103 @@
+import hashlib
+import os
+import tracemalloc
+
+import pytest
+
+from app import main
+from app.exceptions import PayloadTooLarge
+from app.storage import save_stream
+from .conftest import test_engine
+from .test_data import get_valid_meeting_data
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main.settings, "AUDIO_STORAGE_DIR", str(tmp_path / "audio"))
+    return tmp_path / "audio"
+
+
+async def repeat(data: bytes, count: int):
+    for _ in range(count):
+        yield data
+
+
+@pytest.mark.anyio
+async def test_save_stream_memory_is_flat(tmp_path):
+    # 64KB × 2048 = 128MB をストリームで保存しても、メモリのピークは書き込みブロック程度
+    data = os.urandom(64 * 1024)
+    tracemalloc.start()
+    try:
+        stored = await save_stream(repeat(data, 2048), str(tmp_path), max_bytes=1024 ** 3)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stored.size == 128 * 1024 * 1024
+    assert os.path.getsize(stored.path) == stored.size
+    assert peak < 4 * 1024 * 1024
+
+    digest = hashlib.sha256()
+    for _ in range(2048):
+        digest.update(data)
+    assert stored.sha256 == digest.hexdigest()
+
+
+@pytest.mark.anyio
+async def test_save_stream_rejects_too_large(tmp_path):
+    with pytest.raises(PayloadTooLarge):
+        await save_stream(repeat(b"x" * 1024, 10), str(tmp_path), max_bytes=5000)
+    # 書きかけのファイルは残らない
+    assert os.listdir(tmp_path) == []
+
+
+def test_upload_audio_deduplicates(client, storage_dir):
+    first = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    second = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    content = b"RIFF" + os.urandom(10000)
+
+    response = client.post(f"/api/meetings/{first['id']}/audio", content=content)
+    assert response.status_code == 200
+    assert response.headers["X-Content-SHA256"] == hashlib.sha256(content).hexdigest()
+    path = response.json()["audio_file_path"]
+    with open(path, "rb") as f:
+        assert f.read() == content
+
+    # 同じ内容は同じファイルを指し、二重に保存されない
+    response = client.post(f"/api/meetings/{second['id']}/audio", content=content)
+    assert response.json()["audio_file_path"] == path
+    stored_files = [name for _, _, names in os.walk(storage_dir) for name in names]
+    assert len(stored_files) == 1
+
+
+def test_upload_audio_releases_connection_while_receiving(client, storage_dir, monkeypatch):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+    checked_out = []
+
+    async def recording_save_stream(*args, **kwargs):
+        # 本文を受信している間に使用中の接続の数を記録する
+        checked_out.append(test_engine.pool.checkedout())
+        return await save_stream(*args, **kwargs)
+
+    monkeypatch.setattr(main, "save_stream", recording_save_stream)
+    response = client.post(f"/api/meetings/{meeting['id']}/audio", content=b"RIFF" + os.urandom(1000))
+    assert response.status_code == 200
+    assert checked_out == [0]
+    assert client.get(f"/api/meetings/{meeting['id']}").json()["audio_file_path"] == response.json()["audio_file_path"]
+
+
+def test_upload_audio_errors(client, storage_dir, monkeypatch):
+    meeting = client.post("/api/meetings", json=get_valid_meeting_data()).json()
+
+    assert client.post("/api/meetings/9999/audio", content=b"data").status_code == 404
+    assert client.post(f"/api/meetings/{meeting['id']}/audio", content=b"").status_code == 422
+
+    monkeypatch.setattr(main.settings, "AUDIO_MAX_UPLOAD_BYTES", 1024)
+    response = client.post(f"/api/meetings/{meeting['id']}/audio", content=b"x" * 2048)
+    assert response.status_code == 413
+    assert client.get(f"/api/meetings/{meeting['id']}").json()["audio_file_path"] is None
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app import crud
+from app.summarization import (
+    MAP_PROMPT,
+    REDUCE_PROMPT,
+    SummarizationService,
+    get_summarization_service,
+    pack_texts,
+    split_text,
+)
+from .conftest import TestingSessionLocal, create_meeting, wait_for_job
+from .test_data import get_valid_meeting_data
+
+
+class CharTokenizer:
+    """1文字を1トークンとして数える（tiktokenの語彙をダウンロードしない）"""
+
+    def encode_ordinary(self, text):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+class FakeClient:
+    """呼び出しを記録し、入力の先頭と末尾の行から決まった要約を返す"""
+
+    model = "fake-model"
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.active = 0
+        self.max_active = 0
+
+    async def complete(self, system, prompt):
+        self.calls.append((system, prompt))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise RuntimeError("APIの呼び出しに失敗しました")
+            if system == MAP_PROMPT:
+                lines = prompt.splitlines()
+                return f"要約:{lines[0]}〜{lines[-1]}"
+            return "全体:" + "|".join(prompt.split("\n\n"))
+        finally:
+            self.active -= 1
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def llm():
+    return FakeClient()
+
+
+@pytest.fixture
+def service(install_job_service, llm):
+    return install_job_service(get_summarization_service, SummarizationService(
+        client_factory=lambda: llm,
+        tokenizer_factory=lambda model: CharTokenizer(),
+        session_factory=TestingSessionLocal,
+        chunk_tokens=40,
+        concurrency=2,
+    ))
+
+
+# 1行18文字（改行込み）。40トークンのチャンクに2行ずつ入る
+TRANSCRIPT_LINES = [f"[00:00:{i:02d}] 議題{i}を話す" for i in range(8)]
+TRANSCRIPT = "\n".join(TRANSCRIPT_LINES)
+
+
+def summarize(client, meeting_id):
+    response = client.post(f"/api/meetings/{meeting_id}/summarize")
+    assert response.status_code == 202
+    return wait_for_job(client, response.json()["id"])
+
+
+def test_split_text_by_tokens():
+    tokenizer = CharTokenizer()
+    chunks = split_text("\n".join(TRANSCRIPT_LINES), tokenizer, 40)
+    assert chunks == ["\n".join(TRANSCRIPT_LINES[i:i + 2]) for i in range(0, 8, 2)]
+    assert all(len(tokenizer.encode_ordinary(chunk)) <= 40 for chunk in chunks)
+
+    # 1行で上限を超える行はトークンの位置で分ける
+    assert split_text("短い行\n" + "あ" * 25, tokenizer, 10) == ["短い行", "あ" * 10, "あ" * 10, "あ" * 5]
+    assert split_text("", tokenizer, 10) == []
+
+
+def test_pack_texts_always_shrinks():
+    tokenizer = CharTokenizer()
+    assert pack_texts(["a" * 5] * 5, tokenizer, 14) == [["a" * 5] * 2, ["a" * 5] * 2, ["a" * 5]]
+    # 上限より大きい要約でも2つずつまとめる
+    assert pack_texts(["a" * 20] * 3, tokenizer, 10) == [["a" * 20] * 2, ["a" * 20]]
+
+
+def test_summarize_meeting(client, service, llm):
+    meeting = create_meeting(client, transcript=TRANSCRIPT)
+
+    job = summarize(client, meeting["id"])
+    assert job["kind"] == "summarization"
+    assert job["status"] == "completed"
+    assert job["progress"] == 1.0
+
+    map_calls = [prompt for system, prompt in llm.calls if system == MAP_PROMPT]
+    assert len(map_calls) == 4
+    assert llm.max_active <= 2
+
+    summary = client.get(f"/api/meetings/{meeting['id']}").json()["summary"]
+    assert summary.startswith("全体:")
+    for line in TRANSCRIPT_LINES:
+        assert line in summary
+
+
+def test_summary_is_cached_by_transcript(client, service, llm):
+    meeting = create_meeting(client, transcript=TRANSCRIPT)
+    summarize(client, meeting["id"])
+    summary = client.get(f"/api/meetings/{meeting['id']}").json()["summary"]
+    calls = len(llm.calls)
+
+    # 議事録以外の変更では再実行してもAPIを呼ばない
+    data = get_valid_meeting_data()
+    data["title"] = "タイトルだけ変更"
+    data["transcript"] = "\n".join(TRANSCRIPT_LINES)
+    assert client.put(f"/api/meetings/{meeting['id']}", json=data).status_code == 200
+    assert summarize(client, meeting["id"])["status"] == "completed"
+    assert len(llm.calls) == calls
+    assert client.get(f"/api/meetings/{meeting['id']}").json()["summary"] == summary
+
+    # 議事録の一部の変更では、変わったチャンクとreduceだけを呼び出す
+    lines = list(TRANSCRIPT_LINES)
+    lines[7] = "[00:00:07] 結論を話す"
+    data["transcript"] = "\n".join(lines)
+    assert client.put(f"/api/meetings/{meeting['id']}", json=data).status_code == 200
+    summarize(client, meeting["id"])
+    new_calls = llm.calls[calls:]
+    assert [system for system, _ in new_calls].count(MAP_PROMPT) == 1
+    assert REDUCE_PROMPT in [system for system, _ in new_calls]
+    assert "結論を話す" in client.get(f"/api/meetings/{meeting['id']}").json()["summary"]
+
+
+def test_summarize_failure_marks_job_failed(client, service, llm):
+    llm.fail = True
+    meeting = create_meeting(client, transcript=TRANSCRIPT)
+
+    job = summarize(client, meeting["id"])
+    assert job["status"] == "failed"
+    assert "APIの呼び出しに失敗しました" in job["error"]
+    assert client.get(f"/api/meetings/{meeting['id']}").json()["summary"] is None
+
+
+def test_summarize_save_failure_marks_job_failed(client, service, llm, monkeypatch):
+    meeting = create_meeting(client, transcript=TRANSCRIPT)
+
+    def broken_save(db, **kwargs):
+        raise RuntimeError("要約を保存できません")
+
+    # 結果の保存で失敗しても実行中のまま残らず、次のジョブを登録できる
+    monkeypatch.setattr(crud, "save_summary", broken_save)
+    job = summarize(client, meeting["id"])
+    assert job["status"] == "failed"
+    assert "要約を保存できません" in job["error"]
+
+    monkeypatch.undo()
+    retry = summarize(client, meeting["id"])
+    assert retry["id"] != job["id"]
+    assert retry["status"] == "completed"
+
+
+def test_summarize_without_transcript(client, service):
+    meeting = create_meeting(client, transcript=None)
+    assert client.post(f"/api/meetings/{meeting['id']}/summarize").status_code == 422
+    assert client.post("/api/meetings/9999/summarize").status_code == 404
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """OpenAI互換のChat Completions APIのスタブ（受け取ったリクエストを記録する）"""
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, body))
+        payload = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": " スタブの要約 "},
+            }],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = HTTPServer(("127.0.0.1", 0), StubChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubChatHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_openai_client_against_local_server(stub_server):
+    pytest.importorskip("openai")
+    from app.summarization import OpenAIChatClient
+
+    async def run():
+        client = OpenAIChatClient("local-model", api_key="test", base_url=stub_server, max_tokens=64)
+        try:
+            return await client.complete("システム", "議事録")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "スタブの要約"
+    path, body = StubChatHandler.requests[0]
+    assert path == "/v1/chat/completions"
+    assert body["model"] == "local-model"
+    assert body["max_tokens"] == 64
+    assert body["messages"] == [
+        {"role": "system", "content": "システム"},
+        {"role": "user", "content": "議事録"},
+    ]
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import crud, database, models
+from app.audio import Chunk, Segment
+from app.main import fail_unfinished_jobs, settings
+from app.transcription import TranscriptionService, get_transcription_service
+from .conftest import TestingSessionLocal, create_meeting, wait_for_job
+from .test_data import get_valid_meeting_data
+
+
+def fake_plan(audio_path: str):
+    return [Chunk(0.0, 60.5, 0.0, 60.0), Chunk(59.5, 90.0, 60.0, 90.0)]
+
+
+def fake_transcribe(audio_path: str, start: float, end: float):
+    if audio_path.endswith("broken.wav") and start > 0:
+        raise RuntimeError("音声ファイルを読み込めません")
+    if start == 0:
+        return [Segment(1.0, 5.0, "本日の議題は予算です"), Segment(58.0, 60.3, "次に進みます")]
+    return [Segment(59.6, 60.3, "次に進みます"), Segment(61.0, 65.0, "以上です")]
+
+
+@pytest.fixture
+def service(install_job_service):
+    # Whisperの代わりにスレッドで即座に結果を返すサービスを使う
+    return install_job_service(get_transcription_service, TranscriptionService(
+        executor_factory=lambda: ThreadPoolExecutor(max_workers=1),
+        plan=fake_plan,
+        transcribe=fake_transcribe,
+        session_factory=TestingSessionLocal,
+    ))
+
+
+def test_transcribe_meeting(client, service):
+    meeting = create_meeting(client, audio_file_path="uploads/meeting.wav")
+
+    response = client.post(f"/api/meetings/{meeting['id']}/transcribe")
+    assert response.status_code == 202
+    job = response.json()
+    assert job["meeting_id"] == meeting["id"]
+    assert job["kind"] == "transcription"
+
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "completed"
+    assert job["progress"] == 1.0
+
+    meeting = client.get(f"/api/meetings/{meeting['id']}").json()
+    assert meeting["transcript"] == (
+        "[00:00:01] 本日の議題は予算です\n"
+        "[00:00:58] 次に進みます\n"
+        "[00:01:01] 以上です"
+    )
+
+
+def test_transcribe_failure_marks_job_failed(client, service):
+    meeting = create_meeting(client, audio_file_path="uploads/broken.wav")
+
+    job = client.post(f"/api/meetings/{meeting['id']}/transcribe").json()
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "failed"
+    assert "音声ファイルを読み込めません" in job["error"]
+
+    meeting = client.get(f"/api/meetings/{meeting['id']}").json()
+    assert meeting["transcript"] is None
+
+
+def test_transcribe_without_audio(client, service):
+    meeting = create_meeting(client, audio_file_path=None)
+
+    response = client.post(f"/api/meetings/{meeting['id']}/transcribe")
+    assert response.status_code == 422
+
+
+def test_transcribe_unknown_meeting_and_job(client, service):
+    assert client.post("/api/meetings/9999/transcribe").status_code == 404
+    assert client.get("/api/jobs/9999").status_code == 404
+
+
+def test_transcribe_save_failure_marks_job_failed(client, service, monkeypatch):
+    meeting = create_meeting(client, audio_file_path="uploads/meeting.wav")
+
+    def broken_save(db, **kwargs):
+        raise RuntimeError("議事録を保存できません")
+
+    # 結果の保存で失敗しても実行中のまま残らず、次のジョブを登録できる
+    monkeypatch.setattr(crud, "save_transcript", broken_save)
+    job = client.post(f"/api/meetings/{meeting['id']}/transcribe").json()
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "failed"
+    assert "議事録を保存できません" in job["error"]
+
+    monkeypatch.undo()
+    retry = client.post(f"/api/meetings/{meeting['id']}/transcribe").json()
+    assert retry["id"] != job["id"]
+    assert wait_for_job(client, retry["id"])["status"] == "completed"
+
+
+def test_transcribe_ignores_stale_job(client, service, db):
+    meeting = create_meeting(client, audio_file_path="uploads/meeting.wav")
+    # 前回のプロセスで実行中のまま止まったジョブ
+    stale = models.Job(
+        meeting_id=meeting["id"], kind="transcription", status="running",
+        updated_at=datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_SECONDS + 60),
+    )
+    db.add(stale)
+    db.commit()
+    stale_id = stale.id
+
+    job = client.post(f"/api/meetings/{meeting['id']}/transcribe").json()
+    assert job["id"] != stale_id
+    assert wait_for_job(client, job["id"])["status"] == "completed"
+
+
+def test_startup_fails_unfinished_jobs(client, db, monkeypatch):
+    meeting = create_meeting(client, audio_file_path="uploads/meeting.wav")
+    for status in ("queued", "running", "completed"):
+        db.add(models.Job(meeting_id=meeting["id"], kind="transcription", status=status))
+    db.commit()
+
+    monkeypatch.setattr(database, "SessionLocal", TestingSessionLocal)
+    fail_unfinished_jobs()
+    db.expire_all()
+    jobs = db.query(models.Job).order_by(models.Job.id).all()
+    assert [job.status for job in jobs] == ["failed", "failed", "completed"]
+    assert jobs[0].error == "サーバーの再起動により中断されました"
+    # 止まったジョブの代わりに新しいジョブを登録できる
+    assert crud.get_active_job(db, meeting["id"], "transcription") is None